@@ -0,0 +1,101 @@
+# benchmarks/common.py
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager, redirect_stderr, redirect_stdout
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+EXTRACTOR_DIR = os.path.join(PROJECT_ROOT, "yt_dlp_plugins", "extractor")
+
+# hianime.py imports megacloud as a top-level module, so benchmarks do the same
+for path in (PROJECT_ROOT, EXTRACTOR_DIR):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+
+def measure(func, *, number: int = 1, repeat: int = 5) -> dict:
+    """
+    Calls func `number` times per round for `repeat` rounds and returns per-call timings in ms.
+    """
+    rounds = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        rounds.append((time.perf_counter() - start) * 1000 / number)
+
+    return {
+        "best_ms": round(min(rounds), 4),
+        "median_ms": round(statistics.median(rounds), 4),
+        "rounds": repeat,
+        "calls_per_round": number,
+    }
+
+
+@contextmanager
+def quiet():
+    """Silences the console logging of the code under test; reports are printed afterwards."""
+    with open(os.devnull, "w", encoding="utf-8") as devnull, redirect_stdout(devnull), redirect_stderr(devnull):
+        yield
+
+
+@contextmanager
+def isolated_cache():
+    """
+    Points XDG_CACHE_HOME at a temporary directory, so yt-dlp's cached episode lists and the
+    search cache of the mock site neither leak between runs nor into the user's caches.
+    """
+    previous = os.environ.get("XDG_CACHE_HOME")
+    with tempfile.TemporaryDirectory() as cache_home:
+        os.environ["XDG_CACHE_HOME"] = cache_home
+        try:
+            yield cache_home
+        finally:
+            if previous is None:
+                os.environ.pop("XDG_CACHE_HOME", None)
+            else:
+                os.environ["XDG_CACHE_HOME"] = previous
+
+
+def percentiles(samples: list[float]) -> dict:
+    """Median, p90 and max of a list of millisecond samples."""
+    ordered = sorted(samples)
+    return {
+        "median_ms": round(statistics.median(ordered), 3),
+        "p90_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.9))], 3),
+        "max_ms": round(ordered[-1], 3),
+        "samples": len(ordered),
+    }
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def emit(name: str, results: dict, output: str | None = None) -> dict:
+    """Prints the results as JSON (and writes them to `output` if given)."""
+    report = {
+        "benchmark": name,
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    print(text)
+    if output:
+        with open(output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+
+    return report
@@ -0,0 +1,100 @@
+# benchmarks/e2e_batch.py
+"""
+Wall time and memory peak of AnimeService.download_anime for a 100-episode batch from the
+mock site, without the GUI. The mock runs in a child process so its buffers don't count.
+
+    python -m benchmarks.e2e_batch [--episodes 100] [--concurrent-episodes 4]
+                                   [--no-tracemalloc] [--output result.json]
+
+python_heap_peak_mb comes from tracemalloc (which slows the run down; --no-tracemalloc
+times it without), rss_peak_mb from getrusage where available. download_anime embeds
+subtitles with FFmpeg, so the benchmark refuses to run without it, and exits with status 1
+if any episode failed: such a run times something else and must not become a baseline.
+"""
+import argparse
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.common import emit, isolated_cache, quiet
+from benchmarks.mock_site import load_catalogue, pointed_at, spawned
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from downloader.anime_service import AnimeService
+
+
+def rss_peak_mb() -> float | None:
+    if resource is None:
+        return None
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)  # KiB on Linux
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--episodes", type=int, default=100)
+    parser.add_argument("--concurrent-episodes", type=int, default=4)
+    parser.add_argument("--fragment-concurrency", type=int, default=4)
+    parser.add_argument("--segments", type=int, default=4, help="segments per episode")
+    parser.add_argument("--segment-size", type=int, default=64 * 1024, help="1080p segment bytes")
+    parser.add_argument("--latency", type=float, default=0.005, help="mock site seconds per response")
+    parser.add_argument("--no-tracemalloc", action="store_true")
+    parser.add_argument("--output")
+    args = parser.parse_args()
+    if not shutil.which("ffmpeg"):
+        parser.error("FFmpeg is required: download_anime embeds subtitles with it")
+
+    mock_args = ["--latency", str(args.latency), "--segments", str(args.segments),
+                 "--segment-size", str(args.segment_size)]
+    series = max(load_catalogue().values(), key=lambda series: series.sub)
+    completed = []
+    with isolated_cache(), spawned(*mock_args) as url, pointed_at(url), \
+            tempfile.TemporaryDirectory() as outdir, quiet():
+        service = AnimeService(url)
+        service.episode_completed.connect(lambda title, number, ok, quality: completed.append(ok))
+        rss_before = rss_peak_mb()
+        if not args.no_tracemalloc:
+            tracemalloc.start()
+
+        start = time.perf_counter()
+        service.download_anime(
+            series.title, url + series.url_path, "SUB", "720p", 1, args.episodes, outdir,
+            gui_logger_callback=lambda message: None,
+            concurrent_episodes=args.concurrent_episodes,
+            fragment_concurrency=args.fragment_concurrency,
+        )
+        seconds = time.perf_counter() - start
+
+        heap_peak = tracemalloc.get_traced_memory()[1] if tracemalloc.is_tracing() else None
+        tracemalloc.stop()
+        pool_stats = service.youtube_dl_stats()
+        service.close()
+
+    episodes = min(args.episodes, series.sub)
+    emit("e2e_batch", {
+        "episodes": episodes,
+        "episodes_reported": len(completed),
+        "episodes_ok": sum(completed),
+        "concurrent_episodes": args.concurrent_episodes,
+        "fragment_concurrency": args.fragment_concurrency,
+        "tracemalloc": not args.no_tracemalloc,
+        "wall_s": round(seconds, 2),
+        "episodes_per_s": round(len(completed) / seconds, 2) if seconds else None,
+        "python_heap_peak_mb": round(heap_peak / 2 ** 20, 2) if heap_peak is not None else None,
+        "rss_before_mb": rss_before,
+        "rss_peak_mb": rss_peak_mb(),
+        "youtube_dl": pool_stats,
+    }, args.output)
+
+    if sum(completed) < episodes:
+        print(f"e2e_batch: only {sum(completed)} of {episodes} episodes succeeded", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+# benchmarks/e2e_download.py
+"""
+HLS download throughput of one episode from the mock site at several fragment
+concurrencies (yt-dlp's concurrent_fragment_downloads, which download_anime sets from
+fragment_concurrency). Each response is limited to --bandwidth bytes/s after --latency,
+like a per-connection capped CDN, so concurrency is what buys throughput.
+
+    python -m benchmarks.e2e_download [--concurrency 1 2 4 8 16] [--segments 40]
+                                      [--bandwidth 4000000] [--output result.json]
+
+The episode is extracted once; every run downloads its 1080p format into a fresh
+directory with post-processing off, so only the fragment downloader is timed.
+"""
+import argparse
+import copy
+import os
+import statistics
+import tempfile
+import time
+
+from benchmarks.common import emit, isolated_cache, quiet
+from benchmarks.e2e_extract import ydl_opts
+from benchmarks.mock_site import MockSite
+
+from yt_dlp import YoutubeDL
+
+
+def download_once(info: dict, concurrency: int) -> tuple[float, int]:
+    """Downloads the episode; returns (seconds, bytes written)."""
+    with tempfile.TemporaryDirectory() as outdir:
+        opts = ydl_opts(format="1080p", fixup="never", concurrent_fragment_downloads=concurrency,
+                        outtmpl=os.path.join(outdir, "%(id)s.%(ext)s"), noprogress=True)
+        with YoutubeDL(opts) as ydl:
+            start = time.perf_counter()
+            ydl.process_ie_result(copy.deepcopy(info), download=True)
+            seconds = time.perf_counter() - start
+        size = sum(entry.stat().st_size for entry in os.scandir(outdir) if entry.is_file())
+    return seconds, size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--segments", type=int, default=40, help="segments per episode")
+    parser.add_argument("--segment-size", type=int, default=512 * 1024, help="1080p segment bytes")
+    parser.add_argument("--bandwidth", type=float, default=4_000_000, help="bytes/sec per response")
+    parser.add_argument("--latency", type=float, default=0.02, help="mock site seconds per response")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    runs = {}
+    with isolated_cache(), MockSite(latency=args.latency, bandwidth=args.bandwidth, segments=args.segments,
+                                    segment_size=args.segment_size) as site, site.patched(), quiet():
+        series = next(iter(site.catalogue.values()))
+        with YoutubeDL(ydl_opts()) as ydl:
+            info = ydl.extract_info(f"{site.series_url(series.id)}?ep={series.episode_id(1)}&lang=sub",
+                                    download=False, process=False)
+
+        for concurrency in args.concurrency:
+            samples = [download_once(info, concurrency) for _ in range(args.repeat)]
+            seconds = statistics.median(s for s, _ in samples)
+            size = samples[0][1]
+            runs[str(concurrency)] = {
+                "median_s": round(seconds, 3),
+                "best_s": round(min(s for s, _ in samples), 3),
+                "bytes": size,
+                "mb_per_s": round(size / seconds / 1e6, 2),
+            }
+
+    emit("e2e_download", {
+        "segments": args.segments,
+        "segment_size": args.segment_size,
+        "bandwidth_per_connection": args.bandwidth,
+        "latency_s": args.latency,
+        "by_fragment_concurrency": runs,
+    }, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+# benchmarks/e2e_extract.py
+"""
+HiAnimeIE extraction time against the mock site:
+
+- playlist: a series page plus its episode list, cold (no cached list) and from the
+  in-memory series cache
+- episode: HiAnimeIE._extract_episode for a run of episodes, with the time spent in each
+  request stage (servers, sources, embed, getSources, m3u8) taken from the mock site's
+  request timeline. A stage's time is the span from its first request starting to its
+  last one finishing, so mirrors raced in parallel count once.
+
+    python -m benchmarks.e2e_extract [--latency 0.05] [--episodes 10] [--fail-mirror HD-1]
+                                     [--output result.json]
+"""
+import argparse
+import statistics
+import time
+
+from benchmarks.common import emit, isolated_cache, percentiles, quiet
+from benchmarks.mock_site import MIRROR_NAMES, MockSite
+
+from yt_dlp import YoutubeDL
+
+STAGES = ("servers", "sources", "embed", "get_sources", "master_m3u8")
+
+
+class _QuietLogger:
+    def debug(self, msg):
+        pass
+
+    info = warning = error = debug
+
+
+def ydl_opts(**extra) -> dict:
+    return {"quiet": True, "logger": _QuietLogger(), "cachedir": False, **extra}
+
+
+def stage_spans(timeline: list[tuple[str, float, float]], start: float) -> dict:
+    """ms per stage, plus when the stage began relative to the extraction start."""
+    spans = {}
+    for stage in STAGES:
+        entries = [(started, finished) for route, started, finished in timeline if route == stage]
+        if entries:
+            first = min(started for started, _ in entries)
+            spans[stage] = {"ms": (max(finished for _, finished in entries) - first) * 1000,
+                            "offset_ms": (first - start) * 1000, "requests": len(entries)}
+    return spans
+
+
+def bench_playlist(site: MockSite, series_id: int, repeat: int) -> dict:
+    url = site.series_url(series_id)
+    cold, warm = [], []
+    for _ in range(repeat):
+        with YoutubeDL(ydl_opts(extract_flat=True)) as ydl:
+            type(ydl.get_info_extractor("HiAnime"))._series_cache.clear()
+            start = time.perf_counter()
+            info = ydl.extract_info(url, download=False)
+            cold.append((time.perf_counter() - start) * 1000)
+
+            start = time.perf_counter()
+            ydl.extract_info(url, download=False)
+            warm.append((time.perf_counter() - start) * 1000)
+    return {"episodes": len(info["entries"]), "cold": percentiles(cold), "cached": percentiles(warm)}
+
+
+def bench_episodes(site: MockSite, series_id: int, episodes: int) -> dict:
+    series = site.catalogue[series_id]
+    totals, per_stage = [], {stage: [] for stage in STAGES}
+    offsets = {stage: [] for stage in STAGES}
+    requests = {stage: 0 for stage in STAGES}
+    with YoutubeDL(ydl_opts(format="1080p/720p/best")) as ydl:
+        ydl.extract_info(site.series_url(series_id), download=False, process=False)  # Caches the episode list
+        for number in range(1, min(episodes, series.sub) + 1):
+            url = f"{site.series_url(series_id)}?ep={series.episode_id(number)}&lang=sub"  # As download_anime asks
+            start = time.perf_counter()
+            ydl.extract_info(url, download=False)
+            totals.append((time.perf_counter() - start) * 1000)
+            for stage, span in stage_spans(site.timeline(since=start), start).items():
+                per_stage[stage].append(span["ms"])
+                offsets[stage].append(span["offset_ms"])
+                requests[stage] += span["requests"]
+
+    return {
+        "episodes": len(totals),
+        "total": percentiles(totals),
+        "stages": {
+            stage: {"median_ms": round(statistics.median(per_stage[stage]), 3),
+                    "median_offset_ms": round(statistics.median(offsets[stage]), 3),
+                    "requests_per_episode": round(requests[stage] / len(totals), 2)}
+            for stage in STAGES if per_stage[stage]
+        },
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency", type=float, default=0.05, help="mock site seconds per response")
+    parser.add_argument("--episodes", type=int, default=10, help="episodes resolved one after another")
+    parser.add_argument("--fail-mirror", action="append", default=[], choices=MIRROR_NAMES)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    with isolated_cache(), MockSite(latency=args.latency, failing_mirrors=args.fail_mirror) as site, \
+            site.patched(), quiet():
+        # The longest series of the recorded search page, for the largest episode list
+        series_id = max(site.catalogue.values(), key=lambda series: series.sub).id
+        results = {
+            "latency_s": args.latency,
+            "failing_mirrors": sorted(args.fail_mirror),
+            "playlist": bench_playlist(site, series_id, args.repeat),
+            "episode": bench_episodes(site, series_id, args.episodes),
+        }
+
+    emit("e2e_extract", results, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+# benchmarks/e2e_search.py
+"""
+Search latency of AnimeService.search_anime against the mock site: a cold search (all
+result pages downloaded and parsed) and a repeated one answered by the search cache.
+
+    python -m benchmarks.e2e_search [--latency 0.05] [--repeat 10] [--output result.json]
+
+The recorded search page links two more pages, so a cold search fetches three.
+"""
+import argparse
+import time
+
+from benchmarks.common import emit, isolated_cache, percentiles, quiet
+from benchmarks.mock_site import MockSite
+
+from downloader.anime_service import AnimeService
+from downloader.search_cache import SearchCache
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency", type=float, default=0.05, help="mock site seconds per response")
+    parser.add_argument("--keyword", default="naruto")
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    cold, cached = [], []
+    with isolated_cache(), MockSite(latency=args.latency) as site, quiet():
+        service = AnimeService(site.url, search_cache=SearchCache())
+        for _ in range(args.repeat):
+            service.search_cache = SearchCache()  # Memory only, and empty for every cold search
+            site.reset_stats()
+            start = time.perf_counter()
+            results = service.search_anime(args.keyword)
+            cold.append((time.perf_counter() - start) * 1000)
+
+            start = time.perf_counter()
+            service.search_anime(args.keyword)
+            cached.append((time.perf_counter() - start) * 1000)
+        requests = site.stats()["requests"].get("search", 0)
+        service.close()
+
+    emit("e2e_search", {
+        "latency_s": args.latency,
+        "results": len(results),
+        "pages_per_search": requests,
+        "cold": percentiles(cold),
+        "cached": percentiles(cached),
+    }, args.output)
+
+
+if __name__ == "__main__":
+    main()
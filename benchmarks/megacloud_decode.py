@@ -0,0 +1,66 @@
+# benchmarks/megacloud_decode.py
+"""
+Sources decoding cost: the legacy per-character LCG decoder and nested-list
+transposition versus Megacloud._process_sources.
+
+    python -m benchmarks.megacloud_decode [--size 100000] [--output result.json]
+
+The keystream is sequential, so the gain is loop overhead only (about 1.1-1.5x). getSources
+currently answers with plain sources and Megacloud.extract() doesn't decode them; this
+covers the decoder for encrypted responses. tests/test_megacloud_decode.py checks that
+both produce the same output on random payloads and keys.
+"""
+import argparse
+import random
+
+from benchmarks.common import emit, measure
+
+import megacloud
+from megacloud import Megacloud
+
+
+def legacy_process_sources(mc: Megacloud, sources: list[str], key: str) -> list[str]:
+    current_hash = megacloud.hash(key)
+    new_sources = []
+    for char in sources:
+        current_hash = mc._lcg(current_hash)
+        new_sources.append(chr((ord(char) - 32 - current_hash % 95) % 95 + 32))
+
+    array_count = len(new_sources) // len(key)
+    arrays = [[""] * len(key) for _ in range(array_count)]
+    key_sorted = {i: char for i, char in sorted(enumerate(key), key=lambda p: p[1])}
+
+    p = 0
+    for idx in key_sorted.keys():
+        for arr_idx in range(array_count):
+            arrays[arr_idx][idx] = new_sources[p]
+            p += 1
+
+    return [char for arr in arrays for char in arr]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=100_000, help="payload size in characters")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    payload = [chr(rng.randint(32, 126)) for _ in range(args.size)]
+    key = "".join(rng.choices("0123456789abcdef", k=64))
+    mc = Megacloud("")
+
+    assert legacy_process_sources(mc, payload, key) == mc._process_sources(payload, key)
+
+    results = {
+        "payload_chars": args.size,
+        "legacy": measure(lambda: legacy_process_sources(mc, payload, key), repeat=args.repeat),
+        "batched": measure(lambda: mc._process_sources(payload, key), repeat=args.repeat),
+    }
+    results["speedup"] = round(results["legacy"]["median_ms"] / results["batched"]["median_ms"], 2)
+    emit("megacloud_decode", results, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+# benchmarks/megacloud_ops.py
+"""
+Key-resolution cost of the megacloud compute-op table: legacy per-call eval lambdas
+versus compile_operation().
+
+    python -m benchmarks.megacloud_ops [--lookups 2000] [--output result.json]
+"""
+import argparse
+import re
+
+from benchmarks.common import emit, measure
+
+from megacloud import Megacloud
+
+# A representative compute_op switch body (case N: xx=<operation>)
+OPERATIONS = {
+    0: "aa[0] + aa[1]", 1: "aa[0] - aa[1]", 2: "aa[0] * aa[1]", 3: "aa[0] ^ aa[1]",
+    4: "aa[0] | aa[1]", 5: "aa[0] & aa[1]", 6: "aa[0] >> aa[1]", 7: "aa[0] << aa[1]",
+    8: "aa[0] % aa[1]", 9: "(aa[0] * aa[1]) + aa[2]", 10: "(aa[0] ^ aa[1]) - aa[2]",
+    11: "aa[0] + aa[1] - aa[2]", 12: "(aa[0] & aa[1]) | aa[2]", 13: "aa[0] * aa[1] ^ aa[2]",
+    14: "(aa[0] << aa[1]) >> aa[2]", 15: "aa[0] - aa[1] * aa[2]",
+}
+
+
+def legacy_table(mc: Megacloud) -> dict:
+    def generate(operation):
+        string = mc._convert_to_js_operation(re.sub(r"[\w$]{2}", "args", operation))
+        return lambda *args: eval(string)
+
+    return {num: generate(op) for num, op in OPERATIONS.items()}
+
+
+def resolve(table: dict, lookups: int) -> int:
+    # Mirrors Megacloud._apply_op: try every opcode on each index pair until one fits
+    total = 0
+    for i in range(lookups):
+        args = (i % 97 + 3, i % 13 + 1, i % 7 + 1)
+        for opcode in range(16):
+            try:
+                v = int(table[opcode](*args))
+            except (IndexError, ZeroDivisionError):
+                continue
+            if 0 <= v < 500:
+                total += v
+                break
+
+    return total
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lookups", type=int, default=2000, help="string-array lookups per key resolution")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    mc = Megacloud("")
+    legacy = legacy_table(mc)
+    compiled = {num: mc._generate_op_func(op) for num, op in OPERATIONS.items()}
+    assert resolve(legacy, 200) == resolve(compiled, 200)
+
+    results = {
+        "lookups": args.lookups,
+        "legacy": measure(lambda: resolve(legacy, args.lookups), repeat=args.repeat),
+        "compiled": measure(lambda: resolve(compiled, args.lookups), repeat=args.repeat),
+    }
+    results["speedup"] = round(results["legacy"]["median_ms"] / results["compiled"]["median_ms"], 2)
+    emit("megacloud_ops", results, args.output)
+
+
+if __name__ == "__main__":
+    main()
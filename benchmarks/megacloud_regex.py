@@ -0,0 +1,92 @@
+# benchmarks/megacloud_regex.py
+"""
+Per-extraction regex cost of megacloud.Patterns: legacy re.search(pattern string)
+versus the precompiled registry.
+
+    python -m benchmarks.megacloud_regex [--script player.js] [--output result.json]
+
+Scanning the script dominates, so both take about the same time; the registry exists so
+fmt() stops mutating shared enum members, and this guards against it getting slower.
+"""
+import argparse
+import random
+import re
+import string
+
+from benchmarks.common import emit, measure
+
+from megacloud import Patterns, _re
+
+# Patterns run (roughly in this order) while resolving the secret key of one embed
+SEARCHES = [
+    Patterns.GET_KEY_CTX, Patterns.COMPUTE_OP_FUNC, Patterns.KEY_VAR,
+    Patterns.GET_KEY_FUNC, Patterns.SET_DEFAULT_OPCODE, Patterns.KEY_TRANSFORM_SUMMAND,
+]
+FINDALLS = [Patterns.GET, Patterns.SLICES, Patterns.ARRAY_CONTENT, Patterns.DICT_SET, Patterns.OPERATION]
+VAR_NAMES = ["a", "b", "$c", "dE", "f$", "gh", "i", "jK", "l", "mn", "o$", "pq"]
+
+
+def synthetic_script(size: int = 300_000, seed: int = 0) -> str:
+    """Obfuscated-looking filler with the short identifiers and calls the patterns look for."""
+    rng = random.Random(seed)
+    ident = string.ascii_letters + "$"
+    chunks = []
+    total = 0
+    while total < size:
+        a = "".join(rng.choices(ident, k=3))
+        b = "".join(rng.choices(ident, k=2))
+        v = "".join(rng.choices(ident, k=2))
+        chunk = rng.choice([
+            f"{a}.{b}({rng.randint(0, 16)});",
+            f"{v}={a}.{b}(+\"{rng.randint(0, 999)}\");",
+            f"var {v}={rng.randint(0, 9999)};",
+            f"case {rng.randint(0, 20)}:{v}={v}[0] + {v}[1];break;",
+            f"function {v}(){{return \"{''.join(rng.choices(string.ascii_letters, k=24))}\";}}",
+            f"if({v} > {rng.randint(0, 99)}){{{v}++}}",
+        ])
+        chunks.append(chunk)
+        total += len(chunk)
+
+    return "".join(chunks)
+
+
+def legacy_extraction(script: str) -> None:
+    for p in SEARCHES:
+        re.search(p.value, script)
+    for p in FINDALLS:
+        re.findall(p.value, script)
+    for name in VAR_NAMES:
+        re.search(Patterns.VAR.value.replace("%%name%%", re.escape(name)), script)
+
+
+def compiled_extraction(script: str) -> None:
+    for p in SEARCHES:
+        _re(p, script, default=None)
+    for p in FINDALLS:
+        _re(p, script, all=True, default=None)
+    for name in VAR_NAMES:
+        _re(Patterns.VAR.fmt(name=name), script, default=None)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--script", help="captured megacloud player script (defaults to a synthetic one)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    if args.script:
+        with open(args.script, encoding="utf-8") as f:
+            script = f.read()
+    else:
+        script = synthetic_script()
+
+    results = {"script_bytes": len(script)}
+    for label, func in (("legacy", legacy_extraction), ("compiled", compiled_extraction)):
+        # purge re's module cache so the legacy path pays recompilation like it does after yt-dlp churns it
+        results[label] = measure(lambda: (re.purge(), func(script)), repeat=args.repeat)
+    emit("megacloud_regex", results, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,439 @@
+# benchmarks/mock_site.py
+"""
+Offline stand-in for HiAnime and Megacloud: one local HTTP server that answers every
+request the downloader and the yt-dlp plugin make, so performance work can be measured
+without the live site.
+
+    python -m benchmarks.mock_site [--port 8765] [--latency 0.05] [--bandwidth 2000000]
+                                   [--error-rate 0.01] [--fail-mirror HD-1] [--segments 30]
+
+Served routes (the catalogue is the 40 series of benchmarks/data/search_page.html):
+
+    /search?keyword=..&page=N              the recorded search page
+    /<slug>-<id>, /watch/<slug>-<id>       series page with the title
+    /ajax/v2/episode/list/<id>             episode list JSON (ETag / 304 revalidation)
+    /ajax/v2/episode/servers?episodeId=    HD-1..3 mirrors for sub (and dub where available)
+    /ajax/v2/episode/sources?id=           embed link of one mirror
+    /embed-2/v3/e-1/<source>?k=1           embed page carrying the client key
+    /embed-2/v3/e-1/getSources?id=&_k=     sources, tracks, intro and outro
+    /hls/<source>/master.m3u8              1080p / 720p / 360p renditions
+    /hls/<source>/<height>/index.m3u8      media playlist
+    /hls/<source>/<height>/seg-<n>.ts      synthetic MPEG-TS segments
+    /subs/<source>/en.vtt                  captions
+
+Latency, bandwidth, the error rate and failing mirrors are set per MockSite and may be
+changed while it runs. In tests or benchmarks:
+
+    with MockSite(latency=0.02, failing_mirrors={"HD-1"}) as site, site.patched():
+        AnimeService().search_anime("naruto")   # DEFAULT_BASE_URL and Megacloud point at the site
+        print(site.stats())                     # requests per route
+
+A pytest fixture is just `yield` inside that with block. Give YoutubeDL cachedir=False so
+the plugin's cached episode lists don't leak between runs (or into the real cache).
+"""
+import argparse
+import hashlib
+import json
+import os
+import random
+import re
+import subprocess
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from benchmarks.common import PROJECT_ROOT
+
+from downloader.search_parser import iter_search_items
+
+SEARCH_PAGE = os.path.join(PROJECT_ROOT, "benchmarks", "data", "search_page.html")
+MIRROR_NAMES = ("HD-1", "HD-2", "HD-3")
+SERVER_TYPES = ("sub", "dub")
+RENDITIONS = ((1080, 1920, 5_000_000), (720, 1280, 2_800_000), (360, 640, 800_000))
+TS_PACKET_SIZE = 188
+
+_SERIES_PATH_RE = re.compile(r"^/(?:watch/)?(?P<slug>[^/?]+)-(?P<id>\d+)$")
+_SOURCE_ID_RE = re.compile(r"^(?P<episode>\d+)(?P<type>[sd])(?P<mirror>\d)$")
+_HLS_RE = re.compile(r"^/hls/(?P<source>[a-z0-9]+)/(?:master\.m3u8|(?P<height>\d+)/(?:index\.m3u8|seg-(?P<segment>\d+)\.ts))$")
+
+
+class MockSeries:
+    def __init__(self, series_id: int, slug: str, title: str, sub: int, dub: int) -> None:
+        self.id = series_id
+        self.slug = slug
+        self.title = title
+        self.sub = sub
+        self.dub = dub
+
+    def episode_id(self, number: int) -> int:
+        return self.id * 10000 + number
+
+    @property
+    def url_path(self) -> str:
+        return f"/{self.slug}-{self.id}"
+
+
+def load_catalogue(search_page: str = SEARCH_PAGE, max_episodes: int | None = None) -> dict[int, MockSeries]:
+    """The series listed on a recorded search page, keyed by id; episode counts come from its sub/dub ticks."""
+    with open(search_page, encoding="utf-8") as f:
+        webpage = f.read()
+
+    catalogue = {}
+    for item in iter_search_items(webpage):
+        match = item["path"] and _SERIES_PATH_RE.match(item["path"])
+        if not match:
+            continue
+        sub = int(item["sub"] or 1)
+        dub = int(item["dub"] or 0)
+        if max_episodes:
+            sub, dub = min(sub, max_episodes), min(dub, max_episodes)
+        series_id = int(match.group("id"))
+        catalogue[series_id] = MockSeries(series_id, match.group("slug"), item["title"], sub, dub)
+    return catalogue
+
+
+def synthetic_segment(source: str, height: int, index: int, size: int) -> bytes:
+    """size bytes of 188-byte TS packets (sync byte 0x47) with a payload unique to the segment."""
+    packets = max(1, size // TS_PACKET_SIZE)
+    seed = hashlib.sha1(f"{source}/{height}/{index}".encode("ascii")).digest()
+    payload = (seed * (TS_PACKET_SIZE // len(seed) + 1))[:TS_PACKET_SIZE - 4]
+    packet = b"\x47\x01\x00\x10" + payload
+    return packet * packets
+
+
+class MockSite:
+    """
+    The mock server and its knobs.
+
+    latency: seconds slept before every response.
+    bandwidth: bytes per second per response body (None is unlimited).
+    error_rate: share of requests answered with error_status instead (seeded, so repeatable).
+    failing_mirrors: mirror names ("HD-1", ...) whose /sources requests fail with 500.
+    segments, segment_duration, segment_size: shape of every media playlist; segment_size
+        is the 1080p size in bytes, lower renditions scale with their bitrate.
+    """
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, *, latency: float = 0.0,
+                 bandwidth: float | None = None, error_rate: float = 0.0, error_status: int = 503,
+                 failing_mirrors=(), segments: int = 10, segment_duration: float = 4.0,
+                 segment_size: int = 256 * 1024, max_episodes: int | None = None,
+                 search_page: str = SEARCH_PAGE, seed: int = 0) -> None:
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.failing_mirrors = set(failing_mirrors)
+        self.segments = segments
+        self.segment_duration = segment_duration
+        self.segment_size = segment_size
+        self.search_page = search_page
+        self.catalogue = load_catalogue(search_page, max_episodes)
+
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._requests = {}  # route -> count
+        self._timeline = []  # (route, started, finished) in time.perf_counter() seconds
+        self.bytes_sent = 0
+
+        self._server = _Server((host, port), _make_handler(self))
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def client_key(self, source: str) -> str:
+        return hashlib.sha256(source.encode("ascii")).hexdigest()[:48]
+
+    def series_url(self, series_id: int) -> str:
+        return self.url + self.catalogue[series_id].url_path
+
+    def start(self) -> "MockSite":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="mock-site", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self) -> "MockSite":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    @contextmanager
+    def patched(self):
+        """Points DEFAULT_BASE_URL and Megacloud at this site for the duration of the block."""
+        with pointed_at(self.url):
+            yield self
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"requests": dict(sorted(self._requests.items())),
+                    "total_requests": sum(self._requests.values()),
+                    "bytes_sent": self.bytes_sent}
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._requests.clear()
+            self._timeline.clear()
+            self.bytes_sent = 0
+
+    def timeline(self, since: float = 0.0) -> list[tuple[str, float, float]]:
+        """(route, started, finished) of the requests answered after `since` (a perf_counter value)."""
+        with self._lock:
+            return [entry for entry in self._timeline if entry[1] >= since]
+
+    def _count(self, route: str) -> bool:
+        """Records a request and decides whether it gets an injected error."""
+        with self._lock:
+            self._requests[route] = self._requests.get(route, 0) + 1
+            return self.error_rate > 0 and self._random.random() < self.error_rate
+
+    def _finished(self, route: str, started: float, size: int) -> None:
+        with self._lock:
+            self._timeline.append((route, started, time.perf_counter()))
+            self.bytes_sent += size
+
+    # --- Pages ---
+    def route(self, path: str, query: dict, headers) -> tuple[str, int, str, bytes, dict]:
+        """Returns (route, status, content type, body, extra headers) for a GET."""
+        if path == "/search":
+            with open(self.search_page, "rb") as f:
+                return "search", 200, "text/html; charset=utf-8", f.read(), {}
+
+        if path.startswith("/ajax/v2/episode/list/"):
+            series = self.catalogue.get(int(path.rsplit("/", 1)[1] or 0))
+            if series is None:
+                return "episode_list", 404, "application/json", b'{"status": false}', {}
+            body = self._episode_list(series)
+            etag = f'"{hashlib.md5(body).hexdigest()}"'
+            if headers.get("If-None-Match") == etag:
+                return "episode_list", 304, "application/json", b"", {"ETag": etag}
+            return "episode_list", 200, "application/json", body, {"ETag": etag}
+
+        if path == "/ajax/v2/episode/servers":
+            episode_id = int(query.get("episodeId", ["0"])[0])
+            return "servers", 200, "application/json", self._servers(episode_id), {}
+
+        if path == "/ajax/v2/episode/sources":
+            match = _SOURCE_ID_RE.match(query.get("id", [""])[0])
+            if not match:
+                return "sources", 404, "application/json", b'{"status": false}', {}
+            if MIRROR_NAMES[int(match.group("mirror"))] in self.failing_mirrors:
+                return "sources", 500, "application/json", b'{"status": false}', {}
+            body = json.dumps({"type": "iframe", "server": 4,
+                               "link": f"{self.url}/embed-2/v3/e-1/{match.group(0)}?k=1"})
+            return "sources", 200, "application/json", body.encode(), {}
+
+        if path == "/embed-2/v3/e-1/getSources":
+            source = query.get("id", [""])[0]
+            if query.get("_k", [""])[0] != self.client_key(source):
+                return "get_sources", 403, "application/json", b'{"status": false}', {}
+            return "get_sources", 200, "application/json", self._get_sources(source), {}
+
+        if path.startswith("/embed-2/v3/e-1/"):
+            source = path.rsplit("/", 1)[1]
+            body = (f'<!DOCTYPE html><html><head><title>File {source}</title></head><body>'
+                    f'<div id="megacloud-player" data-id="{source}"></div>'
+                    f'<script>window._xy_ws = "{self.client_key(source)}";</script></body></html>')
+            return "embed", 200, "text/html; charset=utf-8", body.encode(), {}
+
+        match = _HLS_RE.match(path)
+        if match:
+            source, height, segment = match.group("source", "height", "segment")
+            if height is None:
+                return "master_m3u8", 200, "application/vnd.apple.mpegurl", self._master_playlist(source), {}
+            if segment is None:
+                return "media_m3u8", 200, "application/vnd.apple.mpegurl", self._media_playlist(), {}
+            return "segment", 200, "video/mp2t", self._segment(source, int(height), int(segment)), {}
+
+        if path.startswith("/subs/"):
+            body = b"WEBVTT\n\n00:00:01.000 --> 00:00:03.000\nMock subtitle\n"
+            return "subtitles", 200, "text/vtt", body, {}
+
+        match = _SERIES_PATH_RE.match(path)
+        if match and int(match.group("id")) in self.catalogue:
+            series = self.catalogue[int(match.group("id"))]
+            body = (f'<!DOCTYPE html><html><head><title>Watch {series.title}</title></head><body>'
+                    f'<h2 class="film-name dynamic-name" data-jname="{series.title}">{series.title}</h2>'
+                    f'</body></html>')
+            return "series", 200, "text/html; charset=utf-8", body.encode(), {}
+
+        return "not_found", 404, "text/plain", b"Not Found", {}
+
+    def _episode_list(self, series: MockSeries) -> bytes:
+        items = "".join(
+            f'<a title="Episode {n}" class="ssl-item ep-item" data-number="{n}" data-id="{series.episode_id(n)}"'
+            f' href="/watch/{series.slug}-{series.id}?ep={series.episode_id(n)}">'
+            f'<div class="ssli-order">{n}</div><div class="ep-name e-dynamic-name">Episode {n}</div></a>'
+            for n in range(1, series.sub + 1)
+        )
+        html = f'<div class="ss-list">{items}</div>'
+        return json.dumps({"status": True, "html": html, "totalItems": series.sub}).encode()
+
+    def _servers(self, episode_id: int) -> bytes:
+        series = self.catalogue.get(episode_id // 10000)
+        number = episode_id % 10000
+        types = [t for t in SERVER_TYPES if series and number <= (series.sub if t == "sub" else series.dub)]
+        html = "".join(
+            f'<div class="item server-item" data-type="{t}" data-id="{episode_id}{t[0]}{i}" data-server-id="{4 + i}">'
+            f'<a href="javascript:;" class="btn">{mirror}</a></div>'
+            for t in types for i, mirror in enumerate(MIRROR_NAMES)
+        )
+        return json.dumps({"status": True, "html": f'<div class="player-servers">{html}</div>'}).encode()
+
+    def _get_sources(self, source: str) -> bytes:
+        return json.dumps({
+            "sources": [{"file": f"{self.url}/hls/{source}/master.m3u8", "type": "hls"}],
+            "tracks": [
+                {"file": f"{self.url}/subs/{source}/en.vtt", "label": "English", "kind": "captions", "default": True},
+                {"file": f"{self.url}/subs/{source}/thumbnails.vtt", "kind": "thumbnails"},
+            ],
+            "encrypted": False,
+            "intro": {"start": 0, "end": 90},
+            "outro": {"start": 1300, "end": 1390},
+            "server": 4,
+        }).encode()
+
+    def _master_playlist(self, source: str) -> bytes:
+        lines = ["#EXTM3U"]
+        for height, width, bitrate in RENDITIONS:
+            lines.append(f'#EXT-X-STREAM-INF:BANDWIDTH={bitrate},RESOLUTION={width}x{height},CODECS="avc1.640028,mp4a.40.2"')
+            lines.append(f"{height}/index.m3u8")
+        return ("\n".join(lines) + "\n").encode()
+
+    def _media_playlist(self) -> bytes:
+        lines = ["#EXTM3U", "#EXT-X-VERSION:3", f"#EXT-X-TARGETDURATION:{int(self.segment_duration + 0.999)}",
+                 "#EXT-X-MEDIA-SEQUENCE:0", "#EXT-X-PLAYLIST-TYPE:VOD"]
+        for index in range(self.segments):
+            lines.append(f"#EXTINF:{self.segment_duration:.3f},")
+            lines.append(f"seg-{index}.ts")
+        lines.append("#EXT-X-ENDLIST")
+        return ("\n".join(lines) + "\n").encode()
+
+    def _segment(self, source: str, height: int, index: int) -> bytes:
+        bitrate = next((b for h, _, b in RENDITIONS if h == height), RENDITIONS[-1][2])
+        size = self.segment_size * bitrate // RENDITIONS[0][2]
+        return synthetic_segment(source, height, index, size)
+
+
+@contextmanager
+def pointed_at(url: str):
+    """Points DEFAULT_BASE_URL and Megacloud at a mock site for the duration of the block."""
+    from downloader import anime_service
+    from megacloud import Megacloud
+
+    base_url = anime_service.DEFAULT_BASE_URL
+    megacloud_url, megacloud_headers = Megacloud.base_url, Megacloud.headers
+    anime_service.DEFAULT_BASE_URL = url
+    Megacloud.configure(url)
+    try:
+        yield url
+    finally:
+        anime_service.DEFAULT_BASE_URL = base_url
+        Megacloud.base_url, Megacloud.headers = megacloud_url, megacloud_headers
+
+
+@contextmanager
+def spawned(*args: str):
+    """
+    Runs `python -m benchmarks.mock_site --port 0 *args` in a child process and yields its
+    URL, for measurements (like memory) that the server must not share a process with.
+    """
+    process = subprocess.Popen([sys.executable, "-m", "benchmarks.mock_site", "--port", "0", *args],
+                               cwd=PROJECT_ROOT, stdout=subprocess.PIPE, text=True)
+    try:
+        match = re.search(r"http://\S+", process.stdout.readline())
+        if not match:
+            raise RuntimeError("Mock site did not start")
+        yield match.group(0)
+    finally:
+        process.terminate()
+        process.wait()
+        process.stdout.close()
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        if not isinstance(sys.exc_info()[1], ConnectionError):  # Clients dropping keep-alive sockets
+            super().handle_error(request, client_address)
+
+
+def _make_handler(site: MockSite):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # Keep-alive, like the real CDN
+
+        def do_GET(self):
+            started = time.perf_counter()
+            parsed = urlparse(self.path)
+            route, status, content_type, body, headers = site.route(
+                parsed.path, parse_qs(parsed.query), self.headers)
+            if site._count(route):
+                status, content_type, body, headers = site.error_status, "text/plain", b"Injected error", {}
+            if site.latency:
+                time.sleep(site.latency)
+
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.end_headers()
+            self._write(body)
+            site._finished(route, started, len(body))
+
+        def _write(self, body: bytes) -> None:
+            if not site.bandwidth:
+                self.wfile.write(body)
+                return
+            chunk = max(4096, int(site.bandwidth / 20))  # ~20 writes per second
+            for offset in range(0, len(body), chunk):
+                self.wfile.write(body[offset:offset + chunk])
+                time.sleep(len(body[offset:offset + chunk]) / site.bandwidth)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds before every response")
+    parser.add_argument("--bandwidth", type=float, default=None, help="bytes/sec per response")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of requests that fail")
+    parser.add_argument("--fail-mirror", action="append", default=[], choices=MIRROR_NAMES)
+    parser.add_argument("--segments", type=int, default=10, help="segments per episode")
+    parser.add_argument("--segment-size", type=int, default=256 * 1024, help="1080p segment bytes")
+    parser.add_argument("--max-episodes", type=int, default=None, help="cap the episodes per series")
+    args = parser.parse_args()
+
+    site = MockSite(args.host, args.port, latency=args.latency, bandwidth=args.bandwidth,
+                    error_rate=args.error_rate, failing_mirrors=args.fail_mirror, segments=args.segments,
+                    segment_size=args.segment_size, max_episodes=args.max_episodes)
+    series = next(iter(site.catalogue.values()))
+    print(f"Mock site on {site.url} ({len(site.catalogue)} series), e.g. {site.series_url(series.id)}")
+    print(f"  export HIANIME_BASE_URL={site.url} MEGACLOUD_BASE_URL={site.url}", flush=True)
+    try:
+        site._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        site._server.server_close()
+        print(json.dumps(site.stats(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
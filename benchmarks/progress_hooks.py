@@ -0,0 +1,131 @@
+# benchmarks/progress_hooks.py
+"""
+Progress hook storm: several episode threads fire synthetic yt-dlp progress hooks as fast
+as they can, and every event that would cross into the GUI thread lands in a queue.
+
+Compares the previous per-hook path (ANSI-clean four '_*_str' fields with a freshly compiled
+regex, then post one event per hook) with downloader.progress.ProgressAggregator, which posts
+at most max_rate events per second per file.
+
+    python -m benchmarks.progress_hooks [--episodes 8] [--hooks 5000] [--output result.json]
+"""
+import argparse
+import queue
+import re
+import threading
+import time
+
+from benchmarks.common import emit
+
+from downloader.progress import ProgressAggregator
+
+
+def make_hooks(episode: int, count: int) -> list[dict]:
+    """Download-progress dicts shaped like yt-dlp's for a fragmented HLS download."""
+    total = 300 * 1024 * 1024
+    info_dict = {"episode_number": episode, "episode": f"Episode {episode}", "title": f"Show - {episode}"}
+    hooks = []
+    for i in range(1, count + 1):
+        downloaded = total * i // count
+        hooks.append({
+            "status": "downloading",
+            "filename": f"/downloads/Show/Show - Episode {episode}.mp4",
+            "downloaded_bytes": downloaded,
+            "total_bytes_estimate": total,
+            "speed": 4.2 * 1024 * 1024,
+            "eta": (total - downloaded) / (4.2 * 1024 * 1024),
+            "fragment_index": i,
+            "fragment_count": count,
+            "_percent_str": f"\x1b[0;94m{downloaded * 100 / total:5.1f}%\x1b[0m",
+            "_speed_str": "\x1b[0;32m   4.20MiB/s\x1b[0m",
+            "_eta_str": "\x1b[0;33m00:42\x1b[0m",
+            "_total_bytes_str": "\x1b[0;34m300.00MiB\x1b[0m",
+            "info_dict": info_dict,
+        })
+    hooks.append(dict(hooks[-1], status="finished"))
+    return hooks
+
+
+def legacy_hook(gui_queue):
+    def strip_ansi_codes(text):
+        return re.compile(r'\x1B\[[0-?]*[ -/]*[@-~]').sub('', text) if text else ""
+
+    def hook(d):
+        if d["status"] == "downloading":
+            percent = strip_ansi_codes(d.get('_percent_str', '0.0%').strip())
+            speed = strip_ansi_codes(d.get('_speed_str', 'N/A').strip())
+            eta = strip_ansi_codes(d.get('_eta_str', 'N/A').strip())
+            total = strip_ansi_codes(d.get('_total_bytes_str', 'Unknown').strip())
+            gui_queue.put(("progress", int(float(percent.replace('%', '')))))
+            gui_queue.put(("log", f"{percent} of {total} @ {speed} (ETA: {eta}s)"))
+        else:
+            gui_queue.put(("log", f"Finished component: {d['filename']}"))
+    return hook
+
+
+def storm(hook, hooks_per_episode: list[list[dict]]) -> float:
+    """Runs one thread per episode, each firing its hooks back to back; returns wall seconds."""
+    start_barrier = threading.Barrier(len(hooks_per_episode) + 1)
+
+    def run(hooks):
+        start_barrier.wait()
+        for d in hooks:
+            hook(d)
+
+    threads = [threading.Thread(target=run, args=(hooks,)) for hooks in hooks_per_episode]
+    for thread in threads:
+        thread.start()
+    start_barrier.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start
+
+
+def run_case(make_hook, hooks_per_episode, repeat):
+    best = None
+    for _ in range(repeat):
+        gui_queue = queue.SimpleQueue()
+        seconds = storm(make_hook(gui_queue), hooks_per_episode)
+        if best is None or seconds < best[0]:
+            best = (seconds, gui_queue.qsize())
+    seconds, gui_events = best
+    hook_calls = sum(len(hooks) for hooks in hooks_per_episode)
+    return {
+        "hook_calls": hook_calls,
+        "gui_events": gui_events,
+        "wall_ms": round(seconds * 1000, 2),
+        "us_per_hook": round(seconds * 1e6 / hook_calls, 3),
+        "gui_events_per_sec": round(gui_events / seconds) if seconds else None,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--episodes", type=int, default=8, help="concurrent episode threads")
+    parser.add_argument("--hooks", type=int, default=5000, help="progress hooks per episode")
+    parser.add_argument("--max-rate", type=float, default=5.0, help="aggregator events/sec per file")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    hooks_per_episode = [make_hooks(episode, args.hooks) for episode in range(1, args.episodes + 1)]
+
+    results = {
+        "episodes": args.episodes,
+        "hooks_per_episode": args.hooks,
+        "max_rate": args.max_rate,
+        "legacy": run_case(legacy_hook, hooks_per_episode, args.repeat),
+        "aggregator": run_case(
+            lambda gui_queue: ProgressAggregator(gui_queue.put, max_rate=args.max_rate).hook,
+            hooks_per_episode, args.repeat,
+        ),
+    }
+    results["gui_event_reduction"] = round(
+        results["legacy"]["gui_events"] / max(1, results["aggregator"]["gui_events"]), 1
+    )
+    emit("progress_hooks", results, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+# benchmarks/run.py
+"""
+Runs the benchmark suite, each benchmark in its own process, and writes one JSON report
+that can be compared across commits.
+
+    python -m benchmarks.run [NAME ...] [--output report.json]
+                             [--compare baseline.json] [--threshold 0.2]
+
+Without names every benchmark runs; "micro" and "e2e" select a group. With --compare,
+timings (*_ms, *_s), memory (*_mb) and throughputs (*_per_s) are checked against the
+baseline report and the exit status is 1 if any got worse by more than --threshold.
+A benchmark that fails (including e2e_batch with failed episodes) makes the exit status 1
+and is left out of the report, so it is never compared against.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.common import PROJECT_ROOT, emit
+
+MICRO = ["megacloud_decode", "megacloud_ops", "megacloud_regex", "search_parse", "progress_hooks", "ydl_reuse"]
+E2E = ["e2e_search", "e2e_extract", "e2e_download", "e2e_batch"]  # Against benchmarks.mock_site
+GROUPS = {"micro": MICRO, "e2e": E2E}
+
+LOWER_IS_BETTER = ("_ms", "_s", "_mb")
+HIGHER_IS_BETTER = ("_per_s",)
+# Reference implementations the micro benchmarks keep for comparison; not gated
+IGNORED_SECTIONS = {"legacy"}
+
+
+def run_benchmark(name: str) -> dict:
+    """Runs `python -m benchmarks.<name>` and returns its results."""
+    with tempfile.TemporaryDirectory() as tmp:
+        output = os.path.join(tmp, "result.json")
+        subprocess.run([sys.executable, "-m", f"benchmarks.{name}", "--output", output],
+                       cwd=PROJECT_ROOT, stdout=subprocess.DEVNULL, check=True)
+        with open(output, encoding="utf-8") as f:
+            return json.load(f)["results"]
+
+
+def flatten(results, prefix: str = "") -> dict[str, float]:
+    metrics = {}
+    if isinstance(results, dict):
+        for key, value in results.items():
+            metrics.update(flatten(value, f"{prefix}.{key}" if prefix else str(key)))
+    elif isinstance(results, (int, float)) and not isinstance(results, bool):
+        metrics[prefix] = results
+    return metrics
+
+
+def compare(current: dict, baseline: dict, threshold: float, floor: float) -> list[dict]:
+    """Metrics that got worse by more than threshold; baselines below floor are too noisy to judge."""
+    regressions = []
+    old = flatten(baseline)
+    for path, value in flatten(current).items():
+        before = old.get(path)
+        *sections, key = path.split(".")
+        if before is None or abs(before) < floor or IGNORED_SECTIONS.intersection(sections):
+            continue
+        if key.endswith(HIGHER_IS_BETTER):
+            change = (before - value) / before
+        elif key.endswith(LOWER_IS_BETTER):
+            change = (value - before) / before
+        else:
+            continue
+        if change > threshold:
+            regressions.append({"metric": path, "baseline": before, "current": value,
+                                "worse_by": round(change * 100, 1)})
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("names", nargs="*", help="benchmarks or groups (micro, e2e) to run")
+    parser.add_argument("--output")
+    parser.add_argument("--compare", metavar="BASELINE", help="report of an earlier run")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed relative slowdown")
+    parser.add_argument("--floor", type=float, default=1.0, help="ignore metrics whose baseline is below this")
+    args = parser.parse_args()
+
+    names = []
+    for name in args.names or MICRO + E2E:
+        for member in GROUPS.get(name, [name]):
+            if member not in MICRO + E2E:
+                parser.error(f"unknown benchmark: {member}")
+            if member not in names:
+                names.append(member)
+
+    results, seconds, failed = {}, {}, []
+    for name in names:
+        print(f"Running {name}...", file=sys.stderr, flush=True)
+        start = time.perf_counter()
+        try:
+            results[name] = run_benchmark(name)
+        except subprocess.CalledProcessError as e:
+            print(f"{name} failed with exit status {e.returncode}", file=sys.stderr)
+            failed.append(name)
+        seconds[name] = round(time.perf_counter() - start, 1)
+
+    suite = {"benchmarks": results, "run_s": seconds, "failed": failed}
+    regressions = []
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline["results"]["benchmarks"], args.threshold, args.floor)
+        for name in baseline["results"].get("failed", []):
+            print(f"Baseline has no results for {name} (it failed there)", file=sys.stderr)
+        suite["compared_to"] = baseline.get("commit")
+        suite["regressions"] = regressions
+    emit("suite", suite, args.output)
+
+    for regression in regressions:
+        print(f"REGRESSION {regression['metric']}: {regression['baseline']} -> {regression['current']}"
+              f" ({regression['worse_by']}% worse)", file=sys.stderr)
+    if failed or regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# benchmarks/search_parse.py
+"""
+Search page parse cost: the previous yt-dlp helper path (get_elements_html_by_class plus
+get_element_by_class per field) versus the single-pass downloader.search_parser.
+
+    python -m benchmarks.search_parse [PAGE.html ...] [--output result.json]
+
+Without arguments the saved page in benchmarks/data/search_page.html (40 results) is used.
+"""
+import argparse
+import os
+import re
+
+from benchmarks.common import PROJECT_ROOT, emit, measure
+
+from yt_dlp.utils import clean_html, get_element_by_class, get_elements_html_by_class
+
+from downloader.search_parser import iter_search_items
+
+DEFAULT_PAGE = os.path.join(PROJECT_ROOT, "benchmarks", "data", "search_page.html")
+
+
+def legacy_parse(webpage: str) -> list[tuple]:
+    results = []
+    for element_html in get_elements_html_by_class('flw-item', webpage):
+        title = clean_html(get_element_by_class('film-name', element_html))
+        url_match = re.search(r'href="(/watch/[^"]+)"', element_html)
+        if not (title and url_match):
+            continue
+        sub_text = get_element_by_class('tick-item tick-sub', element_html)
+        dub_text = get_element_by_class('tick-item tick-dub', element_html)
+        img_match = re.search(r'data-src="([^"]+)"', element_html)
+        results.append((
+            title, url_match.group(1),
+            int(clean_html(sub_text)) if sub_text else 0,
+            int(clean_html(dub_text)) if dub_text else 0,
+            img_match.group(1) if img_match else None,
+        ))
+    return results
+
+
+def single_pass_parse(webpage: str) -> list[tuple]:
+    return [
+        (item["title"], item["path"], int(item["sub"] or 0), int(item["dub"] or 0), item["img"])
+        for item in iter_search_items(webpage)
+        if item["title"] and item["path"]
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("pages", nargs="*", default=[DEFAULT_PAGE], help="saved search pages")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    results = {}
+    for path in args.pages:
+        with open(path, encoding="utf-8") as f:
+            webpage = f.read()
+
+        expected = legacy_parse(webpage)
+        assert single_pass_parse(webpage) == expected, f"parsers disagree on {path}"
+
+        page = {
+            "items": len(expected),
+            "bytes": len(webpage.encode("utf-8")),
+            "legacy": measure(lambda: legacy_parse(webpage), number=5, repeat=args.repeat),
+            "single_pass": measure(lambda: single_pass_parse(webpage), number=20, repeat=args.repeat),
+        }
+        page["speedup"] = round(page["legacy"]["median_ms"] / page["single_pass"]["median_ms"], 2)
+        results[os.path.basename(path)] = page
+
+    emit("search_parse", results, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+# benchmarks/ydl_reuse.py
+"""
+Per-episode YoutubeDL setup cost: a fresh YoutubeDL per episode (build, look up and
+initialize the HiAnime extractor, close) versus a checkout from downloader.ydl_pool.
+
+    python -m benchmarks.ydl_reuse [--episodes 24] [--output result.json]
+
+No network access is needed; only the setup that precedes an extraction is timed.
+The options are the ones download_anime uses, post-processors included.
+"""
+import argparse
+import os
+import tempfile
+
+from benchmarks.common import emit, measure
+
+from yt_dlp import YoutubeDL
+
+from downloader.ydl_pool import YoutubeDLPool
+
+
+class _QuietLogger:
+    def debug(self, msg):
+        pass
+
+    info = warning = error = debug
+
+
+def episode_opts(outdir: str) -> dict:
+    return {
+        "format": "1080p/720p/480p/360p/240p/144p/best",
+        "outtmpl": os.path.join(outdir, '%(series)s - Episode %(episode_number)s - %(episode)s.%(ext)s'),
+        "postprocessors": [{'key': 'FFmpegEmbedSubtitle'},
+                           {'key': 'FFmpegMetadata', 'add_metadata': True, 'add_infojson': 'if_exists'}],
+        "subtitleslangs": ["all"],
+        "writesubtitles": True,
+        "writeautomaticsub": True,
+        "progress_hooks": [lambda d: None],
+        "postprocessor_hooks": [lambda d: None],
+        "logger": _QuietLogger(),
+        "quiet": True,
+        "continuedl": True,
+        "retries": 10,
+        "fragment_retries": 10,
+        "concurrent_fragment_downloads": 4,
+        "nocheckcertificate": True,
+        "http_headers": {'User-Agent': 'Mozilla/5.0'},
+    }
+
+
+def warm_extractor(ydl) -> None:
+    """What every extraction does before its first request."""
+    ie = ydl.get_info_extractor("HiAnime")
+    ie.initialize()
+
+
+def fresh(opts: dict) -> None:
+    with YoutubeDL(opts) as ydl:
+        warm_extractor(ydl)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--episodes", type=int, default=24, help="episodes per simulated batch")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as outdir:
+        opts = episode_opts(outdir)
+        pool = YoutubeDLPool(factory=YoutubeDL)
+
+        def pooled(opts=opts) -> None:
+            with pool.checkout(opts) as ydl:
+                warm_extractor(ydl)
+
+        fresh(opts)  # Import plugins and extractor modules outside the timed runs
+        results = {
+            "episodes": args.episodes,
+            "fresh_per_episode": measure(lambda: fresh(opts), number=args.episodes, repeat=args.repeat),
+            "pooled_per_episode": measure(pooled, number=args.episodes, repeat=args.repeat),
+        }
+        pool.close()
+
+    fresh_ms = results["fresh_per_episode"]["median_ms"]
+    pooled_ms = results["pooled_per_episode"]["median_ms"]
+    results["saved_ms_per_episode"] = round(fresh_ms - pooled_ms, 3)
+    results["saved_ms_per_batch"] = round((fresh_ms - pooled_ms) * args.episodes, 1)
+    emit("ydl_reuse", results, args.output)
+
+
+if __name__ == "__main__":
+    main()
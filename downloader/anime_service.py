@@ -1,17 +1,40 @@
 import os
 import sys
-import requests
 import pip_system_certs
+import queue
 import re
 import shutil
+import threading
 import time
-from PyQt6.QtCore import QObject, pyqtSignal
-from yt_dlp import YoutubeDL
-from yt_dlp.utils import clean_html, get_element_by_class, get_elements_html_by_class
-from yt_dlp_plugins.extractor import hianime
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple
 
-DEFAULT_BASE_URL = "https://hianime.to" # Update if needed, or make configurable
+from .episode_index import EpisodeIndex
+from .events import Event
+from .job_queue import JobQueue
+from .search_cache import SearchCache, _default_cache_dir as _default_search_cache_dir
+from .search_parser import iter_search_items
+from .ydl_pool import YoutubeDLPool
+
+# requests, yt-dlp and the HiAnime plugin are imported on first use so that headless
+# (CLI) invocations don't pay for them up front, and nothing here depends on Qt.
+
+DEFAULT_BASE_URL = os.getenv("HIANIME_BASE_URL", "https://hianime.to").rstrip("/")  # e.g. benchmarks/mock_site.py
 VERSION_REGEX = re.compile(r'^__version__\s*=\s*["\'](?P<version>[^"\']+)["\']', re.M)
+SEARCH_PAGE_RE = re.compile(r'[?&;]page=(\d+)')  # Pagination links (&amp;page=N in the HTML)
+DEFAULT_SEARCH_MAX_PAGES = 5          # Result pages read per search
+DEFAULT_SEARCH_PAGE_CONCURRENCY = 3   # Result pages downloaded at the same time
+QUALITIES = ['1080p', '720p', '480p', '360p', '240p', '144p']  # Format ids of the HiAnime plugin, best first
+DEFAULT_PREFETCH_DEPTH = 1            # Episodes resolved ahead of the downloads
+DEFAULT_STREAM_TTL = 10 * 60          # Seconds a resolved (signed) stream URL is trusted before re-resolving
+EXPIRED_STATUSES = (401, 403, 404, 410)  # HTTP statuses the CDN answers an expired signed URL with
+
+
+def _youtube_dl(opts):
+    """Creates a YoutubeDL instance, importing yt-dlp on first use."""
+    from yt_dlp import YoutubeDL
+    return YoutubeDL(opts)
+
 
 class Logger:
     """
@@ -105,13 +128,25 @@ class Logger:
         if self.gui_callback_fn:
             self.gui_callback_fn(gui_msg)
 
-class AnimeService(QObject):
-    download_completed_signal = pyqtSignal(str)  # Emits the anime title when download completes
-
-    def __init__(self, base_url=None):
-        super().__init__()
+class AnimeService:
+    """
+    Qt-free search/download service. Progress is reported through plain callbacks and
+    the Event attributes below; gui.service_adapter wraps them in Qt signals.
+    """
+    def __init__(self, base_url=None, search_cache: SearchCache | None = None, reuse_youtube_dl: bool = True):
+        self.download_completed = Event()  # (title) when a series download completes
+        self.episode_completed = Event()   # (title, episode_number, succeeded, quality), in episode order;
+                                           # quality is the downloaded format id, '' if none was downloaded
+        self.search_refreshed = Event()    # (keyword, results) after a stale search result was refreshed
+        self.job_started = Event()         # (job_id, title, episode_count, episodes_done) when a queued job starts
         self.base_url = base_url if base_url else DEFAULT_BASE_URL
         self._service_logger = Logger()
+        self.search_cache = search_cache if search_cache is not None else SearchCache(
+            cache_dir=_default_search_cache_dir(), logger=self._service_logger)
+        self._search_refreshing = set()
+        self._search_refresh_lock = threading.Lock()
+        # Warm YoutubeDL instances shared by every episode and series this service downloads
+        self._ydl_pool = YoutubeDLPool(max_idle=8 if reuse_youtube_dl else 0, factory=lambda opts: _youtube_dl(opts))
 
         self.ffmpeg_path = self._find_ffmpeg()
 
@@ -127,6 +162,14 @@ class AnimeService(QObject):
         # to check/download FFmpeg to a specific app directory and set self.ffmpeg_path
         # or a specific path for yt-dlp's 'ffmpeg_location' option.
 
+    def close(self) -> None:
+        """Closes the pooled YoutubeDL instances."""
+        self._ydl_pool.close()
+
+    def youtube_dl_stats(self) -> dict:
+        """How many YoutubeDL instances were created and how often one was reused."""
+        return self._ydl_pool.stats()
+
     def _find_ffmpeg(self) -> str | None:
         """
         Tries to find FFmpeg in the system PATH.
@@ -146,59 +189,155 @@ class AnimeService(QObject):
         self._service_logger.gui_callback_fn = gui_callback_fn
         self._service_logger.log_debug_to_gui = log_debug_to_gui
 
-    def search_anime(self, name: str) -> list:
+    def search_anime(self, name: str, refresh: bool = False, max_pages: int | None = None) -> list:
+        """
+        Returns the search results for name, served from the search cache when possible.
+
+        A stale cached result is returned immediately and refreshed in the background;
+        search_refreshed fires with the new results once that finishes. refresh=True
+        skips the cache and always fetches.
+        """
+        return list(self.iter_search_results(name, refresh=refresh, max_pages=max_pages))
+
+    def iter_search_results(self, name: str, refresh: bool = False, max_pages: int | None = None,
+                            page_concurrency: int | None = None):
+        """
+        Yields search results one at a time as they are parsed, across up to max_pages
+        result pages. Page 1 is parsed while the remaining pages are fetched concurrently
+        (page_concurrency at a time); results are always yielded in page order.
+
+        Cached results are yielded directly (see search_anime). Results are only cached
+        once every page has been consumed.
+        """
+        if not refresh:
+            cached, state = self.search_cache.get(self.base_url, name)
+            if state != SearchCache.MISS:
+                if state == SearchCache.STALE:
+                    self._service_logger.debug(f"Search cache stale for '{name}', refreshing in background")
+                    self._refresh_search_in_background(name, max_pages)
+                else:
+                    self._service_logger.debug(f"Search cache hit for '{name}' ({len(cached)} results)")
+                yield from cached
+                return
+
+        status = {}
+        results = []
+        for result in self._iter_search_pages(name, max_pages, page_concurrency, status):
+            results.append(result)
+            yield result
+
+        if status.get("complete"):
+            self.search_cache.put(self.base_url, name, results)
+
+    def invalidate_search_cache(self, name: str | None = None) -> None:
+        """Drops the cached results for name, or every cached search of the current site."""
+        self.search_cache.invalidate(self.base_url, name)
+
+    def search_cache_stats(self) -> dict:
+        return self.search_cache.stats()
+
+    def _refresh_search_in_background(self, name: str, max_pages: int | None = None) -> None:
+        key = SearchCache.make_key(self.base_url, name)
+        with self._search_refresh_lock:
+            if key in self._search_refreshing:
+                return
+            self._search_refreshing.add(key)
+
+        def refresh():
+            try:
+                status = {}
+                results = list(self._iter_search_pages(name, max_pages, None, status))
+                if status.get("complete"):
+                    self.search_cache.put(self.base_url, name, results, refresh=True)
+                    self.search_refreshed.emit(name, results)
+            finally:
+                with self._search_refresh_lock:
+                    self._search_refreshing.discard(key)
+
+        threading.Thread(target=refresh, name="search-refresh", daemon=True).start()
+
+    def _iter_search_pages(self, name: str, max_pages: int | None, page_concurrency: int | None, status: dict):
+        """
+        Fetches and parses the search pages, yielding results in order. Sets status['complete']
+        once every page was downloaded; a failed page 1 yields nothing.
+        """
+        import requests
+
+        max_pages = max_pages or DEFAULT_SEARCH_MAX_PAGES
+        page_concurrency = page_concurrency or DEFAULT_SEARCH_PAGE_CONCURRENCY
         # Using hianimez.to from your original downloader.py. Adapt base_url if needed.
         # For consistency, use self.base_url if this search is also for hianime.to
         # If search uses a different domain, define it explicitly.
         search_base_url = self.base_url
         search_url = f"{search_base_url}/search?keyword={name}"
         self._service_logger.info(f"Searching for anime: {name} on {search_url}")
-        results = []
 
-        try:
-            response = requests.get(search_url, headers={"Referer": search_base_url}, timeout=10)
+        session = requests.Session()
+        session.headers["Referer"] = search_base_url
+
+        def fetch(page):
+            url = search_url if page == 1 else f"{search_url}&page={page}"
+            response = session.get(url, timeout=10)
             response.raise_for_status()
-            webpage = response.text
+            return response.text
+
+        try:
+            webpage = fetch(1)
         except requests.RequestException as e:
             self._service_logger.error(f"Error downloading search page: {e}")
-            return []
+            session.close()
+            return
 
-        # Adapt your existing parsing logic from downloader.py's search_anime here
-        # Ensure clean_html, get_element_by_class, get_elements_html_by_class are imported
-        anime_elements = get_elements_html_by_class('flw-item', webpage)
-        if not anime_elements:
-            self._service_logger.warning(f"No anime elements found on search page for '{name}'. Site structure might have changed.")
-            return []
+        last_page = min(max_pages, max((int(p) for p in SEARCH_PAGE_RE.findall(webpage)), default=1))
+        executor = ThreadPoolExecutor(max_workers=page_concurrency, thread_name_prefix="search-page") if last_page > 1 else None
+        # Later pages download while page 1 is being parsed and consumed
+        futures = {page: executor.submit(fetch, page) for page in range(2, last_page + 1)} if executor else {}
+        count = 0
+        complete = True
+        try:
+            for page in range(1, last_page + 1):
+                if page > 1:
+                    try:
+                        webpage = futures[page].result()
+                    except requests.RequestException as e:
+                        self._service_logger.warning(f"Error downloading search page {page}: {e}")
+                        complete = False
+                        continue
+                page_count = 0
+                for result in self._parse_search_page(name, webpage):
+                    page_count += 1
+                    yield result
+                if page == 1 and not page_count:
+                    self._service_logger.warning(f"No anime elements found on search page for '{name}'. Site structure might have changed.")
+                count += page_count
+        finally:
+            if executor:
+                executor.shutdown(wait=False, cancel_futures=True)
+            session.close()
 
-        for element_html in anime_elements:
-            title = clean_html(get_element_by_class('film-name', element_html))
-            url_match = re.search(r'href="(/watch/[^"]+)"', element_html)
+        status["complete"] = complete
+        self._service_logger.info(f"Search for '{name}' found {count} results across {last_page} page(s).")
 
-            if not (title and url_match):
+    def _parse_search_page(self, name: str, webpage: str):
+        """Yields the result dicts of one search page as each flw-item is parsed."""
+        search_base_url = self.base_url
+        for item in iter_search_items(webpage):
+            title, anime_path = item["title"], item["path"]
+            if not (title and anime_path):
                 self._service_logger.warning(f"Skipped item: missing title or URL. Title found: '{title}'")
                 continue
 
-            anime_path = url_match.group(1)
             anime_full_url = f"{search_base_url}{anime_path}" # Use search_base_url
 
             sub, dub = 0, 0
             try:
-                sub_text = get_element_by_class('tick-item tick-sub', element_html)
-                if sub_text: sub = int(clean_html(sub_text))
-            except (ValueError, TypeError): self._service_logger.warning(f"Could not parse sub count for {title}.")
+                if item["sub"]: sub = int(item["sub"])
+            except ValueError: self._service_logger.warning(f"Could not parse sub count for {title}.")
             try:
-                dub_text = get_element_by_class('tick-item tick-dub', element_html)
-                if dub_text: dub = int(clean_html(dub_text))
-            except (ValueError, TypeError): self._service_logger.warning(f"Could not parse dub count for {title}.")
-
-            img_url = None
-            img_match = re.search(r'data-src="([^"]+)"', element_html)
-            if img_match: img_url = img_match.group(1)
+                if item["dub"]: dub = int(item["dub"])
+            except ValueError: self._service_logger.warning(f"Could not parse dub count for {title}.")
 
-            results.append({"title": title, "url": anime_full_url, "sub": sub, "dub": dub, "img": img_url})
-
-        self._service_logger.info(f"Search for '{name}' found {len(results)} results.")
-        return results
+            yield {"title": title, "url": anime_full_url, "sub": sub, "dub": dub, "img": item["img"]}
 
     def sanitize_filename_component(self, name: str) -> str: # Renamed from sanitize_directory_name for clarity
         """Sanitizes a string to be used as a valid file or directory name component."""
@@ -213,7 +352,17 @@ class AnimeService(QObject):
                        postprocessor_hook_for_gui=None,
                        log_ytdlp_debug_to_gui=False,
                        ffmpeg_location: str | None = None,  # From settings
-                       download_retries: int = 10):         # From settings
+                       download_retries: int = 10,          # From settings
+                       concurrent_episodes: int = 1,        # From settings
+                       fragment_concurrency: int = 4,       # From settings
+                       adaptive_fragments: bool = True,     # From settings
+                       bandwidth_limit: int | None = None,  # From settings, bytes/s for the whole batch
+                       job_queue: JobQueue | None = None,
+                       job_id: int | None = None,
+                       skip_downloaded: bool = True,
+                       rescan_index: bool = False,
+                       prefetch_depth: int = DEFAULT_PREFETCH_DEPTH,
+                       stream_ttl: float = DEFAULT_STREAM_TTL):
         """
         Downloads anime episodes using yt-dlp, with logging to console and optional GUI.
 
@@ -235,15 +384,43 @@ class AnimeService(QObject):
                 the GUI with verbose output.
             ffmpeg_location: Explicit path to FFmpeg executable from settings. Defaults to None.
             download_retries: Number of times to retry a download. Defaults to 10.
+            concurrent_episodes: Number of episodes downloaded at the same time, each by its
+                own YoutubeDL instance. Defaults to 1.
+            fragment_concurrency: Number of HLS fragments fetched in parallel per episode
+                (yt-dlp's concurrent_fragment_downloads). Defaults to 4.
+            adaptive_fragments: If True, the fragment concurrency is retuned between episodes
+                from the measured fragment throughput and retry rate, never exceeding
+                fragment_concurrency. Defaults to True.
+            bandwidth_limit: Total download rate for the batch in bytes per second. The running
+                episodes share it, so one left on its own may use all of it. None (default)
+                means unlimited.
+            job_queue: Optional JobQueue journaling the episodes of job_id. Episodes already
+                done there are skipped, stored episode URLs are used instead of expanding
+                the playlist, and every episode state change is recorded.
+            job_id: The id of this download in job_queue.
+            skip_downloaded: If True (default), episodes recorded in the series directory's
+                EpisodeIndex whose file is still there are skipped without any network request.
+            rescan_index: If True, the EpisodeIndex is first rebuilt from the file names in
+                the series directory. This also happens when the directory has no index yet.
+            prefetch_depth: Number of episodes whose streams (servers, sources, Megacloud,
+                master m3u8) are resolved ahead of the downloads, so extraction overlaps with
+                transfers. 0 resolves each episode right before downloading it. Defaults to 1.
+            stream_ttl: Seconds a prefetched episode is used before it is resolved again,
+                because its signed stream URLs may have expired. Defaults to 10 minutes.
+
+        Returns:
+            True if at least one episode was downloaded, False otherwise.
         """
         
         ytdlp_logger = Logger(gui_logger_callback, context_name="yt-dlp")
         ytdlp_logger.log_debug_to_gui = True  # Enable debug messages to GUI
         ytdlp_logger.log_debug_to_gui = log_ytdlp_debug_to_gui
 
-        if not hianime:
-            ytdlp_logger.error("HiAnime IE class not loaded. Cannot download.")
-            return
+        try:
+            from yt_dlp_plugins.extractor import hianime
+        except ImportError as e:
+            ytdlp_logger.error(f"HiAnime IE class not loaded. Cannot download: {e}")
+            return False
         '''
         try:
             plugin_ie_key = hianime.ie_key()
@@ -259,22 +436,23 @@ class AnimeService(QObject):
             os.makedirs(base_download_dir, exist_ok=True)
         except OSError as e:
             ytdlp_logger.error(f"Failed to ensure base download directory '{base_download_dir}': {e}")
-            return
+            return False
 
         series_dir = os.path.join(base_download_dir, sanitized_series_title)
         try:
             os.makedirs(series_dir, exist_ok=True)
         except OSError as e:
             ytdlp_logger.error(f"Failed to create series download directory '{series_dir}': {e}")
-            return
+            return False
+
+        episode_index = EpisodeIndex(series_dir, self._service_logger) if skip_downloaded else None
+        if episode_index and (rescan_index or not os.path.exists(episode_index.path)):
+            ytdlp_logger.info(f"Episode index rebuilt: {episode_index.rescan()} downloaded episode(s) in {series_dir}")
 
         output_template = os.path.join(series_dir, '%(series)s - Episode %(episode_number)s - %(episode)s.%(ext)s')
-        qualities = ['1080p', '720p', '480p', '360p', '240p', '144p']
         selected_quality = quality.lower()
-        if selected_quality in qualities:
-            index = qualities.index(selected_quality)
-            fallback_qualities = qualities[index:] + ['best']
-            plugin_custom_format = '/'.join(fallback_qualities)
+        if selected_quality in QUALITIES:
+            plugin_custom_format = '/'.join(QUALITIES[QUALITIES.index(selected_quality):] + ['best'])
         else:
             plugin_custom_format = 'best'
 
@@ -332,40 +510,602 @@ class AnimeService(QObject):
         # Add lang to url
         url = f"{url}&lang={lang.lower()}" if '?' in url else f"{url}?lang={lang.lower()}"
 
-        qualities = ['1080p', '720p', '480p', '360p', '240p', '144p']
-        selected_quality = quality.lower()
-        plugin_custom_format = selected_quality
+        # Expand the playlist once, then hand each episode to its own worker
+        journal = (_EpisodeJournal(job_queue, job_id, self._service_logger)
+                   if job_queue is not None and job_id is not None else None)
+        if journal and job_queue.episodes(job_id):
+            episodes = [(e["number"], e["url"]) for e in job_queue.runnable_episodes(job_id)]
+            if not episodes:
+                ytdlp_logger.info(f"No episodes of {title} are due for download.")
+                return True
+        elif episode_index and all(number in episode_index for number in range(start_ep, end_ep + 1)):
+            # Every requested episode is on disk: no need to even load the playlist
+            episodes = [(number, episode_index.get(number)["url"] or "") for number in range(start_ep, end_ep + 1)]
+            if journal:
+                job_queue.set_episodes(job_id, episodes)
+        else:
+            episodes = self._expand_playlist(url, opts, ytdlp_logger)
+            if not episodes:
+                ytdlp_logger.error(f"No episodes found for {title} in range {start_ep}-{end_ep}.")
+                return False
+            if journal:
+                job_queue.set_episodes(job_id, episodes)
+
+        reporter = _OrderedCompletionReporter(
+            [number for number, _ in episodes],
+            lambda number, ok, format_id: self.episode_completed.emit(title, number, ok, format_id),
+        )
+        downloaded = [number for number, _ in episodes if episode_index and number in episode_index]
+        if downloaded:
+            ytdlp_logger.info(f"Skipping {len(downloaded)} already downloaded episode(s) of {title}: {downloaded}")
+            for number in downloaded:
+                if journal:
+                    journal.update(number, JobQueue.DONE, error=None)
+                reporter.complete(number, True, "")
+            episodes = [(number, episode_url) for number, episode_url in episodes if number not in downloaded]
+            if not episodes:
+                ytdlp_logger.info(f"All requested episodes of {title} are already downloaded.")
+                return True
+
+        workers = max(1, min(concurrent_episodes, len(episodes)))
+        episode_opts = {k: v for k, v in opts.items() if k not in ("playliststart", "playlistend")}
+        # yt-dlp's ratelimit is fixed per fragment download, so the batch limit is enforced here instead
+        budget = BandwidthBudget(bandwidth_limit) if bandwidth_limit else None
+
+        ytdlp_logger.info(
+            f"Downloading {len(episodes)} episode(s) with {workers} concurrent worker(s)"
+            + (f", bandwidth limit {bandwidth_limit // 1024} KiB/s" if bandwidth_limit else "")
+        )
+
+        tuner = FragmentConcurrencyTuner(fragment_concurrency, adaptive=adaptive_fragments)
+        failures = []
 
-        max_retries = 10
-        for attempt in range(max_retries):
+        def resolve_episode(number, episode_url):
+            if journal:
+                journal.update(number, JobQueue.RESOLVING)
+            return self._resolve_episode(episode_url, {**episode_opts, "logger": ytdlp_logger})
+
+        def run_episode(number, episode_url, resolved=None):
+            stats = FragmentStats(tuner.level)
+            run_opts = {
+                **episode_opts,
+                "concurrent_fragment_downloads": stats.concurrency,
+                "logger": _EpisodeLogger(stats, gui_logger_callback, context_name="yt-dlp"),
+                "progress_hooks": [stats.wrap_hook(progress_hook_for_gui)],
+            }
+            run_opts["logger"].log_debug_to_gui = log_ytdlp_debug_to_gui
+            final_path = _FinalPathRecorder()
+            run_opts["progress_hooks"].append(final_path.progress_hook)
+            if budget:
+                run_opts["progress_hooks"].append(budget.progress_hook())
+            run_opts["postprocessor_hooks"] = [*episode_opts["postprocessor_hooks"], final_path.postprocessor_hook]
+            if journal:
+                run_opts["progress_hooks"].append(journal.progress_hook(number))
+                run_opts["postprocessor_hooks"].append(journal.postprocessor_hook(number))
+                if resolved is None:
+                    journal.update(number, JobQueue.RESOLVING)
             try:
-                with YoutubeDL(opts) as ydl:
-                    ydl.extract_info(url, download=True)
-                ytdlp_logger.info(f"Download process for {title} (yt-dlp phase) finished.")
-                self.download_completed_signal.emit(title)  # Emit signal for download history
-                break  # Success, exit loop
+                if isinstance(resolved, Exception):
+                    raise resolved  # The prefetcher could not resolve this episode
+                format_id = self._download_episode(episode_url, run_opts, selected_quality, ytdlp_logger,
+                                                   resolved=resolved, stream_ttl=stream_ttl)
             except Exception as e:
-                error_msg = str(e)
-                if "Requested format is not available" in error_msg:
-                    if attempt < max_retries - 1:
-                        ytdlp_logger.warning(f"Attempt {attempt + 1} failed: Selected quality '{selected_quality}' not available. Retrying in 10 seconds...")
-                        time.sleep(10)
-                        continue
-                    else:
-                        # After 10 attempts, fallback
-                        ytdlp_logger.warning(f"Selected quality '{selected_quality}' not available after {max_retries} attempts, trying fallback qualities.")
-                        if selected_quality in qualities:
-                            index = qualities.index(selected_quality)
-                            fallback_qualities = qualities[index + 1:] + ['best']  # Skip the selected, start from next
-                            fallback_format = '/'.join(fallback_qualities)
-                            opts['format'] = fallback_format
-                            ytdlp_logger.info(f"Retrying with fallback format: {fallback_format}")
-                            with YoutubeDL(opts) as ydl:
-                                ydl.extract_info(url, download=True)
-                            ytdlp_logger.info(f"Download process for {title} (yt-dlp phase) finished with fallback.")
-                            self.download_completed_signal.emit(title)
-                        else:
-                            raise
-                else:
-                    # For other errors, fail immediately
-                    raise 
+                ytdlp_logger.error(f"Episode {number} of {title} failed: {e}")
+                failures.append(number)
+                if journal:
+                    journal.failed(number, str(e))
+                reporter.complete(number, False, "")
+            else:
+                if episode_index and final_path.path and os.path.isfile(final_path.path):
+                    episode_index.add(number, final_path.path, episode_url)
+                if journal:
+                    journal.update(number, JobQueue.DONE, error=None, filename=final_path.path)
+                reporter.complete(number, True, format_id)
+            finally:
+                if stats.fragments:
+                    ytdlp_logger.info(
+                        f"Episode {number}: {stats.fragments} fragments at {stats.fragments_per_sec():.1f}/s "
+                        f"with {stats.concurrency} worker(s), {stats.retries} retries"
+                    )
+                    new_level = tuner.record(stats)
+                    if new_level != stats.concurrency:
+                        ytdlp_logger.info(f"Fragment concurrency adjusted to {new_level}")
+
+        if prefetch_depth > 0:
+            # Resolver threads run ahead of the download workers by up to prefetch_depth episodes
+            prefetcher = _EpisodePrefetcher(episodes, resolve_episode, prefetch_depth, threads=workers)
+
+            def download_prefetched():
+                while (item := prefetcher.get()) is not None:
+                    run_episode(*item)
+
+            try:
+                with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="episode") as executor:
+                    for _ in range(workers):
+                        executor.submit(download_prefetched)
+            finally:
+                prefetcher.close()
+        else:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="episode") as executor:
+                for number, episode_url in episodes:
+                    executor.submit(run_episode, number, episode_url)
+
+        if failures:
+            ytdlp_logger.error(f"{len(failures)} episode(s) of {title} failed: {sorted(failures)}")
+        if len(failures) < len(episodes):
+            ytdlp_logger.info(f"Download process for {title} (yt-dlp phase) finished.")
+            self.download_completed.emit(title)  # Emit event for download history
+            return True
+        return False
+
+    def run_job_queue(self, job_queue: JobQueue, stop_event: threading.Event | None = None,
+                      job_ids=None, **download_kwargs) -> bool:
+        """
+        Downloads every unfinished job of job_queue, oldest first, resuming interrupted
+        ones. Failed episodes are retried after their backoff until they run out of
+        attempts. Jobs added while this runs are picked up too. Setting stop_event stops
+        after the current download pass and leaves the current job resumable.
+
+        job_ids restricts the run to those jobs; other unfinished jobs are left alone.
+
+        download_kwargs are passed to download_anime, overridden by each job's own options.
+        Returns True if every processed job completed all of its episodes.
+        """
+        stop_event = stop_event or threading.Event()
+        recovered = job_queue.recover(job_ids)
+        if recovered:
+            self._service_logger.info(f"Resuming {recovered} interrupted episode(s) from the job queue.")
+
+        all_ok = True
+        while not stop_event.is_set():
+            job = job_queue.next_job(job_ids)
+            if job is None:
+                break
+            job_id = job["id"]
+            job_queue.set_job_state(job_id, JobQueue.RUNNING)
+            done = sum(1 for e in job_queue.episodes(job_id) if e["state"] == JobQueue.DONE)
+            self.job_started.emit(job_id, job["title"], job["end_ep"] - job["start_ep"] + 1, done)
+
+            while True:
+                self.download_anime(
+                    job["title"], job["url"], job["lang"], job["quality"], job["start_ep"], job["end_ep"],
+                    job["download_dir"], **{**download_kwargs, **job["options"]},
+                    job_queue=job_queue, job_id=job_id,
+                )
+                retry_at = job_queue.next_retry_at(job_id)
+                if retry_at is None or stop_event.is_set():
+                    break
+                delay = max(0.0, retry_at - time.time())
+                self._service_logger.info(f"Retrying failed episode(s) of {job['title']} in {delay:.0f}s.")
+                if stop_event.wait(delay):
+                    break
+
+            if stop_event.is_set():
+                break  # Leave the job running; the next run_job_queue resumes it
+            episodes = job_queue.episodes(job_id)
+            failed = [e["number"] for e in episodes if e["state"] != JobQueue.DONE]
+            if episodes and not failed:
+                job_queue.set_job_state(job_id, JobQueue.DONE)
+            else:
+                all_ok = False
+                error = f"Failed episodes: {failed}" if episodes else "No episodes found"
+                job_queue.set_job_state(job_id, JobQueue.FAILED, error)
+        return all_ok
+
+    def list_episodes(self, url: str, lang: str = "SUB") -> list[tuple[int, str]]:
+        """Returns the (episode_number, episode_url) pairs of a series without downloading."""
+        url = f"{url}&lang={lang.lower()}" if '?' in url else f"{url}?lang={lang.lower()}"
+        logger = Logger(self._service_logger.gui_callback_fn, context_name="yt-dlp")
+        opts = {"logger": logger, "quiet": True, "nocheckcertificate": True}
+        return self._expand_playlist(url, opts, logger)
+
+    def _expand_playlist(self, url, opts, logger) -> list[tuple[int, str]]:
+        """
+        Resolves the playlist range to (episode_number, episode_url) pairs without
+        extracting any episode.
+        """
+        flat_opts = {**opts, "extract_flat": "in_playlist"}
+        with self._ydl_pool.checkout(flat_opts) as ydl:
+            info = ydl.extract_info(url, download=False)
+
+        if info.get("_type") != "playlist":
+            # Single episode URL
+            return [(opts.get("playliststart") or 1, url)]
+
+        start = opts.get("playliststart") or 1
+        episodes = []
+        for offset, entry in enumerate(info.get("entries") or []):
+            if entry and entry.get("url"):
+                number = entry.get("episode_number") or entry.get("playlist_index") or start + offset
+                episodes.append((number, entry["url"]))
+            else:
+                logger.warning(f"Skipping playlist entry {start + offset}: no URL")
+
+        return episodes
+
+    def _resolve_episode(self, url, opts) -> "ResolvedEpisode":
+        """Extracts an episode's info dict and formats, unprocessed, without downloading."""
+        with self._ydl_pool.checkout({**opts, "progress_hooks": [], "postprocessor_hooks": []}) as ydl:
+            info = ydl.extract_info(url, download=False, process=False)
+        return ResolvedEpisode(info, time.monotonic())
+
+    def _download_episode(self, url, opts, selected_quality, ytdlp_logger,
+                          resolved: "ResolvedEpisode | None" = None,
+                          stream_ttl: float = DEFAULT_STREAM_TTL) -> str:
+        """
+        Downloads a single episode from one extraction: its formats are probed first
+        (download=False, unprocessed), the best quality of the fallback ladder that is
+        actually offered is picked, and the resolved info dict is then downloaded through
+        process_ie_result without extracting again.
+
+        resolved is an episode prefetched by _resolve_episode. It is resolved again if it
+        is older than stream_ttl, or once if downloading it fails with an HTTP error that
+        points at an expired signed URL.
+
+        Returns the format id that was downloaded.
+        """
+        if resolved is not None and resolved.age() > stream_ttl:
+            ytdlp_logger.info(f"Prefetched streams for {url} are {resolved.age():.0f}s old; resolving again")
+            resolved = None
+        prefetched = resolved is not None
+        if resolved is None:
+            resolved = self._resolve_episode(url, opts)
+
+        try:
+            return self._download_resolved(resolved.info, opts, selected_quality, ytdlp_logger, url)
+        except Exception as e:
+            if not (prefetched and _looks_expired(e)):
+                raise
+            ytdlp_logger.warning(f"Prefetched streams for {url} were rejected ({e}); resolving again")
+            resolved = self._resolve_episode(url, opts)
+            return self._download_resolved(resolved.info, opts, selected_quality, ytdlp_logger, url)
+
+    def _download_resolved(self, info, opts, selected_quality, ytdlp_logger, url) -> str:
+        with self._ydl_pool.checkout(opts) as ydl:
+            available = {f.get("format_id") for f in info.get("formats") or ()}
+            if available:
+                format_id = pick_quality(selected_quality, available)
+                if format_id != selected_quality:
+                    ytdlp_logger.warning(
+                        f"Quality '{selected_quality}' not offered for {url} "
+                        f"(available: {', '.join(sorted(f for f in available if f))}); using '{format_id}'"
+                    )
+                ydl.params["format"] = format_id
+                ydl.format_selector = ydl.build_format_selector(format_id)
+            # Without a format list (e.g. a URL result) the ladder in opts['format'] decides
+            result = ydl.process_ie_result(info, download=True)
+            # Read before the instance goes back to the pool, where another episode reconfigures it
+            return (result or {}).get("format_id") or ydl.params["format"]
+
+
+class ResolvedEpisode(NamedTuple):
+    """An episode's unprocessed info dict and when it was extracted (time.monotonic())."""
+    info: dict
+    resolved_at: float
+
+    def age(self) -> float:
+        return time.monotonic() - self.resolved_at
+
+
+def _looks_expired(error: Exception) -> bool:
+    """
+    Whether a download error is what an expired signed stream URL produces: an HTTPError
+    with one of EXPIRED_STATUSES anywhere in its chain (yt-dlp's DownloadError.exc_info,
+    ExtractorError.cause, or __cause__/__context__).
+    """
+    from yt_dlp.networking.exceptions import HTTPError
+
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        if isinstance(error, HTTPError):
+            return error.status in EXPIRED_STATUSES
+        exc_info = getattr(error, "exc_info", None)
+        error = ((exc_info[1] if exc_info else None) or getattr(error, "cause", None)
+                 or error.__cause__ or error.__context__)
+    return False
+
+
+class _EpisodePrefetcher:
+    """
+    Resolves episodes on background threads ahead of the download workers. At most depth
+    episodes are being resolved or wait resolved at any time: a resolver takes a slot
+    before it starts on an episode, and get() frees it. get() returns (number, url,
+    ResolvedEpisode or the resolving exception), or None when all are taken.
+    """
+    _DONE = object()
+
+    def __init__(self, episodes, resolve, depth: int, threads: int = 1):
+        self._episodes = iter(episodes)
+        self._resolve = resolve
+        self._queue = queue.Queue()
+        self._slots = threading.Semaphore(max(1, depth))
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._running = max(1, min(threads, depth))  # More threads than slots would only wait
+        for i in range(self._running):
+            threading.Thread(target=self._run, name=f"resolver-{i}", daemon=True).start()
+
+    def _run(self):
+        try:
+            while self._take_slot():
+                with self._lock:
+                    item = next(self._episodes, None)
+                if item is None:
+                    self._slots.release()
+                    break
+                number, url = item
+                try:
+                    resolved = self._resolve(number, url)
+                except Exception as e:
+                    resolved = e
+                self._queue.put((number, url, resolved))
+        finally:
+            with self._lock:
+                self._running -= 1
+                last = self._running == 0
+            if last:
+                self._queue.put(self._DONE)
+
+    def _take_slot(self) -> bool:
+        while not self._stopped.is_set():
+            if self._slots.acquire(timeout=0.5):
+                return True
+        return False
+
+    def get(self):
+        item = self._queue.get()
+        if item is self._DONE:
+            self._queue.put(item)  # Let the other workers see it too
+            return None
+        self._slots.release()
+        return item
+
+    def close(self):
+        self._stopped.set()
+
+
+def pick_quality(selected_quality: str, available) -> str:
+    """
+    The first format id of the ladder selected_quality, then every lower quality, that is
+    in available; 'best' if none of them is.
+    """
+    ladder = QUALITIES[QUALITIES.index(selected_quality):] if selected_quality in QUALITIES else []
+    return next((quality for quality in ladder if quality in available), "best")
+
+
+class FragmentStats:
+    """
+    Per-episode HLS fragment statistics gathered from yt-dlp's progress hook and
+    fragment retry messages.
+    """
+    def __init__(self, concurrency):
+        self.concurrency = concurrency
+        self.fragments = 0
+        self.fragment_count = None
+        self.retries = 0
+        self.started_at = None
+        self.elapsed = 0.0
+        self._lock = threading.Lock()  # Fragment threads report concurrently
+
+    def fragments_per_sec(self) -> float:
+        return self.fragments / self.elapsed if self.elapsed > 0 else 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "concurrency": self.concurrency,
+            "fragment_index": self.fragments,
+            "fragment_count": self.fragment_count,
+            "fragments_per_sec": round(self.fragments_per_sec(), 2),
+            "retries": self.retries,
+        }
+
+    def update(self, d):
+        if d.get("fragment_index") is None:
+            return
+        now = time.monotonic()
+        with self._lock:
+            if self.started_at is None:
+                self.started_at = now
+            self.fragments = max(self.fragments, d["fragment_index"])
+            self.fragment_count = d.get("fragment_count") or self.fragment_count
+            self.elapsed = now - self.started_at
+
+    def add_retry(self):
+        with self._lock:
+            self.retries += 1
+
+    def wrap_hook(self, progress_hook):
+        """Returns a progress hook that records stats and passes them on as d['fragment_stats']."""
+        def hook(d):
+            if d.get("status") == "downloading":
+                self.update(d)
+            if progress_hook:
+                progress_hook({**d, "fragment_stats": self.as_dict()})
+        return hook
+
+
+class FragmentConcurrencyTuner:
+    """
+    Picks the fragment concurrency for the next episode from the last finished ones.
+
+    Starts at maximum. Halves the level when more than 5% of fragments needed a retry,
+    otherwise keeps stepping in the current direction and reverses when throughput drops
+    by more than 10%. The level stays within [1, maximum]; with adaptive=False it is
+    fixed at maximum.
+    """
+    ERROR_RATE_LIMIT = 0.05
+
+    def __init__(self, maximum, adaptive=True):
+        self.maximum = max(1, maximum)
+        self.adaptive = adaptive
+        self.level = self.maximum
+        self._last_throughput = None
+        self._direction = 1
+        self._lock = threading.Lock()
+
+    def record(self, stats: FragmentStats) -> int:
+        if not self.adaptive or not stats.fragments:
+            return self.level
+
+        with self._lock:
+            throughput = stats.fragments_per_sec()
+            if stats.retries / stats.fragments > self.ERROR_RATE_LIMIT:
+                self.level = max(1, stats.concurrency // 2)
+                self._direction = 1
+            elif self._last_throughput is not None and throughput < self._last_throughput * 0.9:
+                # Got worse: step back the other way
+                self._direction = -self._direction
+                self.level = min(self.maximum, max(1, stats.concurrency + self._direction))
+            else:
+                self.level = min(self.maximum, max(1, stats.concurrency + self._direction))
+
+            self._last_throughput = throughput
+            return self.level
+
+
+class BandwidthBudget:
+    """
+    Token bucket shared by the episodes of a batch. Progress hooks report the bytes each
+    episode received and sleep on its download thread while the batch is over rate, so
+    bandwidth an idle or finished episode does not use is left to the others.
+    """
+    def __init__(self, rate: int, burst: float = 1.0, clock=time.monotonic, sleep=time.sleep):
+        self.rate = max(1, rate)
+        self.capacity = self.rate * burst
+        self._tokens = self.capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def consume(self, nbytes: int) -> float:
+        """Takes nbytes from the bucket, sleeping until they are covered. Returns the delay."""
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= nbytes
+            delay = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if delay > 0:
+            self._sleep(delay)
+        return delay
+
+    def progress_hook(self):
+        """A progress hook for one episode, charging the growth of its downloaded_bytes."""
+        last = [None]
+        lock = threading.Lock()  # Fragment threads report concurrently
+
+        def hook(d):
+            if d.get("status") != "downloading" or d.get("downloaded_bytes") is None:
+                return
+            with lock:
+                # The first report may include bytes resumed from disk, so it is only the baseline
+                delta = d["downloaded_bytes"] - last[0] if last[0] is not None else 0
+                last[0] = d["downloaded_bytes"]
+            if delta > 0:
+                self.consume(delta)
+        return hook
+
+
+class _EpisodeLogger(Logger):
+    """
+    yt-dlp logger for one episode that also counts fragment retries. yt-dlp reports them
+    ("[download] Got error: ... Retrying fragment N (1/10)...") through to_screen, which
+    goes to debug() when a logger is set; warning() is kept for older versions.
+    """
+    def __init__(self, stats, gui_callback_fn=None, context_name="yt-dlp"):
+        super().__init__(gui_callback_fn, context_name)
+        self.stats = stats
+
+    def _count_retry(self, msg):
+        if "Retrying fragment" in msg:
+            self.stats.add_retry()
+
+    def debug(self, msg):
+        self._count_retry(msg)
+        super().debug(msg)
+
+    def warning(self, msg):
+        self._count_retry(msg)
+        super().warning(msg)
+
+
+class _FinalPathRecorder:
+    """Remembers where yt-dlp put an episode's final file, after any post-processing."""
+    def __init__(self):
+        self.path = None
+
+    def progress_hook(self, d):
+        if d.get("status") == "finished" and not self.path:
+            self.path = d.get("filename")
+
+    def postprocessor_hook(self, d):
+        if d.get("status") == "finished":
+            self.path = (d.get("info_dict") or {}).get("filepath") or self.path
+
+
+class _EpisodeJournal:
+    """
+    Records the episode states of one download_anime run in its JobQueue. Byte offsets
+    from progress hooks are written at most once per interval seconds per episode.
+    """
+    def __init__(self, job_queue: JobQueue, job_id: int, logger: Logger, interval: float = 2.0):
+        self.job_queue = job_queue
+        self.job_id = job_id
+        self.logger = logger
+        self.interval = interval
+
+    def update(self, number, state, **fields):
+        try:
+            self.job_queue.update_episode(self.job_id, number, state, **fields)
+        except Exception as e:  # A journal problem must not abort the download itself
+            self.logger.warning(f"Could not update job queue for episode {number}: {e}")
+
+    def failed(self, number, error):
+        try:
+            self.job_queue.record_failure(self.job_id, number, error)
+        except Exception as e:
+            self.logger.warning(f"Could not record failure of episode {number} in job queue: {e}")
+
+    def progress_hook(self, number):
+        last_written = [0.0]
+
+        def hook(d):
+            if d.get("status") != "downloading":
+                return
+            now = time.monotonic()
+            if now - last_written[0] < self.interval:
+                return
+            last_written[0] = now
+            self.update(number, JobQueue.DOWNLOADING,
+                        filename=d.get("filename"),
+                        downloaded_bytes=d.get("downloaded_bytes") or 0,
+                        total_bytes=d.get("total_bytes") or d.get("total_bytes_estimate"))
+        return hook
+
+    def postprocessor_hook(self, number):
+        def hook(d):
+            if d.get("status") == "started":
+                self.update(number, JobQueue.POSTPROCESSING)
+        return hook
+
+
+class _OrderedCompletionReporter:
+    """
+    Reports episode completions in episode order even when workers finish out of order.
+    """
+    def __init__(self, episode_numbers, callback):
+        self._order = list(episode_numbers)
+        self._callback = callback
+        self._results = {}
+        self._next = 0
+        self._lock = threading.Lock()
+
+    def complete(self, episode_number, ok, format_id=""):
+        with self._lock:
+            self._results[episode_number] = (ok, format_id)
+            while self._next < len(self._order) and self._order[self._next] in self._results:
+                number = self._order[self._next]
+                self._callback(number, *self._results.pop(number))
+                self._next += 1
@@ -0,0 +1,233 @@
+"""
+Headless command-line front end for AnimeService.
+
+    python -m downloader search "frieren"
+    python -m downloader episodes https://hianime.to/watch/frieren-18542
+    python -m downloader download https://hianime.to/watch/frieren-18542 --start 1 --end 4 -o ~/Anime
+    python -m downloader batch jobs.txt -o ~/Anime
+    python -m downloader queue list|resume|clear
+
+Batch files hold one job per line: ``URL [START-END] [LANG] [QUALITY]``. Blank lines and
+lines starting with '#' are ignored; missing fields fall back to the command-line options.
+
+Downloads are journaled in a job queue (see downloader.job_queue). ``download`` and
+``batch`` only run the jobs they add; ``queue resume`` runs every unfinished job, so an
+interrupted download or batch continues where it stopped.
+"""
+import argparse
+import os
+import re
+import sys
+
+from .anime_service import AnimeService
+from .job_queue import JobQueue
+
+LANGUAGES = ("SUB", "DUB")
+QUALITIES = ("1080p", "720p", "480p", "360p", "240p", "144p")
+_RANGE_RE = re.compile(r'^(?P<start>\d+)(?:-(?P<end>\d+))?$')
+
+
+def _rate(value: str) -> int:
+    """Parses a rate such as '500K' or '2M' (bytes/s, binary units) into bytes per second."""
+    match = re.fullmatch(r'(?i)\s*(\d+(?:\.\d+)?)\s*([KMG]?)(?:i?B)?\s*', value)
+    if not match:
+        raise argparse.ArgumentTypeError(f"invalid rate: {value!r}")
+    number, unit = match.groups()
+    return int(float(number) * 1024 ** " KMG".index(unit.upper() or " "))
+
+
+def _title_from_url(url: str) -> str:
+    slug = url.rstrip('/').split('/')[-1].split('?')[0]
+    slug = re.sub(r'-\d+$', '', slug)
+    return slug.replace('-', ' ').title() or "untitled"
+
+
+def _print_progress(d):
+    if d.get("status") != "downloading":
+        return
+    name = os.path.basename(d.get("filename") or "")
+    percent = (d.get("_percent_str") or "").strip()
+    speed = (d.get("_speed_str") or "").strip()
+    print(f"\r{name[:60]} {percent} {speed}", end="", file=sys.stderr, flush=True)
+
+
+def parse_batch_line(line: str, defaults: argparse.Namespace) -> dict | None:
+    """Parses one batch file line into download_anime keyword arguments, or None for blank/comment lines."""
+    line = line.strip()
+    if not line or line.startswith('#'):
+        return None
+
+    url, *fields = line.split()
+    job = {"url": url, "start_ep": defaults.start, "end_ep": defaults.end,
+           "lang": defaults.lang, "quality": defaults.quality}
+    for field in fields:
+        range_match = _RANGE_RE.match(field)
+        if range_match:
+            job["start_ep"] = int(range_match.group("start"))
+            job["end_ep"] = int(range_match.group("end") or range_match.group("start"))
+        elif field.upper() in LANGUAGES:
+            job["lang"] = field.upper()
+        elif field.lower() in QUALITIES:
+            job["quality"] = field.lower()
+        else:
+            raise ValueError(f"unrecognized field {field!r}")
+    return job
+
+
+def _add_job(job_queue: JobQueue, args, url, start_ep, end_ep, lang, quality, title=None) -> int:
+    # The download settings are stored with the job so that 'queue resume' reuses them
+    return job_queue.add_job(
+        title or _title_from_url(url), url, lang, quality, start_ep, end_ep,
+        os.path.abspath(os.path.expanduser(args.output)),
+        options={
+            "ffmpeg_location": args.ffmpeg,
+            "download_retries": args.retries,
+            "concurrent_episodes": args.concurrent_episodes,
+            "fragment_concurrency": args.fragments,
+            "adaptive_fragments": not args.no_adaptive,
+            "bandwidth_limit": args.limit_rate,
+            "skip_downloaded": not args.redownload,
+            "rescan_index": args.rescan,
+            "prefetch_depth": args.prefetch,
+        },
+    )
+
+
+def _run_queue(service: AnimeService, job_queue: JobQueue, args, job_ids=None) -> bool:
+    # Without job_ids every unfinished job in the database runs
+    return service.run_job_queue(
+        job_queue, job_ids=job_ids,
+        progress_hook_for_gui=None if getattr(args, "quiet", False) else _print_progress,
+    )
+
+
+def cmd_search(service, args) -> int:
+    count = 0
+    for result in service.iter_search_results(args.query, refresh=args.refresh, max_pages=args.pages):
+        print(f"{result['title']}\tSUB {result['sub']}\tDUB {result['dub']}\t{result['url']}", flush=True)
+        count += 1
+    return 0 if count else 1
+
+
+def cmd_episodes(service, args) -> int:
+    episodes = service.list_episodes(args.url, args.lang)
+    for number, url in episodes:
+        print(f"{number}\t{url}")
+    return 0 if episodes else 1
+
+
+def cmd_download(service, args) -> int:
+    job_queue = JobQueue(args.db)
+    job_id = _add_job(job_queue, args, args.url, args.start, args.end, args.lang, args.quality, args.title)
+    return 0 if _run_queue(service, job_queue, args, job_ids=[job_id]) else 1
+
+
+def cmd_batch(service, args) -> int:
+    with open(args.file, encoding="utf-8") as f:
+        lines = f.readlines()
+
+    job_queue = JobQueue(args.db)
+    job_ids, failed = [], 0
+    for lineno, line in enumerate(lines, 1):
+        try:
+            job = parse_batch_line(line, args)
+        except ValueError as e:
+            print(f"{args.file}:{lineno}: {e}", file=sys.stderr)
+            failed += 1
+            continue
+        if job:
+            job_ids.append(_add_job(job_queue, args, **job))
+    if job_ids and not _run_queue(service, job_queue, args, job_ids=job_ids):
+        failed += 1
+    return 0 if not failed else 1
+
+
+def cmd_queue(service, args) -> int:
+    job_queue = JobQueue(args.db)
+    if args.action == "resume":
+        return 0 if _run_queue(service, job_queue, args) else 1
+    if args.action == "clear":
+        print(f"Removed {job_queue.clear_finished()} finished job(s).")
+        return 0
+
+    for job in job_queue.jobs():
+        episodes = job_queue.episodes(job["id"])
+        done = sum(1 for e in episodes if e["state"] == JobQueue.DONE)
+        print(f"#{job['id']}\t{job['state']}\t{done}/{job['end_ep'] - job['start_ep'] + 1} done\t"
+              f"{job['title']} (Ep {job['start_ep']}-{job['end_ep']}, {job['lang']}, {job['quality']})")
+        for episode in episodes:
+            if episode["state"] != JobQueue.DONE:
+                detail = episode["error"] or f"{episode['downloaded_bytes']} bytes"
+                print(f"\tEp {episode['number']}: {episode['state']} ({detail})")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--lang", type=str.upper, choices=LANGUAGES, default="SUB")
+    common.add_argument("--quiet", action="store_true", help="don't print download progress")
+
+    download_opts = argparse.ArgumentParser(add_help=False, parents=[common])
+    download_opts.add_argument("--start", type=int, default=1, help="first episode (default: 1)")
+    download_opts.add_argument("--end", type=int, default=1, help="last episode (default: 1)")
+    download_opts.add_argument("--quality", type=str.lower, choices=QUALITIES, default="1080p")
+    download_opts.add_argument("-o", "--output", default=".", help="base download directory")
+    download_opts.add_argument("--concurrent-episodes", type=int, default=1, metavar="N")
+    download_opts.add_argument("--fragments", type=int, default=4, metavar="N",
+                               help="HLS fragments fetched in parallel per episode")
+    download_opts.add_argument("--no-adaptive", action="store_true",
+                               help="keep the fragment concurrency fixed")
+    download_opts.add_argument("--retries", type=int, default=10)
+    download_opts.add_argument("--prefetch", type=int, default=1, metavar="N",
+                               help="episodes whose streams are resolved ahead of the downloads (0 disables)")
+    download_opts.add_argument("--ffmpeg", default=None, metavar="PATH", help="path to the FFmpeg executable")
+    download_opts.add_argument("--limit-rate", type=_rate, default=None, metavar="RATE",
+                               help="total bandwidth limit, e.g. 500K or 2M (bytes/s)")
+    download_opts.add_argument("--redownload", action="store_true",
+                               help="ignore the index of already downloaded episodes")
+    download_opts.add_argument("--rescan", action="store_true",
+                               help="rebuild the downloaded-episode index from the files in the series folder")
+
+    parser = argparse.ArgumentParser(prog="python -m downloader", description="HiAnime downloader (headless)")
+    parser.add_argument("--base-url", default=None, help="site base URL")
+    parser.add_argument("--db", default=None, metavar="PATH",
+                        help="job queue database (default: ~/.local/share/hianime-downloader/jobs.sqlite3)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("search", help="search for a series")
+    p.add_argument("query")
+    p.add_argument("--refresh", action="store_true", help="ignore cached results")
+    p.add_argument("--pages", type=int, default=None, metavar="N", help="result pages to read (default: 5)")
+    p.set_defaults(func=cmd_search)
+
+    p = sub.add_parser("episodes", parents=[common], help="list the episodes of a series")
+    p.add_argument("url")
+    p.set_defaults(func=cmd_episodes)
+
+    p = sub.add_parser("download", parents=[download_opts], help="download a range of episodes")
+    p.add_argument("url")
+    p.add_argument("--title", default=None, help="series title used for the folder name")
+    p.set_defaults(func=cmd_download)
+
+    p = sub.add_parser("batch", parents=[download_opts], help="download every job in a batch file")
+    p.add_argument("file")
+    p.set_defaults(func=cmd_batch)
+
+    p = sub.add_parser("queue", help="list, resume (run every unfinished job) or clear journaled jobs")
+    p.add_argument("action", choices=("list", "resume", "clear"))
+    p.add_argument("--quiet", action="store_true", help="don't print download progress")
+    p.set_defaults(func=cmd_queue)
+
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    service = AnimeService(args.base_url)
+    try:
+        return args.func(service, args)
+    except KeyboardInterrupt:
+        print("\nInterrupted.", file=sys.stderr)
+        return 130
+    finally:
+        service.close()
@@ -0,0 +1,165 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+
+INDEX_FILENAME = ".hianime-index.json"
+# Final files written by download_anime's '%(series)s - Episode %(episode_number)s - %(episode)s.%(ext)s'
+EPISODE_FILE_RE = re.compile(
+    r'^(?P<series>.+?) - Episode (?P<number>\d+) - (?P<episode>.*)\.(?P<ext>mp4|mkv|webm|flv|avi|mov|wmv|ts)$',
+    re.IGNORECASE,
+)
+# yt-dlp's intermediate files: .temp.mp4 (post-processing), .f137.mp4 (one format before merging), .part
+_INTERMEDIATE_RE = re.compile(r'\.(?:temp|part|f\d+)$', re.IGNORECASE)
+_CHECKSUM_SAMPLE = 1024 * 1024
+
+
+def file_checksum(path: str, size: int | None = None) -> str:
+    """
+    sha1 over the file size and its first and last MiB. Enough to notice a truncated or
+    replaced video without reading gigabytes on every rescan.
+    """
+    size = os.path.getsize(path) if size is None else size
+    digest = hashlib.sha1(str(size).encode("ascii"))
+    with open(path, "rb") as f:
+        digest.update(f.read(_CHECKSUM_SAMPLE))
+        if size > 2 * _CHECKSUM_SAMPLE:
+            f.seek(-_CHECKSUM_SAMPLE, os.SEEK_END)
+            digest.update(f.read(_CHECKSUM_SAMPLE))
+    return digest.hexdigest()
+
+
+class EpisodeIndex:
+    """
+    Index of the finished episodes of one series directory, kept in a JSON file inside it.
+
+    Maps episode number -> final file path (relative to the directory), size, checksum and
+    source URL. Entries are keyed by number rather than episode id because that is all
+    download_anime knows before any network extraction, and all rescan() can read from a
+    file name; the URL (with the episode id) is kept in the entry. Finished episodes thus
+    cost no requests. An entry counts only while its file still exists with the recorded
+    size; rescan() rebuilds the index from the file names in the directory. Problems
+    reading or writing the index file go to logger.
+    """
+    VERSION = 1
+
+    def __init__(self, directory: str, logger=None) -> None:
+        self.directory = directory
+        self.path = os.path.join(directory, INDEX_FILENAME)
+        self.logger = logger or logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._episodes = self._load()
+
+    def _load(self) -> dict[int, dict]:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Could not read episode index {self.path}: {e}")
+            return {}
+        if data.get("version") != self.VERSION:
+            return {}
+        return {int(number): entry for number, entry in data.get("episodes", {}).items()}
+
+    def _save(self) -> None:
+        # Caller holds the lock
+        data = {"version": self.VERSION,
+                "episodes": {str(number): entry for number, entry in sorted(self._episodes.items())}}
+        tmp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"  # Unique per writing thread
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=1)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            self.logger.warning(f"Could not write episode index {self.path}: {e}")
+
+    def _is_present(self, entry: dict) -> bool:
+        try:
+            return os.path.getsize(os.path.join(self.directory, entry["path"])) == entry["size"]
+        except OSError:
+            return False
+
+    def __contains__(self, number: int) -> bool:
+        return self.get(number) is not None
+
+    def get(self, number: int) -> dict | None:
+        """The entry of a finished episode whose file is still there, else None."""
+        with self._lock:
+            entry = self._episodes.get(number)
+        return entry if entry and self._is_present(entry) else None
+
+    def numbers(self) -> list[int]:
+        with self._lock:
+            entries = list(self._episodes.items())
+        return sorted(number for number, entry in entries if self._is_present(entry))
+
+    def add(self, number: int, filepath: str, url: str | None = None) -> None:
+        """Records a finished episode; filepath must be inside the series directory."""
+        size = os.path.getsize(filepath)
+        entry = {
+            "path": os.path.relpath(filepath, self.directory),
+            "size": size,
+            "checksum": file_checksum(filepath, size),
+            "url": url,
+            "completed_at": time.time(),
+        }
+        with self._lock:
+            self._episodes[number] = entry
+            self._save()
+
+    def remove(self, number: int) -> None:
+        with self._lock:
+            if self._episodes.pop(number, None) is not None:
+                self._save()
+
+    def verify(self, number: int) -> bool:
+        """Re-checks an entry's checksum against its file (reads up to 2 MiB)."""
+        entry = self.get(number)
+        if entry is None:
+            return False
+        try:
+            return file_checksum(os.path.join(self.directory, entry["path"]), entry["size"]) == entry["checksum"]
+        except OSError:
+            return False
+
+    def rescan(self) -> int:
+        """
+        Rebuilds the index from the video files named after the output template and returns
+        the number of episodes found. yt-dlp's intermediate files are ignored. Known URLs are
+        kept for files that are unchanged.
+        """
+        found = {}
+        try:
+            names = sorted(os.listdir(self.directory))
+        except OSError:
+            names = []
+        for name in names:
+            match = EPISODE_FILE_RE.match(name)
+            if not match or _INTERMEDIATE_RE.search(match.group("episode")):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                size = os.path.getsize(path)
+                checksum = file_checksum(path, size)
+            except OSError:
+                continue
+            number = int(match.group("number"))
+            if number in found and found[number]["size"] >= size:
+                continue  # Keep the larger of two files for one episode (e.g. .mp4 and .mkv)
+            found[number] = {"path": name, "size": size, "checksum": checksum, "url": None,
+                             "completed_at": os.path.getmtime(path)}
+
+        with self._lock:
+            for number, entry in found.items():
+                previous = self._episodes.get(number)
+                if previous and previous["path"] == entry["path"] and previous["checksum"] == entry["checksum"]:
+                    entry["url"] = previous.get("url")
+            self._episodes = found
+            self._save()
+        return len(found)
@@ -0,0 +1,26 @@
+import threading
+
+
+class Event:
+    """
+    Minimal, thread-safe stand-in for a Qt signal so the downloader core stays Qt-free.
+
+    Handlers are called synchronously, in connection order, on the emitting thread.
+    """
+    def __init__(self):
+        self._handlers = []
+        self._lock = threading.Lock()
+
+    def connect(self, handler):
+        with self._lock:
+            self._handlers.append(handler)
+
+    def disconnect(self, handler):
+        with self._lock:
+            self._handlers.remove(handler)
+
+    def emit(self, *args):
+        with self._lock:
+            handlers = list(self._handlers)
+        for handler in handlers:
+            handler(*args)
@@ -0,0 +1,217 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+
+def _default_db_path() -> str:
+    root = os.getenv("XDG_DATA_HOME") or os.path.expanduser("~/.local/share")
+    return os.path.join(root, "hianime-downloader", "jobs.sqlite3")
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id           INTEGER PRIMARY KEY AUTOINCREMENT,
+    title        TEXT NOT NULL,
+    url          TEXT NOT NULL,
+    lang         TEXT NOT NULL,
+    quality      TEXT NOT NULL,
+    start_ep     INTEGER NOT NULL,
+    end_ep       INTEGER NOT NULL,
+    download_dir TEXT NOT NULL,
+    options      TEXT NOT NULL DEFAULT '{}',
+    state        TEXT NOT NULL,
+    error        TEXT,
+    created_at   REAL NOT NULL,
+    updated_at   REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS episodes (
+    job_id           INTEGER NOT NULL REFERENCES jobs(id) ON DELETE CASCADE,
+    number           INTEGER NOT NULL,
+    url              TEXT NOT NULL,
+    state            TEXT NOT NULL,
+    filename         TEXT,
+    downloaded_bytes INTEGER NOT NULL DEFAULT 0,
+    total_bytes      INTEGER,
+    attempts         INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at  REAL NOT NULL DEFAULT 0,
+    error            TEXT,
+    updated_at       REAL NOT NULL,
+    PRIMARY KEY (job_id, number)
+);
+"""
+
+
+class JobQueue:
+    """
+    SQLite journal of download jobs (one per series range) and their episodes.
+
+    Every state change is committed immediately, so after a crash or restart recover()
+    puts interrupted episodes back in the queue and the run continues where it stopped:
+    episodes already done are skipped and resolved episode URLs are reused without
+    expanding the playlist again. Failed episodes are retried with exponential backoff
+    until max_attempts is reached. Jobs are processed in the order they were added.
+    """
+    # Job states
+    QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+    # Episode states (QUEUED, DONE and FAILED are shared with jobs)
+    RESOLVING, DOWNLOADING, POSTPROCESSING = "resolving", "downloading", "postprocessing"
+    ACTIVE_EPISODE_STATES = (RESOLVING, DOWNLOADING, POSTPROCESSING)
+
+    def __init__(self, path: str | None = None, max_attempts: int = 3, backoff: float = 30.0,
+                 max_backoff: float = 15 * 60) -> None:
+        self.path = path or _default_db_path()
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        if self.path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA foreign_keys = ON")
+        if self.path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode = WAL")
+            self._conn.execute("PRAGMA synchronous = NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    # The connection is shared between threads, so results are fetched before the lock is released
+    def _query(self, sql: str, params=()) -> list[sqlite3.Row]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def _execute(self, sql: str, params=()) -> int:
+        """Runs a data-changing statement and returns the number of affected rows."""
+        with self._lock:
+            return self._conn.execute(sql, params).rowcount
+
+    # --- Jobs ---
+    def add_job(self, title: str, url: str, lang: str, quality: str, start_ep: int, end_ep: int,
+                download_dir: str, options: dict | None = None) -> int:
+        """Queues a series range behind every unfinished job and returns its id."""
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT INTO jobs (title, url, lang, quality, start_ep, end_ep, download_dir, options,"
+                " state, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (title, url, lang, quality, start_ep, end_ep, download_dir,
+                 json.dumps(options or {}), self.QUEUED, now, now),
+            )
+            return cursor.lastrowid
+
+    def job(self, job_id: int) -> dict | None:
+        rows = self._query("SELECT * FROM jobs WHERE id = ?", (job_id,))
+        return _job_dict(rows[0]) if rows else None
+
+    def jobs(self, unfinished_only: bool = False) -> list[dict]:
+        sql = "SELECT * FROM jobs"
+        if unfinished_only:
+            sql += f" WHERE state IN ('{self.QUEUED}', '{self.RUNNING}')"
+        return [_job_dict(row) for row in self._query(sql + " ORDER BY id")]
+
+    def next_job(self, job_ids=None) -> dict | None:
+        """The oldest job that is queued or was running when the app stopped, optionally among job_ids."""
+        jobs = [job for job in self.jobs(unfinished_only=True) if job_ids is None or job["id"] in job_ids]
+        return jobs[0] if jobs else None
+
+    def set_job_state(self, job_id: int, state: str, error: str | None = None) -> None:
+        self._execute("UPDATE jobs SET state = ?, error = ?, updated_at = ? WHERE id = ?",
+                      (state, error, time.time(), job_id))
+
+    def remove_job(self, job_id: int) -> None:
+        self._execute("DELETE FROM jobs WHERE id = ?", (job_id,))
+
+    def clear_finished(self) -> int:
+        return self._execute(f"DELETE FROM jobs WHERE state IN ('{self.DONE}', '{self.FAILED}')")
+
+    def recover(self, job_ids=None) -> int:
+        """
+        Puts episodes that were in flight when the process died back in the queue
+        (keeping their byte offset) and returns how many there were. job_ids limits
+        this to those jobs.
+        """
+        placeholders = ", ".join("?" * len(self.ACTIVE_EPISODE_STATES))
+        sql = f"UPDATE episodes SET state = ?, updated_at = ? WHERE state IN ({placeholders})"
+        params = (self.QUEUED, time.time(), *self.ACTIVE_EPISODE_STATES)
+        if job_ids is not None:
+            job_ids = list(job_ids)
+            sql += f" AND job_id IN ({', '.join('?' * len(job_ids))})"
+            params += tuple(job_ids)
+        return self._execute(sql, params)
+
+    # --- Episodes ---
+    def set_episodes(self, job_id: int, episodes: list[tuple[int, str]]) -> None:
+        """Records the resolved (number, url) pairs of a job; existing episodes keep their state."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO episodes (job_id, number, url, state, updated_at)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    [(job_id, number, url, self.QUEUED, now) for number, url in episodes],
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def episodes(self, job_id: int) -> list[dict]:
+        rows = self._query("SELECT * FROM episodes WHERE job_id = ? ORDER BY number", (job_id,))
+        return [dict(row) for row in rows]
+
+    def runnable_episodes(self, job_id: int, now: float | None = None) -> list[dict]:
+        """Queued episodes, plus failed ones with attempts left whose backoff has expired."""
+        now = time.time() if now is None else now
+        return [
+            episode for episode in self.episodes(job_id)
+            if episode["state"] == self.QUEUED
+            or (episode["state"] == self.FAILED and episode["attempts"] < self.max_attempts
+                and episode["next_attempt_at"] <= now)
+        ]
+
+    def next_retry_at(self, job_id: int) -> float | None:
+        """When the earliest retryable failed episode of the job may run again, if any."""
+        rows = self._query(
+            "SELECT MIN(next_attempt_at) FROM episodes WHERE job_id = ? AND state = ? AND attempts < ?",
+            (job_id, self.FAILED, self.max_attempts),
+        )
+        return rows[0][0]
+
+    def update_episode(self, job_id: int, number: int, state: str, **fields) -> None:
+        """Sets an episode's state plus any of filename, downloaded_bytes, total_bytes and error."""
+        allowed = {"filename", "downloaded_bytes", "total_bytes", "error"}
+        unknown = set(fields) - allowed
+        if unknown:
+            raise ValueError(f"Unknown episode fields: {sorted(unknown)}")
+        assignments = "".join(f", {name} = ?" for name in fields)
+        self._execute(
+            f"UPDATE episodes SET state = ?, updated_at = ?{assignments} WHERE job_id = ? AND number = ?",
+            (state, time.time(), *fields.values(), job_id, number),
+        )
+
+    def record_failure(self, job_id: int, number: int, error: str) -> None:
+        """Marks an episode failed and schedules its retry backoff * 2**(attempts - 1) from now."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT attempts FROM episodes WHERE job_id = ? AND number = ?", (job_id, number)
+            ).fetchone()
+            attempts = (row["attempts"] if row else 0) + 1
+            delay = min(self.max_backoff, self.backoff * 2 ** (attempts - 1))
+            now = time.time()
+            self._conn.execute(
+                "UPDATE episodes SET state = ?, attempts = ?, next_attempt_at = ?, error = ?, updated_at = ?"
+                " WHERE job_id = ? AND number = ?",
+                (self.FAILED, attempts, now + delay, error, now, job_id, number),
+            )
+
+
+def _job_dict(row: sqlite3.Row) -> dict:
+    job = dict(row)
+    job["options"] = json.loads(job["options"] or "{}")
+    return job
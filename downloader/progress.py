@@ -0,0 +1,93 @@
+import os
+import threading
+import time
+from typing import NamedTuple
+
+
+class ProgressEvent(NamedTuple):
+    """Compact per-file progress snapshot published by ProgressAggregator."""
+    filename: str                 # Base name of the file being written
+    status: str                   # 'downloading', 'finished' or 'error'
+    episode_number: int | None
+    episode_title: str | None
+    downloaded_bytes: int
+    total_bytes: int | None       # Exact size, or yt-dlp's estimate for fragmented downloads
+    speed: float | None           # Bytes per second
+    eta: float | None             # Seconds
+    fragment_index: int | None
+    fragment_count: int | None
+    fragment_stats: dict | None   # Extra stats from FragmentStats.wrap_hook, when present
+
+    @property
+    def percent(self) -> float | None:
+        if self.status == "finished":
+            return 100.0
+        if self.total_bytes:
+            return min(100.0, self.downloaded_bytes * 100.0 / self.total_bytes)
+        if self.fragment_index and self.fragment_count:
+            return min(100.0, self.fragment_index * 100.0 / self.fragment_count)
+        return None
+
+
+def format_bytes(num_bytes) -> str:
+    """Human-readable size, e.g. 1.50MiB; 'N/A' for unknown sizes."""
+    if num_bytes is None:
+        return "N/A"
+    value = float(num_bytes)
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if value < 1024 or unit == "GiB":
+            return f"{value:.2f}{unit}" if unit != "B" else f"{int(value)}B"
+        value /= 1024
+
+
+class ProgressAggregator:
+    """
+    yt-dlp progress hook that folds the raw hook dicts of every file into ProgressEvents
+    and calls publish(event) at most max_rate times per second per file.
+
+    Status changes ('finished', 'error') are always published. It works from the numeric
+    hook fields, so none of the ANSI-colored '_*_str' fields have to be cleaned. Safe to
+    use as the hook of several concurrent YoutubeDL instances.
+    """
+    def __init__(self, publish, max_rate: float = 5.0, clock=time.monotonic):
+        self.publish = publish
+        self.min_interval = 1.0 / max_rate if max_rate > 0 else 0.0
+        self.clock = clock
+        self._last_published = {}  # filename -> (time, status)
+        self._lock = threading.Lock()
+        self.received = 0
+        self.published = 0
+
+    def __call__(self, d: dict) -> None:
+        self.hook(d)
+
+    def hook(self, d: dict) -> None:
+        status = d.get("status")
+        filename = os.path.basename(d.get("filename") or d.get("tmpfilename") or "") or "N/A"
+        now = self.clock()
+
+        with self._lock:
+            self.received += 1
+            last = self._last_published.get(filename)
+            if last and last[1] == status and now - last[0] < self.min_interval:
+                return  # Throttled; a later hook will carry the newer state
+            self._last_published[filename] = (now, status)
+            if status != "downloading":
+                # Finished files won't report again; a restart of the same name starts fresh
+                self._last_published.pop(filename, None)
+            self.published += 1
+
+        info_dict = d.get("info_dict") or {}
+        self.publish(ProgressEvent(
+            filename=filename,
+            status=status,
+            episode_number=info_dict.get("episode_number"),
+            episode_title=info_dict.get("episode") or info_dict.get("title"),
+            downloaded_bytes=d.get("downloaded_bytes") or 0,
+            total_bytes=d.get("total_bytes") or d.get("total_bytes_estimate"),
+            speed=d.get("speed"),
+            eta=d.get("eta"),
+            fragment_index=d.get("fragment_index"),
+            fragment_count=d.get("fragment_count"),
+            fragment_stats=d.get("fragment_stats"),
+        ))
@@ -0,0 +1,168 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+
+
+def _default_cache_dir() -> str:
+    root = os.getenv("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(root, "hianime-downloader", "search")
+
+
+class SearchCache:
+    """
+    Bounded LRU of parsed search result lists, keyed by base URL and normalized keyword.
+
+    An entry younger than ttl is fresh. Up to ttl + stale_ttl it is still returned but
+    reported as stale so the caller can refresh it in the background; after that it is
+    treated as a miss. When cache_dir is set, entries are also written as one JSON file
+    per key so they survive restarts; problems reading or writing them go to logger.
+    """
+    VERSION = 2  # 2: entries hold every fetched result page, not just page 1
+    FRESH, STALE, MISS = "fresh", "stale", "miss"
+
+    def __init__(self, max_entries: int = 128, ttl: float = 15 * 60, stale_ttl: float = 24 * 60 * 60,
+                 cache_dir: str | None = None, logger=None) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.cache_dir = cache_dir
+        self.logger = logger or logging.getLogger(__name__)
+        self._entries: OrderedDict[str, tuple[float, list]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "stale_hits": 0, "misses": 0, "refreshes": 0, "evictions": 0}
+
+    @staticmethod
+    def make_key(base_url: str, keyword: str) -> str:
+        keyword = " ".join(keyword.casefold().split())
+        return f"{base_url.rstrip('/').lower()}|{keyword}"
+
+    def _path(self, key: str) -> str | None:
+        if not self.cache_dir:
+            return None
+        return os.path.join(self.cache_dir, hashlib.sha1(key.encode("utf-8")).hexdigest() + ".json")
+
+    def _load_from_disk(self, key: str) -> tuple[float, list] | None:
+        path = self._path(key)
+        if not path:
+            return None
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Could not read search cache {path}: {e}")
+            return None
+        if data.get("version") != self.VERSION or data.get("key") != key:
+            return None
+        return data["stored_at"], data["results"]
+
+    def _write_to_disk(self, key: str, stored_at: float, results: list) -> None:
+        path = self._path(key)
+        if not path:
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"  # Unique per writing thread
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"version": self.VERSION, "key": key, "stored_at": stored_at, "results": results}, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            self.logger.warning(f"Could not write search cache {path}: {e}")
+
+    def _remember(self, key: str, entry: tuple[float, list]) -> None:
+        # Caller holds the lock
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._counters["evictions"] += 1
+
+    def get(self, base_url: str, keyword: str) -> tuple[list | None, str]:
+        """Returns (results, state) where state is FRESH, STALE or MISS (results is None on a miss)."""
+        key = self.make_key(base_url, keyword)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+
+        if entry is None:
+            entry = self._load_from_disk(key)
+            if entry is not None:
+                with self._lock:
+                    self._remember(key, entry)
+
+        age = time.time() - entry[0] if entry is not None else None
+        with self._lock:
+            if age is not None and age < self.ttl:
+                self._counters["hits"] += 1
+                return [dict(r) for r in entry[1]], self.FRESH
+            if age is not None and age < self.ttl + self.stale_ttl:
+                self._counters["stale_hits"] += 1
+                return [dict(r) for r in entry[1]], self.STALE
+            self._counters["misses"] += 1
+        return None, self.MISS
+
+    def put(self, base_url: str, keyword: str, results: list, refresh: bool = False) -> None:
+        key = self.make_key(base_url, keyword)
+        entry = (time.time(), [dict(r) for r in results])
+        with self._lock:
+            self._remember(key, entry)
+            if refresh:
+                self._counters["refreshes"] += 1
+        self._write_to_disk(key, *entry)
+
+    def invalidate(self, base_url: str | None = None, keyword: str | None = None) -> None:
+        """Drops one keyword, every keyword of a base URL, or (with no arguments) everything."""
+        with self._lock:
+            if base_url is not None and keyword is not None:
+                keys = [self.make_key(base_url, keyword)]
+            elif base_url is not None:
+                prefix = self.make_key(base_url, "")
+                keys = [k for k in self._entries if k.startswith(prefix)]
+            else:
+                keys = list(self._entries)
+            for key in keys:
+                self._entries.pop(key, None)
+
+        if not self.cache_dir:
+            return
+        if base_url is not None and keyword is not None:
+            paths = [self._path(keys[0])]
+        elif base_url is None:
+            try:
+                paths = [os.path.join(self.cache_dir, name) for name in os.listdir(self.cache_dir)
+                         if name.endswith(".json")]
+            except OSError:
+                paths = []
+        else:
+            # Disk entries are keyed by hash; drop the ones whose stored key matches the prefix
+            paths = []
+            try:
+                names = os.listdir(self.cache_dir)
+            except OSError:
+                names = []
+            for name in names:
+                path = os.path.join(self.cache_dir, name)
+                try:
+                    with open(path, encoding="utf-8") as f:
+                        if json.load(f).get("key", "").startswith(prefix):
+                            paths.append(path)
+                except (OSError, ValueError):
+                    continue
+        for path in paths:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._counters, size=len(self._entries), max_entries=self.max_entries)
+        lookups = stats["hits"] + stats["stale_hits"] + stats["misses"]
+        stats["hit_rate"] = (stats["hits"] + stats["stale_hits"]) / lookups if lookups else 0.0
+        return stats
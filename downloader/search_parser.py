@@ -0,0 +1,56 @@
+import html
+import re
+
+# One alternation per field; a single finditer over the page visits every flw-item and
+# its fields in document order, so the page is scanned exactly once. div tags are
+# matched too, to find where each flw-item closes.
+_SEARCH_PAGE_RE = re.compile(r'''
+    (?P<item><div\s+class="flw-item[\s"])
+  | (?P<div></?div\b)
+  | class="[^"]*\bfilm-name\b[^"]*"[^>]*>\s*(?:<a\b(?P<title_attrs>[^>]*)>)?(?P<title>[^<]*)
+  | href="(?P<path>/watch/[^"]+)"
+  | class="[^"]*\btick-sub\b[^"]*"[^>]*>(?:\s*<i\b[^>]*>\s*</i>)?\s*(?P<sub>[^<]*)
+  | class="[^"]*\btick-dub\b[^"]*"[^>]*>(?:\s*<i\b[^>]*>\s*</i>)?\s*(?P<dub>[^<]*)
+  | data-src="(?P<img>[^"]+)"
+''', re.X)
+
+_FIELDS = ("title", "path", "sub", "dub", "img")
+_HREF_RE = re.compile(r'href="(/watch/[^"]+)"')
+
+
+def iter_search_items(webpage: str):
+    """
+    Yields one {'title', 'path', 'sub', 'dub', 'img'} dict per flw-item of a search page,
+    each as soon as its closing </div> is reached. Values are the raw strings found inside
+    the item (title unescaped and whitespace-collapsed), or None.
+    """
+    item = None
+    depth = 0  # Open divs inside the current item, including its own
+    for match in _SEARCH_PAGE_RE.finditer(webpage):
+        field = match.lastgroup
+        if field == "item":
+            if item is not None:
+                yield item  # Unclosed item
+            item = dict.fromkeys(_FIELDS)
+            depth = 1
+        elif item is None:
+            continue  # Outside any item, e.g. a sidebar
+        elif field == "div":
+            depth += -1 if match.group(field)[1] == "/" else 1
+            if not depth:
+                yield item
+                item = None
+        elif item[field] is None:
+            value = match.group(field)
+            if field == "title":
+                value = " ".join(html.unescape(value).split())
+                # The title link is consumed by this match, so pick up its href here
+                href = _HREF_RE.search(match.group("title_attrs") or "")
+                if href and item["path"] is None:
+                    item["path"] = href.group(1)
+            elif field in ("sub", "dub"):
+                value = value.strip()
+            item[field] = value or None
+
+    if item is not None:
+        yield item
@@ -0,0 +1,135 @@
+import json
+import threading
+from contextlib import contextmanager
+
+
+def _new_youtube_dl(opts):
+    from yt_dlp import YoutubeDL
+    return YoutubeDL(opts)
+
+
+class _HookDispatcher:
+    """Registered once per YoutubeDL; forwards to the hooks of whoever has it checked out."""
+    def __init__(self):
+        self.progress_hooks = []
+        self.postprocessor_hooks = []
+
+    def progress(self, d):
+        for hook in self.progress_hooks:
+            hook(d)
+
+    def postprocessor(self, d):
+        for hook in self.postprocessor_hooks:
+            hook(d)
+
+
+class YoutubeDLPool:
+    """
+    Keeps warmed YoutubeDL instances for reuse across episodes, retries and series.
+
+    Building a YoutubeDL registers extractors and post-processors and opens a fresh
+    request director; its extractor instances (and their _real_initialize state) and
+    HTTP connections die with it. Instances here are grouped by their fixed options,
+    and the per-use options below are applied to params on every checkout, so one
+    instance can serve every episode of a batch. An instance is used by one thread at
+    a time; at most max_idle are kept per option set (0 disables reuse).
+    """
+    # Read from params on every use, so they may differ between checkouts
+    PER_USE_OPTIONS = frozenset({
+        "logger", "progress_hooks", "postprocessor_hooks", "format", "outtmpl",
+        "playliststart", "playlistend", "extract_flat",
+        "concurrent_fragment_downloads", "ratelimit", "retries", "fragment_retries",
+    })
+
+    def __init__(self, max_idle: int = 4, factory=None) -> None:
+        self.max_idle = max_idle
+        self.factory = factory or _new_youtube_dl
+        self._idle = {}  # fixed-options key -> [(ydl, dispatcher), ...]
+        self._lock = threading.Lock()
+        self.created = 0
+        self.reused = 0
+
+    @classmethod
+    def _key(cls, opts: dict) -> str:
+        fixed = {k: v for k, v in opts.items() if k not in cls.PER_USE_OPTIONS}
+        return json.dumps(fixed, sort_keys=True, default=repr)
+
+    def _create(self, opts: dict):
+        dispatcher = _HookDispatcher()
+        fixed = {k: v for k, v in opts.items() if k not in self.PER_USE_OPTIONS}
+        ydl = self.factory({
+            **fixed,
+            "logger": opts.get("logger"),
+            "progress_hooks": [dispatcher.progress],
+            "postprocessor_hooks": [dispatcher.postprocessor],
+        })
+        with self._lock:
+            self.created += 1
+        return ydl, dispatcher
+
+    @staticmethod
+    def _configure(ydl, dispatcher: _HookDispatcher, opts: dict) -> None:
+        for name in YoutubeDLPool.PER_USE_OPTIONS - {"progress_hooks", "postprocessor_hooks", "format", "outtmpl"}:
+            if name in opts:
+                ydl.params[name] = opts[name]
+            else:
+                ydl.params.pop(name, None)  # e.g. no extract_flat or ratelimit left over from the last use
+
+        if "outtmpl" in opts:
+            template = opts["outtmpl"]
+            if isinstance(template, dict):
+                ydl.params["outtmpl"] = {**ydl.params.get("outtmpl", {}), **template}
+            else:
+                ydl.params["outtmpl"] = {**ydl.params.get("outtmpl", {}), "default": template}
+        format_spec = opts.get("format")
+        if format_spec != ydl.params.get("format"):
+            ydl.params["format"] = format_spec
+            ydl.format_selector = ydl.build_format_selector(format_spec) if format_spec else None
+
+        dispatcher.progress_hooks = list(opts.get("progress_hooks") or ())
+        dispatcher.postprocessor_hooks = list(opts.get("postprocessor_hooks") or ())
+
+    @contextmanager
+    def checkout(self, opts: dict):
+        """Yields a YoutubeDL configured with opts, returning it to the pool afterwards."""
+        key = self._key(opts)
+        with self._lock:
+            idle = self._idle.get(key)
+            entry = idle.pop() if idle else None
+            if entry:
+                self.reused += 1
+        ydl, dispatcher = entry or self._create(opts)
+        self._configure(ydl, dispatcher, opts)
+
+        try:
+            yield ydl
+        except Exception:
+            self._release(key, ydl, dispatcher)
+            raise
+        except BaseException:
+            ydl.close()  # Interrupted mid-use; don't trust its state
+            raise
+        else:
+            self._release(key, ydl, dispatcher)
+
+    def _release(self, key, ydl, dispatcher) -> None:
+        dispatcher.progress_hooks = []
+        dispatcher.postprocessor_hooks = []
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_idle:
+                idle.append((ydl, dispatcher))
+                return
+        ydl.close()
+
+    def close(self) -> None:
+        with self._lock:
+            entries = [entry for idle in self._idle.values() for entry in idle]
+            self._idle.clear()
+        for ydl, _dispatcher in entries:
+            ydl.close()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"created": self.created, "reused": self.reused,
+                    "idle": sum(len(idle) for idle in self._idle.values())}
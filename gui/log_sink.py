@@ -0,0 +1,89 @@
+import html
+import threading
+from collections import deque
+
+from PyQt6.QtCore import QObject, QTimer
+from PyQt6.QtGui import QPalette, QTextCursor
+from PyQt6.QtWidgets import QTextEdit
+
+
+class LogSink(QObject):
+    """
+    Buffers log lines from any thread and renders them into a QTextEdit in batches.
+
+    write() only appends to a bounded ring buffer under a lock. A GUI-thread timer flushes
+    the buffer at most fps times per second as a single HTML insert, and the document is
+    capped at max_blocks lines. Lines written with a coalesce key replace the pending line
+    with the same key, so a stream of progress updates renders as its latest value.
+    """
+    def __init__(self, output_box: QTextEdit, fps: int = 10, buffer_size: int = 2000,
+                 max_blocks: int = 5000, parent=None):
+        super().__init__(parent)
+        self.output_box = output_box
+        self.output_box.document().setMaximumBlockCount(max_blocks)
+        self._lock = threading.Lock()
+        self._pending = deque(maxlen=buffer_size)  # [key, text] pairs, oldest first
+        self._keyed = {}  # coalesce key -> its pending [key, text] entry
+        self.dropped = 0  # Lines lost to buffer overflow since the last flush
+        self._timer = QTimer(self)
+        self._timer.setInterval(max(1, 1000 // fps))
+        self._timer.timeout.connect(self.flush)
+        self._timer.start()
+
+    def write(self, text: str, key=None) -> None:
+        """Queues a line for display. Safe to call from any thread."""
+        with self._lock:
+            if key is not None:
+                entry = self._keyed.get(key)
+                if entry is not None:
+                    entry[1] = text
+                    return
+            if len(self._pending) == self._pending.maxlen:
+                oldest = self._pending[0]
+                if oldest[0] is not None:
+                    self._keyed.pop(oldest[0], None)
+                self.dropped += 1
+            entry = [key, text]
+            self._pending.append(entry)
+            if key is not None:
+                self._keyed[key] = entry
+
+    def flush(self) -> None:
+        with self._lock:
+            if not self._pending:
+                return
+            lines = [text for _key, text in self._pending]
+            self._pending.clear()
+            self._keyed.clear()
+            dropped, self.dropped = self.dropped, 0
+
+        is_dark = self.output_box.palette().color(QPalette.ColorRole.Window).lightness() < 128
+        if dropped:
+            lines.insert(0, f"[WARNING] {dropped} log line(s) dropped")
+        batch_html = "".join(
+            f'<div style="color:{_color_for(text, is_dark)}; white-space:pre-wrap">{html.escape(text)}</div>'
+            for text in lines
+        )
+
+        scroll_bar = self.output_box.verticalScrollBar()
+        at_bottom = scroll_bar.value() >= scroll_bar.maximum() - 4
+        cursor = QTextCursor(self.output_box.document())
+        cursor.movePosition(QTextCursor.MoveOperation.End)
+        if not self.output_box.document().isEmpty():
+            cursor.insertBlock()
+        cursor.insertHtml(batch_html)
+        if at_bottom:
+            scroll_bar.setValue(scroll_bar.maximum())
+
+
+def _color_for(text: str, is_dark: bool) -> str:
+    """Line color by message content and theme."""
+    if "[ERROR]" in text or "ERROR" in text:
+        return "red"
+    if "[WARNING]" in text or "WARNING" in text:
+        return "yellow" if is_dark else "orange"
+    if "[yt-dlp DEBUG]" in text:
+        return "lightgray"
+    if "[INFO]" in text or "INFO" in text:
+        return "cyan" if is_dark else "blue"
+    return "white" if is_dark else "black"
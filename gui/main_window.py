@@ -1,43 +1,58 @@
 import os
 import threading
+import time
 
 # --- Qt Imports ---
 from PyQt6.QtWidgets import (
-    QApplication, QWidget, QMessageBox, QFileDialog, 
-    QTableWidgetItem, QLabel, QMenu
+    QApplication, QWidget, QMessageBox, QFileDialog, QMenu
 )
 from PyQt6.QtGui import (
-    QTextCursor, QAction, QDesktopServices, QPixmap, QPixmapCache, QColor, QPalette
+    QAction, QDesktopServices, QPixmap, QPixmapCache, QImage
 )
 from PyQt6.QtCore import (
-    pyqtSignal, Qt, QSettings, QStandardPaths, QUrl, QSize, QByteArray,QSignalBlocker
+    pyqtSignal, Qt, QSettings, QStandardPaths, QUrl, QSize, QByteArray,QSignalBlocker, QModelIndex, QTimer
 )
 from PyQt6.QtNetwork import (
-    QNetworkAccessManager, QNetworkRequest, QNetworkReply
+    QNetworkAccessManager, QNetworkDiskCache
 )
 
-from downloader.anime_service import AnimeService 
+from .service_adapter import QtAnimeService
 
 # --- UI Definition and Helpers Import ---
 from .ui_main_window import UiMainWindow
-from .helpers import NumericTableWidgetItem, strip_ansi_codes
+from .helpers import strip_ansi_codes
 
 # --- Settings Dialog Import ---
 from .settings_dialog import SettingsDialog # <-- IMPORT THE NEW DIALOG
 from .settings_dialog import ( # <-- IMPORT THE KEYS (good practice)
     KEY_DEFAULT_DOWNLOAD_PATH, KEY_DEFAULT_LANGUAGE, KEY_DEFAULT_QUALITY,
-    KEY_FFMPEG_PATH, KEY_DOWNLOAD_RETRIES
+    KEY_FFMPEG_PATH, KEY_DOWNLOAD_RETRIES, KEY_CONCURRENT_EPISODES, KEY_BANDWIDTH_LIMIT,
+    KEY_FRAGMENT_CONCURRENCY, KEY_ADAPTIVE_FRAGMENTS
 )
 
 from .about_dialog import AboutDialog
+from .thumbnail_cache import ThumbnailDiskCache, default_cache_dir
+from .thumbnail_loader import ThumbnailLoader
+from .log_sink import LogSink
+from downloader.anime_service import Logger
+from downloader.job_queue import JobQueue
+from downloader.progress import ProgressAggregator, ProgressEvent, format_bytes
+from .results_model import (
+    ANIME_DATA_ROLE, SearchResultsModel, SearchResultsProxyModel, ThumbnailDelegate
+)
+
+SEARCH_BATCH_INTERVAL = 0.1  # Seconds between streamed search result batches
 
 class AnimeDownloaderWindow(QWidget):
     # --- Signals ---
     output_signal = pyqtSignal(str)
     search_finished_signal = pyqtSignal()
+    search_results_batch_signal = pyqtSignal(list)  # Search results streamed from the worker thread
     update_episode_title_signal = pyqtSignal(str)
     update_episode_progress_signal = pyqtSignal(int)
+    progress_event_signal = pyqtSignal(object)  # ProgressEvent, throttled by ProgressAggregator
     update_batch_progress_signal = pyqtSignal(int, int)
+    update_batch_range_signal = pyqtSignal(int)  # Episodes in the current job
     set_download_button_enabled_signal = pyqtSignal(bool)
 
     def __init__(self, parent=None):
@@ -45,19 +60,29 @@ class AnimeDownloaderWindow(QWidget):
         
         self._initialize_app_state_and_config() # Step 1: Basic attributes, settings
         
-        self.anime_service = AnimeService()      # Step 2: Initialize backend service
+        self.anime_service = QtAnimeService()    # Step 2: Initialize backend service (Qt signal adapter)
 
         self.anime_service.set_gui_logger_callback(self.output_signal.emit, log_debug_to_gui=False)
 
         # Connect download completed signal to add to history
         self.anime_service.download_completed_signal.connect(self._add_to_download_history)
+        # Stale cached searches are refreshed in the background; update the table if still relevant
+        self.anime_service.search_refreshed_signal.connect(self._handle_search_refreshed)
+        # Direct connection: counted in the download thread so the final batch summary sees every episode
+        self.anime_service.episode_completed_signal.connect(
+            self._handle_episode_completed, Qt.ConnectionType.DirectConnection
+        )
+        self.anime_service.job_started_signal.connect(self._handle_job_started, Qt.ConnectionType.DirectConnection)
 
         # Step 3: Setup the UI using the UiMainWindow class
         # The UiMainWindow class will create widgets and assign them as attributes to 'self'
         self.ui_setup = UiMainWindow() 
         self.ui_setup.setupUi(self)
+        # Log lines from every thread are buffered and rendered into output_box in timed batches
+        self.log_sink = LogSink(self.output_box, parent=self)
 
         self._restore_window_geometry()
+        QTimer.singleShot(0, self._offer_to_resume_jobs)
         self._connect_all_signals()          # Step 4: Connect UI element signals to controller methods
         self._load_and_apply_settings_to_ui()# Step 5: Load saved settings and update UI
         self._apply_initial_ui_visibility_state() # Step 6: Set initial visibility of UI groups
@@ -102,16 +127,43 @@ class AnimeDownloaderWindow(QWidget):
         self.current_episode_last_pct = 0.0
         self.total_episodes_in_batch = 0
         self.completed_episodes_in_batch = 0
+        self.episodes_done_at_job_start = 0
+        self.reported_episodes_in_batch = set() # Retry passes report an episode again; count it once
         self.current_tracking_video_file = None
+        # yt-dlp fires progress hooks many times per second per file; only a few reach the GUI
+        self.progress_aggregator = ProgressAggregator(self.progress_event_signal.emit, max_rate=5)
 
         # QSettings for persistence
         self.settings = QSettings() # IMPORTANT: Use consistent names
 
         # Network manager for image loading
         self.network_manager = QNetworkAccessManager(self)
+
+        # Search results model/view; UiMainWindow attaches these to search_results_table
+        self.search_results_model = SearchResultsModel(self)
+        self.search_results_proxy = SearchResultsProxyModel(self)
+        self.search_results_proxy.setSourceModel(self.search_results_model)
+        self.thumbnail_delegate = ThumbnailDelegate(self.table_thumbnail_size, self)
         self.pixmap_cache = QPixmapCache()
         self.pixmap_cache.setCacheLimit(100 * 1024) # Cache limit e.g., 100MB
-        self.active_image_requests = {} # For tracking image download replies
+
+        # Scaled thumbnails persist across launches; raw HTTP responses are cached per their headers
+        cache_root = default_cache_dir()
+        self.thumbnail_cache = ThumbnailDiskCache(os.path.join(cache_root, "thumbnails"), self.table_thumbnail_size,
+                                                  logger=Logger(self.output_signal.emit, context_name="Thumbnails"))
+        self.http_disk_cache = QNetworkDiskCache(self)
+        self.http_disk_cache.setCacheDirectory(os.path.join(cache_root, "http"))
+        self.http_disk_cache.setMaximumCacheSize(20 * 1024 * 1024)
+        self.network_manager.setCache(self.http_disk_cache)
+        # Bounded, viewport-prioritized image fetching; decoding and scaling happen off the GUI thread
+        self.thumbnail_loader = ThumbnailLoader(self.network_manager, self.table_thumbnail_size,
+                                                self.thumbnail_cache, max_in_flight=6, parent=self)
+
+        # Durable download queue: jobs and per-episode state survive restarts and crashes
+        data_root = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.AppDataLocation)
+        self.job_queue = JobQueue(os.path.join(data_root, "jobs.sqlite3") if data_root else None)
+        self.job_queue_stop = threading.Event()
+        self._job_worker_lock = threading.Lock()
 
     def open_settings_dialog(self):
         """Opens the settings dialog."""
@@ -207,9 +259,13 @@ class AnimeDownloaderWindow(QWidget):
         self.filter_input.textChanged.connect(self.handle_filter_table_text_changed)
 
         # Table
-        self.search_results_table.cellClicked.connect(self.handle_table_row_selection)
+        self.search_results_table.clicked.connect(self.handle_table_row_selection)
+        self.search_results_table.verticalScrollBar().valueChanged.connect(self._update_thumbnail_priorities)
+        self.search_results_table.horizontalHeader().sortIndicatorChanged.connect(self._update_thumbnail_priorities)
+        self.thumbnail_loader.thumbnail_ready.connect(self._handle_thumbnail_ready)
+        self.thumbnail_loader.thumbnail_failed.connect(self._handle_thumbnail_failed)
         self.search_results_table.customContextMenuRequested.connect(self.handle_table_context_menu)
-        self.search_results_table.cellDoubleClicked.connect(self.handle_table_row_double_click) # Example
+        self.search_results_table.doubleClicked.connect(self.handle_table_row_double_click) # Example
 
         # Download Options
         self.lang_combo.currentTextChanged.connect(self.handle_language_change_for_episodes)
@@ -229,11 +285,15 @@ class AnimeDownloaderWindow(QWidget):
         self.about_btn.clicked.connect(self.open_about_dialog)
 
         # Custom Thread Signals (from this class to its own slots)
-        self.output_signal.connect(self.append_log_message)
+        # Direct connection: LogSink.write is thread-safe, so no queued event per log line
+        self.output_signal.connect(self.log_sink.write, Qt.ConnectionType.DirectConnection)
         self.search_finished_signal.connect(self.handle_search_finished)
+        self.search_results_batch_signal.connect(self._populate_table_with_search_results)
         self.update_episode_title_signal.connect(self.current_episode_title_label.setText)
         self.update_episode_progress_signal.connect(self.current_episode_progress_bar.setValue)
+        self.progress_event_signal.connect(self._handle_progress_event)
         self.update_batch_progress_signal.connect(self.handle_batch_progress_update)
+        self.update_batch_range_signal.connect(self._set_batch_range)
         self.set_download_button_enabled_signal.connect(self.download_btn.setEnabled)
 
     def _restore_window_geometry(self):
@@ -323,6 +383,22 @@ class AnimeDownloaderWindow(QWidget):
         """Gets download retries from settings, default to 10."""
         return self.settings.value(KEY_DOWNLOAD_RETRIES, 10, type=int)
 
+    def _get_effective_fragment_concurrency(self) -> tuple[int, bool]:
+        """Gets (parallel fragments per episode, adaptive tuning) from settings, default to (4, True)."""
+        return (
+            max(1, self.settings.value(KEY_FRAGMENT_CONCURRENCY, 4, type=int)),
+            self.settings.value(KEY_ADAPTIVE_FRAGMENTS, True, type=bool),
+        )
+
+    def _get_effective_concurrent_episodes(self) -> int:
+        """Gets the number of concurrently downloaded episodes from settings, default to 1."""
+        return max(1, self.settings.value(KEY_CONCURRENT_EPISODES, 1, type=int))
+
+    def _get_effective_bandwidth_limit(self) -> int | None:
+        """Gets the batch bandwidth limit in bytes/s from settings, or None if unlimited."""
+        limit_kib = self.settings.value(KEY_BANDWIDTH_LIMIT, 0, type=int)
+        return limit_kib * 1024 if limit_kib > 0 else None
+
     def handle_setting_changed_and_save(self): # Generic slot for changed settings
         self._save_settings()
 
@@ -364,28 +440,6 @@ class AnimeDownloaderWindow(QWidget):
             self.batch_progress_label.hide()
             self.batch_progress_bar.hide()
 
-    def append_log_message(self, text: str):
-        # Determine if dark mode based on window background lightness
-        is_dark = self.palette().color(QPalette.ColorRole.Window).lightness() < 128
-        
-        # Determine color based on message content and theme
-        if "[ERROR]" in text or "ERROR" in text:
-            color = QColor("red")
-        elif "[WARNING]" in text or "WARNING" in text:
-            color = QColor("yellow") if is_dark else QColor("orange")
-        elif "[yt-dlp DEBUG]" in text:
-            color = QColor("lightgray")
-        elif "[INFO]" in text or "INFO" in text:
-            color = QColor("cyan") if is_dark else QColor("blue")
-        else:
-            color = QColor("white") if is_dark else QColor("black")
-        
-        # Set color and append
-        self.output_box.setTextColor(color)
-        self.output_box.append(text)
-        self.output_box.setTextColor(QColor("white") if is_dark else QColor("black"))  # Reset
-        self.output_box.moveCursor(QTextCursor.MoveOperation.End)
-
     def handle_search_action(self): # Was search()
         anime_name = self.search_input.currentText().strip()  # Changed to currentText() for QComboBox
         if not anime_name:
@@ -393,9 +447,7 @@ class AnimeDownloaderWindow(QWidget):
             return
         
         self.output_signal.emit(f"Searching for '{anime_name}'...")
-        self.anime_results = [] 
-        self.search_results_table.setRowCount(0) # Clear table
-        self.selected_anime_data = None
+        self._clear_search_results() # Clear table and pending thumbnail requests
         self.update_download_options_visibility(False) # Hide options
 
         QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
@@ -406,15 +458,24 @@ class AnimeDownloaderWindow(QWidget):
         threading.Thread(target=self._execute_search_task, args=(anime_name,), daemon=True).start()
 
     def _execute_search_task(self, anime_name: str):
-        """Worker thread method for searching anime."""
+        """Worker thread method for searching anime. Streams results to the GUI in batches."""
+        batch = []
+        last_flush = 0.0
         try:
-            # Call the AnimeService method
-            self.anime_results = self.anime_service.search_anime(anime_name) 
+            # Results arrive as each item is parsed; the first one is sent immediately,
+            # later ones at most every SEARCH_BATCH_INTERVAL seconds to keep the GUI responsive
+            for result in self.anime_service.iter_search_results(anime_name):
+                batch.append(result)
+                if time.monotonic() - last_flush >= SEARCH_BATCH_INTERVAL:
+                    self.search_results_batch_signal.emit(batch)
+                    batch = []
+                    last_flush = time.monotonic()
         except Exception as e:
             # Log error through the service or directly if service doesn't log this high-level failure
             self.output_signal.emit(f"[ERROR] Search execution thread failed: {e}")
-            self.anime_results = [] # Ensure results list is empty on error
         finally:
+            if batch:
+                self.search_results_batch_signal.emit(batch)
             self.search_finished_signal.emit() # Signal GUI thread that search is done
 
     def handle_search_finished(self): # Was _on_search_finished_slot()
@@ -424,115 +485,91 @@ class AnimeDownloaderWindow(QWidget):
         self.search_input.setEnabled(True)
 
         if self.anime_results:
-            self.output_signal.emit(f"Found {len(self.anime_results)} result(s). Populating table...")
-            self._populate_table_with_search_results() # Populate table with new results
+            self.output_signal.emit(f"Found {len(self.anime_results)} result(s).")
         else:
             self.output_signal.emit("No results found or an error occurred during search.")
         # self.output_signal.emit("Search interface reactivated.") # Optional confirmation
 
-    def _populate_table_with_search_results(self): # Was populate_search_results_table()
-        """Populates the QTableWidget with anime search results."""
-        self.search_results_table.setSortingEnabled(False)
-        self.search_results_table.clearContents() # Clear existing content before new population
-        self.search_results_table.setRowCount(len(self.anime_results))
-        
-        self.search_results_table.verticalHeader().setDefaultSectionSize(self.table_thumbnail_size.height() + 10)
-        
-        for row_idx, anime_data in enumerate(self.anime_results):
-            # Column 0: Thumbnail
+    def _handle_search_refreshed(self, anime_name: str, results: list):
+        """Slot for search_refreshed_signal: swaps in fresh results for the query still on screen."""
+        if anime_name.strip().casefold() != self.search_input.currentText().strip().casefold():
+            return
+        if not self.search_btn.isEnabled() or results == self.anime_results:
+            return  # A new search is running, or nothing changed
+        self.output_signal.emit(f"Search results for '{anime_name}' refreshed ({len(results)} result(s)).")
+        self._clear_search_results()
+        self.update_download_options_visibility(False)
+        self._populate_table_with_search_results(results)
+
+    def _populate_table_with_search_results(self, batch: list): # Was populate_search_results_table()
+        """Appends a batch of anime search results to the results model (slot for search_results_batch_signal)."""
+        self.anime_results.extend(batch)
+        for anime_data in batch:
             img_url = anime_data.get("img")
-            if img_url:
-                cached_pixmap = self.pixmap_cache.find(img_url)
-                if cached_pixmap and not cached_pixmap.isNull(): # Check if valid pixmap
-                    self._set_image_widget_in_cell(row_idx, 0, cached_pixmap)
-                else:
-                    placeholder_item = QTableWidgetItem("...")
-                    placeholder_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                    self.search_results_table.setItem(row_idx, 0, placeholder_item)
-                    self._request_image_load_for_cell(row_idx, 0, img_url)
+            if not img_url or self.search_results_model.has_thumbnail(img_url):
+                continue
+            cached_pixmap = self._find_cached_thumbnail(img_url)
+            if cached_pixmap: # Memory or disk cache hit, no request needed
+                self.search_results_model.set_thumbnail(img_url, cached_pixmap)
             else:
-                no_img_item = QTableWidgetItem("N/A")
-                no_img_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                self.search_results_table.setItem(row_idx, 0, no_img_item)
-
-            # Column 1: Title
-            title_text = anime_data.get("title", "N/A")
-            title_item = QTableWidgetItem(title_text)
-            title_item.setData(Qt.ItemDataRole.UserRole, anime_data) # Store full dict
-            tooltip_parts = [f"<b>{title_text}</b>"]
-            if img_url and not (self.pixmap_cache.find(img_url) and not self.pixmap_cache.find(img_url).isNull()):
-                tooltip_parts.append("<i>(Image loading...)</i>")
-            title_item.setToolTip("\n".join(tooltip_parts))
-            self.search_results_table.setItem(row_idx, 1, title_item)
-
-            # Column 2: Sub Episodes
-            sub_val = anime_data.get("sub", 0)
-            sub_item = NumericTableWidgetItem() # From .helpers
-            sub_item.setData(Qt.ItemDataRole.EditRole, sub_val) # Data for sorting
-            sub_item.setText(str(sub_val))                     # Data for display
-            sub_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.search_results_table.setItem(row_idx, 2, sub_item)
-
-            # Column 3: Dub Episodes
-            dub_val = anime_data.get("dub", 0)
-            dub_item = NumericTableWidgetItem() # From .helpers
-            dub_item.setData(Qt.ItemDataRole.EditRole, dub_val) # Data for sorting
-            dub_item.setText(str(dub_val))                     # Data for display
-            dub_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.search_results_table.setItem(row_idx, 3, dub_item)
-
-        self.search_results_table.resizeColumnToContents(0) # Adjust thumbnail column
-        # Other columns are either Stretch or Interactive, initial size from header label width
-        self.search_results_table.setSortingEnabled(True)
-
-    def _set_image_widget_in_cell(self, row: int, col: int, pixmap: QPixmap):
-        """Creates a QLabel with the pixmap and sets it as the cell widget."""
-        img_label = QLabel()
-        img_label.setPixmap(pixmap) # Assumes pixmap is already scaled to self.table_thumbnail_size
-        img_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        img_label.setStyleSheet("background-color: transparent;") # Avoid QLabel default background
-        self.search_results_table.setCellWidget(row, col, img_label)
-
-    def _request_image_load_for_cell(self, row: int, col: int, image_url_str: str): # Was load_image_for_cell
-        if not image_url_str: return
-        url = QUrl(image_url_str)
-        request = QNetworkRequest(url)
-        reply = self.network_manager.get(request)
-        self.active_image_requests[reply] = (row, col, image_url_str) # Track reply
-        reply.finished.connect(self._handle_image_network_reply)
-
-    def _handle_image_network_reply(self): # Was _on_image_reply_finished
-        reply = self.sender() # Get the QNetworkReply object
-        if not reply or reply not in self.active_image_requests:
-            if reply: reply.deleteLater()
+                self.thumbnail_loader.request(img_url)
+        # The proxy keeps the current sort order and filter while rows are inserted
+        self.search_results_model.append_rows(batch)
+        self._update_thumbnail_priorities()
+
+    def _clear_search_results(self):
+        self.anime_results = []
+        self.search_results_model.clear()
+        self.thumbnail_loader.reset() # Drop image requests for the rows just cleared
+        self.selected_anime_data = None
+
+    def _find_cached_thumbnail(self, image_url: str) -> QPixmap | None:
+        """Returns the scaled thumbnail from the memory cache, falling back to the disk cache."""
+        pixmap = self.pixmap_cache.find(image_url)
+        if pixmap and not pixmap.isNull():
+            return pixmap
+        pixmap = self.thumbnail_cache.load(image_url)
+        if pixmap and not pixmap.isNull():
+            self.pixmap_cache.insert(image_url, pixmap)
+            return pixmap
+        return None
+
+    def _anime_data_at(self, index: QModelIndex) -> dict | None:
+        """Returns the result dict behind a view (proxy) index."""
+        return index.data(ANIME_DATA_ROLE) if index.isValid() else None
+
+    def _update_thumbnail_priorities(self, *_):
+        """Tells the thumbnail loader which rows are in the viewport so they load first."""
+        table = self.search_results_table
+        proxy = self.search_results_proxy
+        if not proxy.rowCount():
             return
-        
-        row, col, image_url = self.active_image_requests.pop(reply)
-        placeholder_item = self.search_results_table.item(row, col) # If a placeholder QTableWidgetItem was set
-
-        if reply.error() == QNetworkReply.NetworkError.NoError:
-            image_data = reply.readAll()
-            pixmap = QPixmap()
-            if pixmap.loadFromData(image_data):
-                # Scale pixmap before caching and displaying
-                scaled_pixmap = pixmap.scaled(self.table_thumbnail_size, 
-                                              Qt.AspectRatioMode.KeepAspectRatio, 
-                                              Qt.TransformationMode.SmoothTransformation)
-                self.pixmap_cache.insert(image_url, scaled_pixmap) # Cache the scaled version
-                self._set_image_widget_in_cell(row, col, scaled_pixmap)
-            else:
-                if placeholder_item: placeholder_item.setText("Img Load Err")
-                self.output_signal.emit(f"[ERROR] Could not load image data from {image_url}")
-        else:
-            if placeholder_item: placeholder_item.setText("Net Err")
-            self.output_signal.emit(f"[ERROR] Network error for image {image_url}: {reply.errorString()}")
-        reply.deleteLater() # Crucial to free network resources
-
-    def handle_table_row_selection(self, row: int, column: int): # Was anime_selected_from_table
-        # Data is stored in the UserRole of the Title item (column 1)
-        title_item_for_data = self.search_results_table.item(row, 1) 
-        if title_item_for_data and title_item_for_data.data(Qt.ItemDataRole.UserRole):
-            self.selected_anime_data = title_item_for_data.data(Qt.ItemDataRole.UserRole)
+        first = table.rowAt(0)
+        last = table.rowAt(table.viewport().height() - 1)
+        first = 0 if first < 0 else first
+        last = proxy.rowCount() - 1 if last < 0 else last
+        visible_urls = []
+        for row in range(first, last + 1):
+            anime_data = self._anime_data_at(proxy.index(row, 0))
+            if anime_data and anime_data.get("img"):
+                visible_urls.append(anime_data["img"])
+        self.thumbnail_loader.set_visible(visible_urls)
+
+    def _handle_thumbnail_ready(self, image_url: str, image: QImage):
+        """Slot for ThumbnailLoader.thumbnail_ready; the image is already scaled and on disk."""
+        pixmap = QPixmap.fromImage(image)
+        self.pixmap_cache.insert(image_url, pixmap) # Cache the scaled version
+        self.search_results_model.set_thumbnail(image_url, pixmap)
+
+    def _handle_thumbnail_failed(self, image_url: str, error: str):
+        self.search_results_model.set_thumbnail_failed(image_url)
+        self.output_signal.emit(f"[ERROR] Could not load image {image_url}: {error}")
+
+    def handle_table_row_selection(self, index: QModelIndex): # Was anime_selected_from_table
+        # The model returns the full result dict for ANIME_DATA_ROLE on every column
+        anime_data = self._anime_data_at(index)
+        if anime_data:
+            self.selected_anime_data = anime_data
             self.output_signal.emit(f"Selected: {self.selected_anime_data.get('title', 'N/A')}")
             self.update_download_options_visibility(True) # Show options now that item is selected
             self.handle_language_change_for_episodes() # Update episode range based on new selection
@@ -615,60 +652,95 @@ class AnimeDownloaderWindow(QWidget):
             QMessageBox.warning(self, "Range Error", "Start episode must be less than or equal to end episode.")
             return
         
-        self.is_download_active = True
-        self.total_episodes_in_batch = (end_ep - start_ep) + 1
+        job_id = self.job_queue.add_job(title, url, lang, quality, start_ep, end_ep, download_dir)
+        with self._job_worker_lock:
+            start_worker = not self.is_download_active
+            self.is_download_active = True
+
+        if start_worker:
+            self.output_signal.emit(
+                f"Starting download for '{title}' (Episodes {start_ep}-{end_ep}, {lang}, {quality}) to '{download_dir}'"
+            )
+            self._start_job_queue_worker()
+        else:
+            self.output_signal.emit(
+                f"Queued download #{job_id} for '{title}' (Episodes {start_ep}-{end_ep}, {lang}, {quality}); "
+                f"it starts after the current one."
+            )
+
+    def _offer_to_resume_jobs(self):
+        """Offers to resume the jobs that were unfinished when the app last stopped."""
+        unfinished = self.job_queue.jobs(unfinished_only=True)
+        if not unfinished or self.is_download_active:
+            return
+        titles = "\n".join(f"- {job['title']} (Ep {job['start_ep']}-{job['end_ep']})" for job in unfinished[:10])
+        reply = QMessageBox.question(
+            self, "Resume Downloads",
+            f"{len(unfinished)} download(s) did not finish last time:\n{titles}\n\nResume them now?",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+            QMessageBox.StandardButton.Yes
+        )
+        if reply == QMessageBox.StandardButton.Yes:
+            with self._job_worker_lock:
+                if self.is_download_active:
+                    return
+                self.is_download_active = True
+            self._start_job_queue_worker()
+        else:
+            self.output_signal.emit(f"{len(unfinished)} unfinished download(s) stay queued and run with the next download.")
+
+    def _start_job_queue_worker(self):
+        # Caller has set is_download_active
+        self.total_episodes_in_batch = 0
         self.completed_episodes_in_batch = 0
+        self.episodes_done_at_job_start = 0
+        self.reported_episodes_in_batch.clear()
         self.current_episode_last_pct = 0.0
         self.current_tracking_video_file = None # Reset for new batch
 
         self.update_download_options_visibility(True) # Ensure progress bars are visible
         self.current_episode_title_label.setText("Current file: Preparing download...")
         self.current_episode_progress_bar.setValue(0)
-        self.batch_progress_bar.setRange(0, self.total_episodes_in_batch)
         self.batch_progress_bar.setValue(0)
-        self.batch_progress_bar.setFormat(f"%v of {self.total_episodes_in_batch} episodes (%p%)")
-        self.batch_progress_label.setText(f"Overall batch: 0 of {self.total_episodes_in_batch} processed")
-        
-        self.set_download_button_enabled_signal.emit(False) # Disable download button
-        self.output_signal.emit(
-            f"Starting download for '{title}' (Episodes {start_ep}-{end_ep}, {lang}, {quality}) to '{download_dir}'"
-        )
 
-        threading.Thread(target=self._execute_download_task, 
-                         args=(title, url, lang, quality, start_ep, end_ep, download_dir), 
-                         daemon=True).start()
+        threading.Thread(target=self._execute_job_queue_task, daemon=True).start()
 
-    def _execute_download_task(self, title, url, lang, quality, start_ep, end_ep, base_download_dir):
-        """Worker thread method for downloading anime."""
+    def _execute_job_queue_task(self):
+        """Worker thread method: downloads queued jobs in order until the queue is empty."""
         ffmpeg_location = self._get_effective_ffmpeg_path()
         download_retries = self._get_effective_download_retries()
-        
-        self.current_operation_details = (
-            f"Downloading: {title} (Ep {start_ep}-{end_ep}, {lang}, {quality})\n"
-            f"To: {base_download_dir}\n"
-            f"FFmpeg: {'Auto-detect' if not ffmpeg_location else ffmpeg_location}\n" # Display FFmpeg info
-            f"Retries: {download_retries}"
-        )
+        concurrent_episodes = self._get_effective_concurrent_episodes()
+        fragment_concurrency, adaptive_fragments = self._get_effective_fragment_concurrency()
+        bandwidth_limit = self._get_effective_bandwidth_limit()
 
         try:
-            self.anime_service.download_anime( # Call the AnimeService method
-                title, url, lang, quality, start_ep, end_ep, base_download_dir,
-                gui_logger_callback=self.output_signal.emit, # For yt-dlp's internal logger
-                progress_hook_for_gui=self._download_progress_hook,
-                postprocessor_hook_for_gui=self._postprocessor_hook,
-                log_ytdlp_debug_to_gui=False,
-                ffmpeg_location=ffmpeg_location, # <-- PASS FFMPEG PATH
-                download_retries=download_retries,
-            )
-            
+            while True:
+                self.anime_service.run_job_queue( # Call the AnimeService method
+                    self.job_queue, stop_event=self.job_queue_stop,
+                    gui_logger_callback=self.output_signal.emit, # For yt-dlp's internal logger
+                    progress_hook_for_gui=self.progress_aggregator.hook,
+                    postprocessor_hook_for_gui=self._postprocessor_hook,
+                    log_ytdlp_debug_to_gui=False,
+                    ffmpeg_location=ffmpeg_location, # <-- PASS FFMPEG PATH
+                    download_retries=download_retries,
+                    concurrent_episodes=concurrent_episodes,
+                    fragment_concurrency=fragment_concurrency,
+                    adaptive_fragments=adaptive_fragments,
+                    bandwidth_limit=bandwidth_limit,
+                )
+                with self._job_worker_lock:
+                    # A job queued while the last one finished would otherwise wait for the next download
+                    if self.job_queue_stop.is_set() or self.job_queue.next_job() is None:
+                        self.is_download_active = False # Mark download as inactive
+                        break
+
         except Exception as e:
-            self.output_signal.emit(f"[CRITICAL ERROR] Download thread for '{title}' encountered an error: {e}")
+            with self._job_worker_lock:
+                self.is_download_active = False
+            self.output_signal.emit(f"[CRITICAL ERROR] Download thread encountered an error: {e}")
             # import traceback
             # self.output_signal.emit(f"Traceback: {traceback.format_exc()}")
         finally:
-            self.is_download_active = False # Mark download as inactive
-            self.set_download_button_enabled_signal.emit(True) # Re-enable download button
-            
             # Emit a final status message for the current episode title area
             final_status_msg = "Batch processing concluded."
             if self.total_episodes_in_batch > 0: # If a batch was actually defined
@@ -684,64 +756,84 @@ class AnimeDownloaderWindow(QWidget):
             self.update_episode_title_signal.emit(final_status_msg)
             # Batch progress bar should already reflect the final state from hooks.
 
-    def _download_progress_hook(self, d):
-        """Callback hook from yt-dlp for download progress. Runs in download thread."""
-        status = d.get('status')
-        filename_from_hook = d.get('filename', '')
-        # Use strip_ansi_codes from .helpers
-        cleaned_filename = strip_ansi_codes(filename_from_hook) 
-        base_filename_current_op = os.path.basename(cleaned_filename) if cleaned_filename else "N/A"
-        is_current_op_video = any(cleaned_filename.lower().endswith(ext) for ext in self.video_extensions)
-
-        if status == 'downloading':
-            percent_str_for_log = strip_ansi_codes(d.get('_percent_str', '0.0%').strip())
-            speed_str_for_log = strip_ansi_codes(d.get('_speed_str', 'N/A').strip())
-            speed_str_for_log = speed_str_for_log.strip()
-            eta_str_for_log = strip_ansi_codes(d.get('_eta_str', 'N/A').strip())
-            
-            # Optional: log detailed download progress for non-video files too
-            if is_current_op_video and base_filename_current_op == self.current_tracking_video_file:
-                self.output_signal.emit(
-                    f"DL '{base_filename_current_op}': {percent_str_for_log} @ {speed_str_for_log} (ETA: {eta_str_for_log}s)"
-                )
-                # Add detailed progress message like yt-dlp
-                total_bytes_str = strip_ansi_codes(d.get('_total_bytes_str', 'Unknown').strip())
-                self.output_signal.emit(f"[download] {percent_str_for_log} of {total_bytes_str} at {speed_str_for_log} ETA {eta_str_for_log}")
-
-            if is_current_op_video:
-                if self.current_tracking_video_file != base_filename_current_op: # New video file started
-                    self.current_tracking_video_file = base_filename_current_op
+    def _handle_job_started(self, job_id: int, title: str, episode_count: int, episodes_done: int):
+        """Slot for AnimeService.job_started_signal. Runs in download thread."""
+        self.total_episodes_in_batch = episode_count
+        self.completed_episodes_in_batch = episodes_done
+        self.episodes_done_at_job_start = episodes_done
+        self.reported_episodes_in_batch.clear()
+        self.update_batch_range_signal.emit(episode_count)
+        self.update_batch_progress_signal.emit(episodes_done, episode_count)
+        resumed = f", resuming after {episodes_done} done" if episodes_done else ""
+        self.output_signal.emit(f"Download #{job_id} started: '{title}' ({episode_count} episode(s){resumed})")
+
+    def _set_batch_range(self, episode_count: int):
+        self.batch_progress_bar.setRange(0, episode_count)
+        self.batch_progress_bar.setFormat(f"%v of {episode_count} episodes (%p%)")
+
+    def _handle_progress_event(self, event: ProgressEvent):
+        """Slot for the throttled ProgressEvents of ProgressAggregator. Runs in GUI thread."""
+        filename = event.filename
+        is_video = filename.lower().endswith(self.video_extensions)
+
+        if event.status == 'downloading':
+            if is_video and self.current_tracking_video_file in (None, filename):
+                # With concurrent episodes only one file drives the episode bar at a time
+                if self.current_tracking_video_file is None: # New video file started
+                    self.current_tracking_video_file = filename
                     self.current_episode_last_pct = 0.0
-                    self.update_episode_progress_signal.emit(0) # Reset individual bar
-                    
-                    info_dict = d.get('info_dict', {})
-                    ep_num_str = str(info_dict.get('episode_number', ''))
-                    ep_title_str = strip_ansi_codes(str(info_dict.get('episode', info_dict.get('title', ''))))
-                    if not ep_title_str or ep_title_str == "N/A": ep_title_str = base_filename_current_op
-                    
-                    display_title = f"Episode {ep_num_str} - {ep_title_str}" if ep_num_str else ep_title_str
-                    self.update_episode_title_signal.emit(f"Downloading: {display_title}")
-                    self.output_signal.emit(f"Title set to: Downloading: {display_title}")
-                
-                try: # Update progress bar for current video
-                    current_pct_float = float(percent_str_for_log.replace('%', ''))
-                    if current_pct_float >= self.current_episode_last_pct: # Ensure progress moves forward
-                        self.current_episode_last_pct = current_pct_float
-                        self.update_episode_progress_signal.emit(int(current_pct_float))
-                        self.output_signal.emit(f"Progress updated to: {int(current_pct_float)}%")
-                except ValueError: pass # Ignore if percent string cannot be converted
+                    self.current_episode_progress_bar.setValue(0) # Reset individual bar
+
+                    ep_title_str = strip_ansi_codes(str(event.episode_title or '')) or filename
+                    if ep_title_str == "N/A": ep_title_str = filename
+                    display_title = (f"Episode {event.episode_number} - {ep_title_str}"
+                                     if event.episode_number is not None else ep_title_str)
+                    self.current_episode_title_label.setText(f"Downloading: {display_title}")
+                    self.log_sink.write(f"Title set to: Downloading: {display_title}")
+
+                percent = event.percent
+                if percent is not None and percent >= self.current_episode_last_pct: # Progress only moves forward
+                    self.current_episode_last_pct = percent
+                    self.current_episode_progress_bar.setValue(int(percent))
+
+            if is_video and filename == self.current_tracking_video_file:
+                # Progress lines are coalesced per file: only the latest one per log frame is rendered
+                percent = event.percent
+                speed = f"{format_bytes(event.speed)}/s" if event.speed else "N/A"
+                eta = f"{int(event.eta)}" if event.eta is not None else "N/A"
+                self.log_sink.write(
+                    f"DL '{filename}': {percent if percent is not None else 0:.1f}% of "
+                    f"{format_bytes(event.total_bytes)} @ {speed} (ETA: {eta}s)",
+                    key=(filename, "progress"),
+                )
+                frag_stats = event.fragment_stats
+                if frag_stats and frag_stats.get('fragment_count'):
+                    self.log_sink.write(
+                        f"[download] Fragment {frag_stats['fragment_index']}/{frag_stats['fragment_count']} "
+                        f"@ {frag_stats['fragments_per_sec']} frag/s, {frag_stats['concurrency']} parallel, "
+                        f"{frag_stats['retries']} retries",
+                        key=(filename, "fragments"),
+                    )
 
-        elif status == 'finished':
-            self.output_signal.emit(f"Finished component: {base_filename_current_op}")
-            if is_current_op_video and base_filename_current_op == self.current_tracking_video_file:
-                self.update_episode_progress_signal.emit(100) # Mark current video as 100%
-                self.completed_episodes_in_batch += 1
-                # Emit signal to update batch progress UI
-                self.update_batch_progress_signal.emit(self.completed_episodes_in_batch, self.total_episodes_in_batch)
-                self.output_signal.emit(f"--- Video Episode '{base_filename_current_op}' fully processed. ---")
+        elif event.status == 'finished':
+            self.log_sink.write(f"Finished component: {filename}")
+            if is_video and filename == self.current_tracking_video_file:
+                self.current_episode_progress_bar.setValue(100) # Mark current video as 100%
+                self.log_sink.write(f"--- Video Episode '{filename}' fully processed. ---")
                 self.current_tracking_video_file = None # Reset for next video in batch
                 self.current_episode_last_pct = 0.0
 
+    def _handle_episode_completed(self, title: str, episode_number: int, succeeded: bool, quality: str):
+        """Slot for AnimeService.episode_completed_signal (episode order). Runs in download thread."""
+        self.reported_episodes_in_batch.add((title, episode_number))
+        self.completed_episodes_in_batch = self.episodes_done_at_job_start + len(self.reported_episodes_in_batch)
+        if not succeeded:
+            self.output_signal.emit(f"[WARNING] Episode {episode_number} of '{title}' did not complete.")
+        elif quality:
+            self.output_signal.emit(f"Episode {episode_number} of '{title}' downloaded in {quality}.")
+        # Emit signal to update batch progress UI
+        self.update_batch_progress_signal.emit(self.completed_episodes_in_batch, self.total_episodes_in_batch)
+
     def _postprocessor_hook(self, d):
         """Callback hook from yt-dlp for postprocessing. Runs in download thread."""
         status = d.get('status')
@@ -807,26 +899,17 @@ class AnimeDownloaderWindow(QWidget):
         self._save_settings() # Save this preference
 
     def handle_filter_table_text_changed(self, text: str): # Was filter_search_table
-        filter_text = text.lower().strip()
-        for row_num in range(self.search_results_table.rowCount()):
-            title_item = self.search_results_table.item(row_num, 1) # Title is in column 1
-            if title_item:
-                # Hide row if filter_text is not empty AND title doesn't contain filter_text
-                should_hide = bool(filter_text) and (filter_text not in title_item.text().lower())
-                self.search_results_table.setRowHidden(row_num, should_hide)
-            else: # Should not happen if table is populated correctly
-                self.search_results_table.setRowHidden(row_num, bool(filter_text))
+        # Case-insensitive substring match on the title column (see SearchResultsProxyModel)
+        self.search_results_proxy.setFilterFixedString(text.strip())
+        self._update_thumbnail_priorities()
 
     def handle_table_context_menu(self, position): # Was show_table_context_menu
-        selected_indexes = self.search_results_table.selectedIndexes()
-        if not selected_indexes: return
+        selected_rows = self.search_results_table.selectionModel().selectedRows()
+        if not selected_rows: return
 
-        selected_row = selected_indexes[0].row() # Get row from first selected index
-        title_item = self.search_results_table.item(selected_row, 1) # Title item from column 1
-        
-        if not (title_item and title_item.data(Qt.ItemDataRole.UserRole)): return
+        anime_data_for_menu = self._anime_data_at(selected_rows[0])
+        if not anime_data_for_menu: return
         
-        anime_data_for_menu = title_item.data(Qt.ItemDataRole.UserRole)
         menu = QMenu(self)
 
         copy_title_action = QAction(f"Copy Title: {anime_data_for_menu.get('title', 'N/A')}", self)
@@ -840,9 +923,9 @@ class AnimeDownloaderWindow(QWidget):
         
         menu.exec(self.search_results_table.viewport().mapToGlobal(position))
 
-    def handle_table_row_double_click(self, row: int, column: int): # Was handle_table_double_click
+    def handle_table_row_double_click(self, index: QModelIndex): # Was handle_table_double_click
         # Default action: select the row (as if single-clicked)
-        self.handle_table_row_selection(row, column)
+        self.handle_table_row_selection(index)
         # Optional: could also immediately trigger download or open details, etc.
 
     def closeEvent(self, event):
@@ -851,12 +934,13 @@ class AnimeDownloaderWindow(QWidget):
         if self.is_download_active:
             reply = QMessageBox.question(
                 self, 'Confirm Exit',
-                "Downloads are in progress. Are you sure you want to exit?",
+                "Downloads are in progress. Are you sure you want to exit?\n"
+                "Unfinished episodes resume the next time you start the app.",
                 QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
                 QMessageBox.StandardButton.No # Default to No
             )
             if reply == QMessageBox.StandardButton.Yes:
-                # Add any necessary cleanup for active threads if possible (hard with daemon threads)
+                self.job_queue_stop.set() # Don't start further retries; the journal holds the rest
                 event.accept()
             else:
                 event.ignore()
@@ -0,0 +1,212 @@
+from PyQt6.QtCore import (
+    QAbstractTableModel, QCoreApplication, QModelIndex, QRect, QSize, QSortFilterProxyModel, Qt
+)
+from PyQt6.QtGui import QIcon, QPixmap
+from PyQt6.QtWidgets import QApplication, QStyle, QStyledItemDelegate, QStyleOptionViewItem
+
+ANIME_DATA_ROLE = Qt.ItemDataRole.UserRole       # The full search result dict, on every column
+SORT_ROLE = Qt.ItemDataRole.UserRole + 1         # Native sort keys (int episode counts, folded titles)
+
+COL_THUMBNAIL, COL_TITLE, COL_SUB, COL_DUB = range(4)
+
+
+def _sort_key(column: int):
+    if column in (COL_SUB, COL_DUB):
+        key = "sub" if column == COL_SUB else "dub"
+        return lambda anime_data: anime_data.get(key) or 0
+    return lambda anime_data: (anime_data.get("title") or "").casefold()
+
+
+class SearchResultsModel(QAbstractTableModel):
+    """
+    Search results as a table model: one row per result dict, thumbnails keyed by image URL.
+
+    Sorting happens here, on plain Python keys in a single sorted() call, rather than in
+    the proxy, which would call data() back for every comparison.
+    """
+    HEADERS = ("Thumbnail", "Title  ", "Sub Eps  ", "Dub Eps  ")  # Extra spaces for sort arrow
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows = []
+        self._rows_by_image = {}  # image url -> [row, ...]
+        self._pixmaps = {}        # image url -> scaled QPixmap
+        self._failed_images = set()
+        self._sort_column = -1
+        self._sort_order = Qt.SortOrder.AscendingOrder
+
+    # --- Qt model interface ---
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return QCoreApplication.translate("AnimeDownloaderWindow", self.HEADERS[section])
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        anime_data = self._rows[index.row()]
+        column = index.column()
+
+        if role == ANIME_DATA_ROLE:
+            return anime_data
+
+        if column == COL_THUMBNAIL:
+            img_url = anime_data.get("img")
+            if role == Qt.ItemDataRole.DecorationRole:
+                return self._pixmaps.get(img_url)
+            if role == Qt.ItemDataRole.DisplayRole:
+                if not img_url:
+                    return "N/A"
+                if img_url in self._failed_images:
+                    return "Img Err"
+                return None if img_url in self._pixmaps else "..."
+            if role == SORT_ROLE:
+                return _sort_key(column)(anime_data)
+        elif column == COL_TITLE:
+            if role == Qt.ItemDataRole.DisplayRole:
+                return anime_data.get("title", "N/A")
+            if role == SORT_ROLE:
+                return _sort_key(column)(anime_data)
+            if role == Qt.ItemDataRole.ToolTipRole:
+                tooltip = f"<b>{anime_data.get('title', 'N/A')}</b>"
+                img_url = anime_data.get("img")
+                if img_url and img_url not in self._pixmaps and img_url not in self._failed_images:
+                    tooltip += "\n<i>(Image loading...)</i>"
+                return tooltip
+        else:
+            key = "sub" if column == COL_SUB else "dub"
+            if role in (Qt.ItemDataRole.DisplayRole, SORT_ROLE):
+                return anime_data.get(key, 0)
+
+        if role == Qt.ItemDataRole.TextAlignmentRole and column != COL_TITLE:
+            return Qt.AlignmentFlag.AlignCenter
+        return None
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        self._sort_column = column
+        self._sort_order = order
+        self._apply_sort()
+
+    def _apply_sort(self) -> None:
+        if self._sort_column < 0 or len(self._rows) < 2:
+            return
+        key = _sort_key(self._sort_column)
+        rows = self._rows
+        order = sorted(range(len(rows)), key=lambda i: key(rows[i]),
+                       reverse=self._sort_order == Qt.SortOrder.DescendingOrder)
+        if order == list(range(len(rows))):
+            return
+
+        self.layoutAboutToBeChanged.emit()
+        new_row_of = [0] * len(rows)
+        for new_row, old_row in enumerate(order):
+            new_row_of[old_row] = new_row
+        persistent = self.persistentIndexList()
+        self.changePersistentIndexList(
+            persistent, [self.index(new_row_of[index.row()], index.column()) for index in persistent]
+        )
+        self._rows = [rows[i] for i in order]
+        self._reindex_images()
+        self.layoutChanged.emit()
+
+    def _reindex_images(self) -> None:
+        self._rows_by_image = {}
+        for row, anime_data in enumerate(self._rows):
+            img_url = anime_data.get("img")
+            if img_url:
+                self._rows_by_image.setdefault(img_url, []).append(row)
+
+    # --- Population ---
+    def append_rows(self, batch: list) -> None:
+        """Appends rows, then re-applies the current sort order (if any)."""
+        if not batch:
+            return
+        first = len(self._rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(batch) - 1)
+        for row, anime_data in enumerate(batch, start=first):
+            self._rows.append(anime_data)
+            img_url = anime_data.get("img")
+            if img_url:
+                self._rows_by_image.setdefault(img_url, []).append(row)
+        self.endInsertRows()
+        self._apply_sort()
+
+    def clear(self) -> None:
+        self.beginResetModel()
+        self._rows = []
+        self._rows_by_image = {}
+        self._pixmaps = {}
+        self._failed_images = set()
+        self.endResetModel()
+
+    def anime_data(self, row: int) -> dict | None:
+        return self._rows[row] if 0 <= row < len(self._rows) else None
+
+    # --- Thumbnails ---
+    def has_thumbnail(self, img_url: str) -> bool:
+        return img_url in self._pixmaps
+
+    def set_thumbnail(self, img_url: str, pixmap: QPixmap) -> None:
+        self._pixmaps[img_url] = pixmap
+        self._failed_images.discard(img_url)
+        self._image_changed(img_url)
+
+    def set_thumbnail_failed(self, img_url: str) -> None:
+        self._failed_images.add(img_url)
+        self._image_changed(img_url)
+
+    def _image_changed(self, img_url: str) -> None:
+        for row in self._rows_by_image.get(img_url, ()):
+            self.dataChanged.emit(self.index(row, COL_THUMBNAIL), self.index(row, COL_TITLE))
+
+
+class SearchResultsProxyModel(QSortFilterProxyModel):
+    """
+    Filters by title, case-insensitively. Sorting is forwarded to the source model, so the
+    proxy only maps the filtered rows and keeps the source order.
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setSortRole(SORT_ROLE)
+        self.setFilterKeyColumn(COL_TITLE)
+        self.setFilterCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        if self.sourceModel():
+            self.sourceModel().sort(column, order)
+
+
+class ThumbnailDelegate(QStyledItemDelegate):
+    """Paints the thumbnail pixmap centered in its cell, falling back to the status text."""
+    def __init__(self, thumbnail_size: QSize, parent=None):
+        super().__init__(parent)
+        self.thumbnail_size = thumbnail_size
+
+    def paint(self, painter, option, index):
+        pixmap = index.data(Qt.ItemDataRole.DecorationRole)
+        if not isinstance(pixmap, QPixmap) or pixmap.isNull():
+            super().paint(painter, option, index)
+            return
+
+        # Let the style draw background and selection, then the pixmap on top
+        opt = QStyleOptionViewItem(option)
+        self.initStyleOption(opt, index)
+        opt.text = ""
+        opt.icon = QIcon()
+        opt.features &= ~QStyleOptionViewItem.ViewItemFeature.HasDecoration
+        style = opt.widget.style() if opt.widget else QApplication.style()
+        style.drawControl(QStyle.ControlElement.CE_ItemViewItem, opt, painter, opt.widget)
+
+        target = QRect(0, 0, int(pixmap.width() / pixmap.devicePixelRatio()),
+                       int(pixmap.height() / pixmap.devicePixelRatio()))
+        target.moveCenter(option.rect.center())
+        painter.drawPixmap(target, pixmap)
+
+    def sizeHint(self, option, index):
+        return self.thumbnail_size + QSize(10, 10)
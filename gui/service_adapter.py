@@ -0,0 +1,32 @@
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from downloader.anime_service import AnimeService
+
+
+class QtAnimeService(QObject):
+    """
+    Wraps the Qt-free AnimeService and re-emits its events as Qt signals.
+    Every other attribute is delegated to the wrapped service.
+    """
+    download_completed_signal = pyqtSignal(str)  # Emits the anime title when download completes
+    episode_completed_signal = pyqtSignal(str, int, bool, str)  # (title, episode_number, succeeded, quality), in episode order
+    search_refreshed_signal = pyqtSignal(str, list)  # (keyword, results) after a background search refresh
+    job_started_signal = pyqtSignal(int, str, int, int)  # (job_id, title, episode_count, episodes_done)
+
+    def __init__(self, service=None, parent=None):
+        super().__init__(parent)
+        self._service = service if service is not None else AnimeService()
+        self._service.download_completed.connect(self.download_completed_signal.emit)
+        self._service.episode_completed.connect(self.episode_completed_signal.emit)
+        self._service.search_refreshed.connect(self.search_refreshed_signal.emit)
+        self._service.job_started.connect(self.job_started_signal.emit)
+
+    @property
+    def service(self) -> AnimeService:
+        return self._service
+
+    def __getattr__(self, name):
+        # Only called for attributes not found on the adapter itself
+        if name == "_service":
+            raise AttributeError(name)
+        return getattr(self._service, name)
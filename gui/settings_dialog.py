@@ -18,6 +18,10 @@ KEY_DEFAULT_LANGUAGE = "general/defaultLanguage"
 KEY_DEFAULT_QUALITY = "general/defaultQuality"
 KEY_FFMPEG_PATH = "downloads/ffmpegPath"
 KEY_DOWNLOAD_RETRIES = "downloads/downloadRetries"
+KEY_FRAGMENT_CONCURRENCY = "downloads/fragmentConcurrency"
+KEY_ADAPTIVE_FRAGMENTS = "downloads/adaptiveFragments"
+KEY_CONCURRENT_EPISODES = "downloads/concurrentEpisodes"
+KEY_BANDWIDTH_LIMIT = "downloads/bandwidthLimitKiB" # 0 = unlimited
 # Add new keys for interface settings
 KEY_APP_STYLE = "interface/appStyle"
 KEY_CUSTOM_QSS_THEME = "interface/customQssTheme"
@@ -65,6 +69,7 @@ class SettingsDialog(QDialog):
         self.ui.browse_ffmpeg_path_btn.clicked.connect(self._browse_ffmpeg_path)
         self.ui.recheck_ffmpeg_btn.clicked.connect(self._recheck_ffmpeg)
         self.ui.clear_image_cache_btn.clicked.connect(self._clear_image_cache)
+        self.ui.clear_search_cache_btn.clicked.connect(self._clear_search_cache)
         self.ui.reset_settings_btn.clicked.connect(self._reset_all_settings)
 
         self.ui.button_box.button(QDialogButtonBox.StandardButton.Ok).clicked.connect(self.accept)
@@ -93,6 +98,10 @@ class SettingsDialog(QDialog):
         # Downloads
         self.ui.ffmpeg_path_edit.setText(self.settings.value(KEY_FFMPEG_PATH, "", type=str))
         self.ui.download_retries_spinbox.setValue(self.settings.value(KEY_DOWNLOAD_RETRIES, 10, type=int))
+        self.ui.fragment_concurrency_spinbox.setValue(self.settings.value(KEY_FRAGMENT_CONCURRENCY, 4, type=int))
+        self.ui.adaptive_fragments_checkbox.setChecked(self.settings.value(KEY_ADAPTIVE_FRAGMENTS, True, type=bool))
+        self.ui.concurrent_episodes_spinbox.setValue(self.settings.value(KEY_CONCURRENT_EPISODES, 1, type=int))
+        self.ui.bandwidth_limit_spinbox.setValue(self.settings.value(KEY_BANDWIDTH_LIMIT, 0, type=int))
 
         # Interface Settings
         current_app_style = self.settings.value(KEY_APP_STYLE, "Default (OS)", type=str)
@@ -123,6 +132,10 @@ class SettingsDialog(QDialog):
         # Downloads
         self.settings.setValue(KEY_FFMPEG_PATH, self.ui.ffmpeg_path_edit.text())
         self.settings.setValue(KEY_DOWNLOAD_RETRIES, self.ui.download_retries_spinbox.value())
+        self.settings.setValue(KEY_FRAGMENT_CONCURRENCY, self.ui.fragment_concurrency_spinbox.value())
+        self.settings.setValue(KEY_ADAPTIVE_FRAGMENTS, self.ui.adaptive_fragments_checkbox.isChecked())
+        self.settings.setValue(KEY_CONCURRENT_EPISODES, self.ui.concurrent_episodes_spinbox.value())
+        self.settings.setValue(KEY_BANDWIDTH_LIMIT, self.ui.bandwidth_limit_spinbox.value())
 
         # Interface Settings
         self.settings.setValue(KEY_APP_STYLE, self.ui.app_style_combo.currentText())
@@ -182,7 +195,26 @@ class SettingsDialog(QDialog):
 
     def _clear_image_cache(self):
         QPixmapCache.clear()
-        QMessageBox.information(self, "Image Cache", "Image cache has been cleared.")
+        # The main window also keeps scaled thumbnails and HTTP responses on disk
+        thumbnail_cache = getattr(self.parent(), "thumbnail_cache", None)
+        if thumbnail_cache:
+            thumbnail_cache.clear()
+        http_disk_cache = getattr(self.parent(), "http_disk_cache", None)
+        if http_disk_cache:
+            http_disk_cache.clear()
+        QMessageBox.information(self, "Image Cache", "Image cache has been cleared (memory and disk).")
+
+    def _clear_search_cache(self):
+        if not self.anime_service:
+            return
+        stats = self.anime_service.search_cache_stats()
+        self.anime_service.invalidate_search_cache()
+        QMessageBox.information(
+            self, "Search Cache",
+            f"Search cache has been cleared ({stats['size']} entries).\n"
+            f"Hit rate this session: {stats['hit_rate']:.0%} "
+            f"({stats['hits']} fresh, {stats['stale_hits']} stale, {stats['misses']} misses)."
+        )
 
     def _reset_all_settings(self):
         reply = QMessageBox.warning(
@@ -196,6 +228,8 @@ class SettingsDialog(QDialog):
             keys_to_reset = [
                 KEY_DEFAULT_DOWNLOAD_PATH, KEY_DEFAULT_LANGUAGE, KEY_DEFAULT_QUALITY,
                 KEY_FFMPEG_PATH, KEY_DOWNLOAD_RETRIES,
+                KEY_FRAGMENT_CONCURRENCY, KEY_ADAPTIVE_FRAGMENTS,
+                KEY_CONCURRENT_EPISODES, KEY_BANDWIDTH_LIMIT,
                 KEY_APP_STYLE, KEY_CUSTOM_QSS_THEME,
                 "last_language", "last_quality", "last_download_path", "log_visible",
                 "window_geometry"
@@ -0,0 +1,134 @@
+import hashlib
+import logging
+import os
+import threading
+
+from PyQt6.QtCore import QSize, QStandardPaths
+from PyQt6.QtGui import QImage, QPixmap
+
+
+def default_cache_dir() -> str:
+    root = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.CacheLocation)
+    if not root:
+        root = os.path.join(os.path.expanduser("~"), ".cache", "hianime-downloader")
+    return root
+
+
+class ThumbnailDiskCache:
+    """
+    Content-addressed disk cache of thumbnails already scaled to the table's thumbnail size.
+
+    Files are named after sha256(url + size) and stored as PNG. The total size is capped at
+    max_bytes; the least recently used files (by mtime, refreshed on every hit) are evicted first.
+    store() is called from decoding threads with a QImage; load() returns a QPixmap and so
+    belongs on the GUI thread. Write errors go to logger.
+    """
+    FORMAT = "PNG"
+
+    def __init__(self, directory: str, size: QSize, max_bytes: int = 50 * 1024 * 1024, logger=None) -> None:
+        self.directory = directory
+        self.size = size
+        self.max_bytes = max_bytes
+        self.logger = logger or logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._files = None  # path -> (mtime, bytes), loaded on first use
+        self._total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, url: str) -> str:
+        key = hashlib.sha256(f"{url}@{self.size.width()}x{self.size.height()}".encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, key[:2], f"{key}.png")
+
+    def _load_index(self) -> None:
+        # Caller holds the lock
+        if self._files is not None:
+            return
+        self._files = {}
+        self._total_bytes = 0
+        if not os.path.isdir(self.directory):
+            return
+        for root, _dirs, names in os.walk(self.directory):
+            for name in names:
+                if not name.endswith(".png"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                self._files[path] = (stat.st_mtime, stat.st_size)
+                self._total_bytes += stat.st_size
+
+    def load(self, url: str) -> QPixmap | None:
+        path = self._path(url)
+        pixmap = QPixmap()
+        if not os.path.exists(path) or not pixmap.load(path, self.FORMAT):
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        try:
+            os.utime(path)  # Mark as recently used
+            with self._lock:
+                if self._files is not None and path in self._files:
+                    self._files[path] = (os.stat(path).st_mtime, self._files[path][1])
+        except OSError:
+            pass
+        return pixmap
+
+    def store(self, url: str, image: QImage) -> None:
+        path = self._path(url)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"  # Unique per writing thread
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            if not image.save(tmp_path, self.FORMAT):
+                raise OSError(f"could not save {self.FORMAT} to {tmp_path}")
+            os.replace(tmp_path, path)
+            stat = os.stat(path)
+        except OSError as e:
+            self.logger.warning(f"Could not write thumbnail cache: {e}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return
+
+        with self._lock:
+            self._load_index()
+            previous = self._files.get(path)
+            if previous:
+                self._total_bytes -= previous[1]
+            self._files[path] = (stat.st_mtime, stat.st_size)
+            self._total_bytes += stat.st_size
+            self._evict()
+
+    def _evict(self) -> None:
+        # Caller holds the lock
+        if self._total_bytes <= self.max_bytes:
+            return
+        for path, (_mtime, size) in sorted(self._files.items(), key=lambda item: item[1][0]):
+            if self._total_bytes <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            del self._files[path]
+            self._total_bytes -= size
+
+    def total_bytes(self) -> int:
+        with self._lock:
+            self._load_index()
+            return self._total_bytes
+
+    def clear(self) -> None:
+        with self._lock:
+            self._load_index()
+            for path in list(self._files):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            self._files.clear()
+            self._total_bytes = 0
@@ -0,0 +1,130 @@
+from collections import OrderedDict
+
+from PyQt6.QtCore import QObject, QRunnable, QSize, Qt, QThreadPool, QUrl, pyqtSignal
+from PyQt6.QtGui import QImage
+from PyQt6.QtNetwork import QNetworkAccessManager, QNetworkReply, QNetworkRequest
+
+
+class _DecodeSignals(QObject):
+    finished = pyqtSignal(int, str, QImage)  # (generation, url, scaled image; null on failure)
+
+
+class _DecodeTask(QRunnable):
+    """Decodes and scales downloaded image data on a pool thread, then writes it to the disk cache."""
+    def __init__(self, generation, url, data, size, disk_cache, signals):
+        super().__init__()
+        self.generation = generation
+        self.url = url
+        self.data = data
+        self.size = size
+        self.disk_cache = disk_cache
+        self.signals = signals
+
+    def run(self):
+        image = QImage()
+        if image.loadFromData(self.data):
+            image = image.scaled(self.size, Qt.AspectRatioMode.KeepAspectRatio,
+                                 Qt.TransformationMode.SmoothTransformation)
+            if self.disk_cache:
+                self.disk_cache.store(self.url, image)
+        self.signals.finished.emit(self.generation, self.url, image)
+
+
+class ThumbnailLoader(QObject):
+    """
+    Fetches search table thumbnails with at most max_in_flight requests at a time.
+
+    Queued URLs that are currently visible (see set_visible) are fetched first. Every
+    reset() starts a new generation: queued URLs are dropped, in-flight replies aborted,
+    and late results from older generations are ignored. Images are decoded and scaled
+    on a thread pool and delivered as QImage through thumbnail_ready.
+    """
+    thumbnail_ready = pyqtSignal(str, QImage)   # (url, scaled image)
+    thumbnail_failed = pyqtSignal(str, str)     # (url, error message)
+
+    def __init__(self, network_manager: QNetworkAccessManager, size: QSize, disk_cache=None,
+                 max_in_flight: int = 6, parent=None):
+        super().__init__(parent)
+        self.network_manager = network_manager
+        self.size = size
+        self.disk_cache = disk_cache
+        self.max_in_flight = max_in_flight
+        self._generation = 0
+        self._pending = OrderedDict()  # url -> None, in request order
+        self._visible = set()
+        self._in_flight = {}  # QNetworkReply -> (generation, url)
+        self._decoding = set()  # urls being decoded for the current generation
+        self._thread_pool = QThreadPool(self)
+        self._thread_pool.setMaxThreadCount(2)
+        self._decode_signals = _DecodeSignals(self)
+        self._decode_signals.finished.connect(self._handle_decoded)
+
+    def request(self, url: str) -> None:
+        if not url or url in self._pending or url in self._decoding:
+            return
+        if any(pending_url == url for _gen, pending_url in self._in_flight.values()):
+            return
+        self._pending[url] = None
+        self._pump()
+
+    def set_visible(self, urls) -> None:
+        """Marks the URLs of the rows currently in the viewport; they jump the queue."""
+        self._visible = set(urls)
+        self._pump()
+
+    def reset(self) -> None:
+        """Drops every queued and in-flight request, e.g. when a new search replaces the table."""
+        self._generation += 1
+        self._pending.clear()
+        self._visible.clear()
+        self._decoding.clear()
+        for reply in list(self._in_flight):
+            reply.abort()  # finished() still fires; _handle_reply discards it
+
+    def is_idle(self) -> bool:
+        return not (self._pending or self._in_flight or self._decoding)
+
+    def _next_url(self) -> str:
+        for url in self._pending:
+            if url in self._visible:
+                break
+        else:
+            url = next(iter(self._pending))
+        del self._pending[url]
+        return url
+
+    def _pump(self) -> None:
+        while self._pending and len(self._in_flight) < self.max_in_flight:
+            url = self._next_url()
+            request = QNetworkRequest(QUrl(url))
+            request.setAttribute(QNetworkRequest.Attribute.CacheLoadControlAttribute,
+                                 QNetworkRequest.CacheLoadControl.PreferCache)
+            reply = self.network_manager.get(request)
+            self._in_flight[reply] = (self._generation, url)
+            reply.finished.connect(self._handle_reply)
+
+    def _handle_reply(self):
+        reply = self.sender()
+        generation, url = self._in_flight.pop(reply, (None, None))
+        try:
+            if generation != self._generation:
+                return  # Aborted or from a previous search
+            if reply.error() != QNetworkReply.NetworkError.NoError:
+                self.thumbnail_failed.emit(url, reply.errorString())
+                return
+            self._decoding.add(url)
+            self._thread_pool.start(_DecodeTask(
+                generation, url, bytes(reply.readAll()), self.size, self.disk_cache, self._decode_signals
+            ))
+        finally:
+            reply.deleteLater()
+            self._pump()
+
+    def _handle_decoded(self, generation: int, url: str, image: QImage):
+        if generation != self._generation:
+            return
+        self._decoding.discard(url)
+        if image.isNull():
+            self.thumbnail_failed.emit(url, "Could not load image data")
+        else:
+            self.thumbnail_ready.emit(url, image)
@@ -1,5 +1,5 @@
 from PyQt6.QtWidgets import (QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, 
-                             QTextEdit, QPushButton, QTableWidget, QComboBox, 
+                             QTextEdit, QPushButton, QTableView, QComboBox, 
                              QSpinBox, QSpacerItem, QSizePolicy, QProgressBar, 
                              QHeaderView) # Ensure all used widgets are imported
 from PyQt6.QtGui import QFont
@@ -31,24 +31,32 @@ class UiMainWindow(object):
         MainWindow_instance.main_layout.addLayout(filter_hbox)
 
         # --- Results Table ---
-        MainWindow_instance.search_results_table = QTableWidget()
+        MainWindow_instance.search_results_table = QTableView()
         # MainWindow_instance.table_thumbnail_size is an attribute set by the controller (AnimeDownloaderWindow)
         if hasattr(MainWindow_instance, 'table_thumbnail_size'):
              MainWindow_instance.search_results_table.setIconSize(MainWindow_instance.table_thumbnail_size)
         else: # Fallback
              MainWindow_instance.search_results_table.setIconSize(QSize(80,120)) # Example default
         
-        MainWindow_instance.search_results_table.setColumnCount(4)
-        # Header labels set in retranslateUi or controller if dynamic
-        MainWindow_instance.search_results_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
-        MainWindow_instance.search_results_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        # The model (and its header labels) comes from the controller; columns must exist
+        # before the header resize modes below are applied
+        if hasattr(MainWindow_instance, 'search_results_proxy'):
+             MainWindow_instance.search_results_table.setModel(MainWindow_instance.search_results_proxy)
+        if hasattr(MainWindow_instance, 'thumbnail_delegate'):
+             MainWindow_instance.search_results_table.setItemDelegateForColumn(0, MainWindow_instance.thumbnail_delegate)
+        MainWindow_instance.search_results_table.verticalHeader().setDefaultSectionSize(
+            MainWindow_instance.search_results_table.iconSize().height() + 10)
+        MainWindow_instance.search_results_table.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
+        MainWindow_instance.search_results_table.setSelectionMode(QTableView.SelectionMode.SingleSelection)
+        MainWindow_instance.search_results_table.setEditTriggers(QTableView.EditTrigger.NoEditTriggers)
         MainWindow_instance.search_results_table.setAlternatingRowColors(True)
         MainWindow_instance.search_results_table.setSortingEnabled(True)
         MainWindow_instance.search_results_table.verticalHeader().setVisible(False)
         MainWindow_instance.search_results_table.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
 
         header = MainWindow_instance.search_results_table.horizontalHeader()
-        header.setSectionResizeMode(0, QHeaderView.ResizeMode.ResizeToContents) # Thumbnail
+        header.setSectionResizeMode(0, QHeaderView.ResizeMode.Fixed)           # Thumbnail (sized by the delegate)
+        header.resizeSection(0, MainWindow_instance.search_results_table.iconSize().width() + 10)
         header.setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)         # Title
         header.setSectionResizeMode(2, QHeaderView.ResizeMode.Interactive)     # Sub
         header.setSectionResizeMode(3, QHeaderView.ResizeMode.Interactive)     # Dub
@@ -156,13 +164,7 @@ class UiMainWindow(object):
         MainWindow_instance.filter_label.setText(_translate("AnimeDownloaderWindow", "Filter:"))
         MainWindow_instance.filter_input.setPlaceholderText(_translate("AnimeDownloaderWindow", "Filter results by title..."))
 
-        # Results Table Headers
-        MainWindow_instance.search_results_table.setHorizontalHeaderLabels([
-            _translate("AnimeDownloaderWindow", "Thumbnail"),
-            _translate("AnimeDownloaderWindow", "Title  "), # Extra spaces for sort arrow
-            _translate("AnimeDownloaderWindow", "Sub Eps  "),
-            _translate("AnimeDownloaderWindow", "Dub Eps  ")
-        ])
+        # Results table headers are provided by SearchResultsModel.headerData
         
         # Download Options
         MainWindow_instance.lang_label.setText(_translate("AnimeDownloaderWindow", "Language:"))
@@ -1,6 +1,6 @@
 from PyQt6.QtWidgets import (
     QVBoxLayout, QHBoxLayout, QTabWidget, QWidget, QLabel,QLineEdit,
-    QPushButton, QComboBox, QSpinBox, QDialogButtonBox, QFormLayout
+    QPushButton, QComboBox, QSpinBox, QDialogButtonBox, QFormLayout, QCheckBox
 )
 from PyQt6.QtCore import Qt, QCoreApplication
 
@@ -60,6 +60,31 @@ class Ui_SettingsDialog(object):
         self.download_retries_spinbox.setRange(1, 100)
         self.download_retries_spinbox.setValue(10)
         downloads_layout.addRow(self.download_retries_label, self.download_retries_spinbox)
+
+        self.fragment_concurrency_label = QLabel(QCoreApplication.translate("SettingsDialogInstance", "Parallel Fragments per Episode:"))
+        self.fragment_concurrency_spinbox = QSpinBox()
+        self.fragment_concurrency_spinbox.setRange(1, 16)
+        self.fragment_concurrency_spinbox.setValue(4)
+        downloads_layout.addRow(self.fragment_concurrency_label, self.fragment_concurrency_spinbox)
+
+        self.adaptive_fragments_checkbox = QCheckBox(QCoreApplication.translate("SettingsDialogInstance", "Tune fragment parallelism automatically (up to the value above)"))
+        self.adaptive_fragments_checkbox.setChecked(True)
+        downloads_layout.addRow(self.adaptive_fragments_checkbox)
+
+        self.concurrent_episodes_label = QLabel(QCoreApplication.translate("SettingsDialogInstance", "Concurrent Episodes:"))
+        self.concurrent_episodes_spinbox = QSpinBox()
+        self.concurrent_episodes_spinbox.setRange(1, 8)
+        self.concurrent_episodes_spinbox.setValue(1)
+        downloads_layout.addRow(self.concurrent_episodes_label, self.concurrent_episodes_spinbox)
+
+        self.bandwidth_limit_label = QLabel(QCoreApplication.translate("SettingsDialogInstance", "Bandwidth Limit:"))
+        self.bandwidth_limit_spinbox = QSpinBox()
+        self.bandwidth_limit_spinbox.setRange(0, 1000000)
+        self.bandwidth_limit_spinbox.setSingleStep(512)
+        self.bandwidth_limit_spinbox.setSuffix(" KiB/s")
+        self.bandwidth_limit_spinbox.setSpecialValueText(QCoreApplication.translate("SettingsDialogInstance", "Unlimited"))
+        self.bandwidth_limit_spinbox.setValue(0)
+        downloads_layout.addRow(self.bandwidth_limit_label, self.bandwidth_limit_spinbox)
         
         # --- Interface Tab --- (ON HOLD - Commented out or removed) ---
         self.interface_tab = QWidget()
@@ -88,6 +113,9 @@ class Ui_SettingsDialog(object):
         self.clear_image_cache_btn = QPushButton(QCoreApplication.translate("SettingsDialogInstance", "Clear Image Cache"))
         maintenance_layout.addWidget(self.clear_image_cache_btn)
 
+        self.clear_search_cache_btn = QPushButton(QCoreApplication.translate("SettingsDialogInstance", "Clear Search Cache"))
+        maintenance_layout.addWidget(self.clear_search_cache_btn)
+
         self.reset_settings_btn = QPushButton(QCoreApplication.translate("SettingsDialogInstance", "Reset All Settings to Default"))
         maintenance_layout.addWidget(self.reset_settings_btn)
         maintenance_layout.addStretch()
@@ -110,6 +138,10 @@ class Ui_SettingsDialog(object):
         SettingsDialogInstance.browse_ffmpeg_path_btn = self.browse_ffmpeg_path_btn
         SettingsDialogInstance.recheck_ffmpeg_btn = self.recheck_ffmpeg_btn
         SettingsDialogInstance.download_retries_spinbox = self.download_retries_spinbox
+        SettingsDialogInstance.fragment_concurrency_spinbox = self.fragment_concurrency_spinbox
+        SettingsDialogInstance.adaptive_fragments_checkbox = self.adaptive_fragments_checkbox
+        SettingsDialogInstance.concurrent_episodes_spinbox = self.concurrent_episodes_spinbox
+        SettingsDialogInstance.bandwidth_limit_spinbox = self.bandwidth_limit_spinbox
         SettingsDialogInstance.clear_image_cache_btn = self.clear_image_cache_btn
         SettingsDialogInstance.reset_settings_btn = self.reset_settings_btn
         SettingsDialogInstance.button_box = self.button_box
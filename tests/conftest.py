@@ -0,0 +1,36 @@
+# tests/conftest.py
+import os
+import sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+EXTRACTOR_DIR = os.path.join(PROJECT_ROOT, "yt_dlp_plugins", "extractor")
+
+# hianime.py imports megacloud as a top-level module, so the tests do the same
+for path in (PROJECT_ROOT, EXTRACTOR_DIR):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+import pytest
+
+from benchmarks.mock_site import MockSite
+
+
+@pytest.fixture
+def mock_site(tmp_path, monkeypatch):
+    """
+    An offline HiAnime/Megacloud site (benchmarks.mock_site) with AnimeService's default
+    base URL and Megacloud pointed at it. XDG_CACHE_HOME is a temporary directory, so
+    cached episode lists and searches neither leak between tests nor into the user's caches.
+    """
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    with MockSite(max_episodes=3, segments=2, segment_size=4096) as site, site.patched():
+        yield site
+
+
+@pytest.fixture
+def ydl_opts():
+    """YoutubeDL options for tests: silent and without yt-dlp's disk cache."""
+    def make(**extra) -> dict:
+        return {"quiet": True, "no_warnings": True, "noprogress": True, "cachedir": False, **extra}
+
+    return make
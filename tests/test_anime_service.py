@@ -0,0 +1,60 @@
+# tests/test_anime_service.py
+import contextlib
+import logging
+
+from yt_dlp import YoutubeDL
+from yt_dlp.downloader.hls import HlsFD
+from yt_dlp.networking.exceptions import TransportError
+
+from downloader.anime_service import AnimeService, FragmentConcurrencyTuner, FragmentStats, _EpisodeLogger
+
+
+class FakeYoutubeDL:
+    def __init__(self) -> None:
+        self.params = {}
+        self.format_selector = None
+
+    def build_format_selector(self, format_id):
+        return format_id
+
+    def process_ie_result(self, info, download=True):
+        return {}  # No format_id, as for merged or URL results
+
+
+class FakePool:
+    """Hands out one shared instance and reconfigures it for the next episode on release."""
+
+    def __init__(self) -> None:
+        self.ydl = FakeYoutubeDL()
+
+    @contextlib.contextmanager
+    def checkout(self, opts):
+        self.ydl.params = dict(opts)
+        yield self.ydl
+        self.ydl.params["format"] = "reconfigured-by-another-episode"
+
+
+def test_download_resolved_reports_the_format_it_used():
+    service = AnimeService("https://hianime.to")
+    service._ydl_pool = FakePool()
+    info = {"formats": [{"format_id": "360p"}, {"format_id": "720p"}]}
+    opts = {"format": "1080p/720p/best"}
+    logger = logging.getLogger("test")
+
+    assert service._download_resolved(info, opts, "1080p", logger, "url") == "720p"
+    assert service._download_resolved({}, opts, "1080p", logger, "url") == "1080p/720p/best"
+
+
+def test_fragment_retries_reported_by_yt_dlp_lower_the_concurrency():
+    tuner = FragmentConcurrencyTuner(4)
+    stats = FragmentStats(tuner.level)
+    stats.fragments, stats.elapsed = 20, 2.0
+
+    with YoutubeDL({"logger": _EpisodeLogger(stats), "quiet": True}) as ydl:
+        fd = HlsFD(ydl, ydl.params)
+        for frag_index in (3, 7):
+            fd.report_retry(TransportError("Read timed out"), 1, 10, frag_index=frag_index)
+        fd.report_retry(TransportError("Read timed out"), 1, 10)  # Not a fragment
+
+    assert stats.retries == 2
+    assert tuner.record(stats) == 2  # 10% of fragments retried: halved
@@ -0,0 +1,81 @@
+# tests/test_bandwidth_budget.py
+import pytest
+
+from downloader.anime_service import BandwidthBudget, _OrderedCompletionReporter
+
+
+class FakeClock:
+    """time.monotonic and time.sleep for a budget, where sleeping advances the clock."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.slept = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+        self.slept += seconds
+
+
+def download(hook, total, block=100):
+    for done in range(0, total + 1, block):
+        hook({"status": "downloading", "downloaded_bytes": done})
+
+
+def test_budget_lets_a_burst_through_then_holds_to_the_rate():
+    clock = FakeClock()
+    budget = BandwidthBudget(1000, clock=clock, sleep=clock.sleep)
+
+    assert budget.consume(1000) == 0.0
+    assert budget.consume(500) == 0.5
+    clock.now += 2.0  # Idle: the bucket refills, but only up to its capacity
+    assert budget.consume(1500) == 0.5
+
+
+def test_a_lone_episode_gets_the_whole_budget():
+    clock = FakeClock()
+    budget = BandwidthBudget(1000, clock=clock, sleep=clock.sleep)
+
+    download(budget.progress_hook(), 3000)
+    # 1000 bytes of burst, then 2000 bytes at the full rate rather than a per-worker share
+    assert clock.now == pytest.approx(2.0)
+
+
+def test_episodes_share_the_budget():
+    clock = FakeClock()
+    budget = BandwidthBudget(1000, clock=clock, sleep=clock.sleep)
+    first, second = budget.progress_hook(), budget.progress_hook()
+
+    for done in range(0, 1501, 100):
+        first({"status": "downloading", "downloaded_bytes": done})
+        second({"status": "downloading", "downloaded_bytes": done})
+    assert clock.now == pytest.approx(2.0)  # 3000 bytes between them, as for one episode
+
+
+def test_progress_hook_only_charges_new_bytes():
+    clock = FakeClock()
+    budget = BandwidthBudget(100, clock=clock, sleep=clock.sleep)
+    hook = budget.progress_hook()
+
+    hook({"status": "downloading", "downloaded_bytes": 10_000})  # Resumed from disk
+    hook({"status": "downloading", "downloaded_bytes": 10_050})
+    hook({"status": "downloading", "downloaded_bytes": 10_050})
+    hook({"status": "finished", "downloaded_bytes": 20_000})
+    assert clock.slept == 0.0
+
+
+def test_reporter_emits_completions_in_episode_order():
+    reported = []
+    reporter = _OrderedCompletionReporter([3, 4, 5, 6], lambda *args: reported.append(args))
+
+    reporter.complete(5, True, "720p")
+    reporter.complete(4, False)
+    assert reported == []  # Still waiting for episode 3
+
+    reporter.complete(3, True, "1080p")
+    assert reported == [(3, True, "1080p"), (4, False, ""), (5, True, "720p")]
+
+    reporter.complete(6, True, "360p")
+    assert reported[-1] == (6, True, "360p")
@@ -0,0 +1,60 @@
+# tests/test_cli.py
+import pytest
+
+from downloader import cli
+from downloader.anime_service import AnimeService
+from downloader.job_queue import JobQueue
+
+SERIES = "https://hianime.to/watch/frieren-18542"
+OTHER = "https://hianime.to/watch/one-piece-100"
+
+
+@pytest.fixture
+def downloads(monkeypatch):
+    """Replaces the actual download with one that marks every episode of the job done."""
+    calls = []
+
+    def download_anime(self, title, url, lang, quality, start_ep, end_ep, base_download_dir,
+                       job_queue=None, job_id=None, **kwargs):
+        calls.append(url)
+        job_queue.set_episodes(job_id, [(n, f"{url}?ep={n}") for n in range(start_ep, end_ep + 1)])
+        for n in range(start_ep, end_ep + 1):
+            job_queue.update_episode(job_id, n, JobQueue.DONE)
+
+    monkeypatch.setattr(AnimeService, "download_anime", download_anime)
+    return calls
+
+
+def add_leftover(db: str) -> int:
+    job_queue = JobQueue(db)
+    job_id = job_queue.add_job("One Piece", OTHER, "SUB", "1080p", 1, 2, "/tmp")
+    job_queue.close()
+    return job_id
+
+
+def test_download_runs_only_the_new_job(tmp_path, downloads):
+    db = str(tmp_path / "jobs.sqlite3")
+    leftover = add_leftover(db)
+
+    assert cli.main(["--db", db, "download", SERIES, "--end", "3", "-o", str(tmp_path), "--quiet"]) == 0
+    assert downloads == [SERIES]
+    assert JobQueue(db).job(leftover)["state"] == JobQueue.QUEUED
+
+
+def test_batch_runs_only_its_jobs(tmp_path, downloads):
+    db = str(tmp_path / "jobs.sqlite3")
+    add_leftover(db)
+    batch = tmp_path / "jobs.txt"
+    batch.write_text(f"# comment\n{SERIES} 1-2 dub\n\n{SERIES.replace('18542', '18543')} 5\n", encoding="utf-8")
+
+    assert cli.main(["--db", db, "batch", str(batch), "-o", str(tmp_path), "--quiet"]) == 0
+    assert downloads == [SERIES, SERIES.replace("18542", "18543")]
+
+
+def test_queue_resume_runs_every_unfinished_job(tmp_path, downloads):
+    db = str(tmp_path / "jobs.sqlite3")
+    add_leftover(db)
+
+    assert cli.main(["--db", db, "queue", "resume", "--quiet"]) == 0
+    assert downloads == [OTHER]
+    assert [job["state"] for job in JobQueue(db).jobs()] == [JobQueue.DONE]
@@ -0,0 +1,96 @@
+# tests/test_episode_index.py
+import logging
+
+import pytest
+
+from downloader.anime_service import AnimeService
+from downloader.episode_index import INDEX_FILENAME, EpisodeIndex
+from downloader.search_cache import SearchCache
+
+
+def write(path, size=1000):
+    path.write_bytes(b"x" * size)
+    return path
+
+
+def test_entries_survive_a_reload_while_their_files_are_unchanged(tmp_path):
+    video = write(tmp_path / "Show - Episode 1 - Pilot.mp4")
+    index = EpisodeIndex(str(tmp_path))
+    index.add(1, str(video), "https://hianime.to/watch/show-1?ep=101")
+
+    index = EpisodeIndex(str(tmp_path))
+    assert 1 in index and 2 not in index
+    assert index.get(1)["path"] == video.name
+    assert index.get(1)["url"] == "https://hianime.to/watch/show-1?ep=101"
+    assert index.verify(1)
+
+    write(video, 500)  # Truncated or replaced
+    assert 1 not in index and index.numbers() == []
+
+    index.remove(1)
+    assert EpisodeIndex(str(tmp_path)).numbers() == []
+
+
+def test_rescan_ignores_intermediate_files(tmp_path):
+    write(tmp_path / "Show - Episode 1 - Pilot.mp4")
+    write(tmp_path / "Show - Episode 2 - Second.temp.mp4")  # Post-processing in progress
+    write(tmp_path / "Show - Episode 3 - Third.f137.mp4")  # Format before merging
+    write(tmp_path / "Show - Episode 4 - Fourth.mp4.part")
+    write(tmp_path / "Show - Episode 5 - Fifth.en.vtt")
+    write(tmp_path / "Show - Episode 6 - Sixth.mkv", 2000)
+    write(tmp_path / "Show - Episode 6 - Sixth.mp4", 1000)
+
+    index = EpisodeIndex(str(tmp_path))
+    assert index.rescan() == 2
+    assert index.numbers() == [1, 6]
+    assert index.get(6)["path"] == "Show - Episode 6 - Sixth.mkv"  # The larger of the two
+
+
+def test_rescan_keeps_the_urls_of_unchanged_files(tmp_path):
+    video = write(tmp_path / "Show - Episode 1 - Pilot.mp4")
+    index = EpisodeIndex(str(tmp_path))
+    index.add(1, str(video), "https://hianime.to/watch/show-1?ep=101")
+
+    index.rescan()
+    assert index.get(1)["url"] == "https://hianime.to/watch/show-1?ep=101"
+
+
+def test_an_unreadable_index_is_logged_and_starts_empty(tmp_path, caplog):
+    (tmp_path / INDEX_FILENAME).write_text("{not json")
+
+    with caplog.at_level(logging.WARNING, logger="downloader.episode_index"):
+        assert EpisodeIndex(str(tmp_path)).numbers() == []
+    assert any(r.getMessage().startswith("Could not read episode index") for r in caplog.records)
+
+
+@pytest.fixture
+def service():
+    service = AnimeService("https://hianime.to", search_cache=SearchCache())
+    yield service
+    service.close()
+
+
+def test_downloaded_episodes_are_skipped_without_any_request(service, tmp_path):
+    series_dir = tmp_path / "Show"
+    series_dir.mkdir()
+    write(series_dir / "Show - Episode 1 - Pilot.mp4")
+    write(series_dir / "Show - Episode 2 - Second.mp4")
+    write(series_dir / "Show - Episode 3 - Third.temp.mp4")
+
+    def no_requests(*args, **kwargs):
+        raise AssertionError("an episode on disk was looked up")
+
+    completed = []
+    service.episode_completed.connect(lambda *args: completed.append(args))
+    service._expand_playlist = no_requests
+
+    # The directory has no index yet, so it is rebuilt from the file names first
+    assert service.download_anime("Show", "https://hianime.to/watch/show-1", "SUB", "720p", 1, 2, str(tmp_path),
+                                  gui_logger_callback=lambda message: None)
+    assert completed == [("Show", 1, True, ""), ("Show", 2, True, "")]
+    assert (series_dir / INDEX_FILENAME).exists()
+
+    # Episode 3 only has an intermediate file, so it still needs the playlist
+    with pytest.raises(AssertionError, match="looked up"):
+        service.download_anime("Show", "https://hianime.to/watch/show-1", "SUB", "720p", 1, 3, str(tmp_path),
+                               gui_logger_callback=lambda message: None)
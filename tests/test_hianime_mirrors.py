@@ -0,0 +1,26 @@
+# tests/test_hianime_mirrors.py
+from yt_dlp import YoutubeDL
+from yt_dlp.networking import Request
+
+
+def test_every_mirror_request_carries_the_mirror_timeout(mock_site, ydl_opts):
+    series = next(iter(mock_site.catalogue.values()))
+    url = f"{mock_site.series_url(series.id)}?ep={series.episode_id(1)}&lang=sub"
+    opts = ydl_opts(extractor_args={"hianime": {"mirror_timeout": ["7"], "mirror_mode": ["all"]}})
+
+    with YoutubeDL(opts) as ydl:
+        ie = ydl.get_info_extractor("HiAnime")
+        requests = []
+        download = ie._download_webpage_handle
+
+        def spy(url_or_request, *args, **kwargs):
+            requests.append(url_or_request)
+            return download(url_or_request, *args, **kwargs)
+
+        ie._download_webpage_handle = spy
+        info = ydl.extract_info(url, download=False, process=False)
+
+    m3u8 = [r for r in requests if isinstance(r, Request) and ".m3u8" in r.url]
+    assert len(m3u8) == 3  # One master playlist per mirror
+    assert all(r.extensions.get("timeout") == 7.0 for r in m3u8)
+    assert {f["format_id"] for f in info["formats"]} >= {"360p", "720p", "1080p"}
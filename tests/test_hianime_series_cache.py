@@ -0,0 +1,100 @@
+# tests/test_hianime_series_cache.py
+import json
+import types
+
+import pytest
+from yt_dlp import YoutubeDL
+
+from hianime import HiAnimeIE
+
+EPISODE = '<a class="ep-item" title="{title}" data-number="{number}" {data_id}href="/watch/show-100?ep={id}"></a>'
+
+
+def episode_list(*episodes, missing_id=()) -> str:
+    html = "".join(
+        EPISODE.format(title=title, number=n, id=100 * 10 + n,
+                       data_id="" if n in missing_id else f'data-id="{100 * 10 + n}" ')
+        for n, title in enumerate(episodes, 1)
+    )
+    return json.dumps({"status": True, "html": html})
+
+
+class FakeSite:
+    """Answers the extractor's page and episode-list requests with scripted bodies."""
+
+    def __init__(self, content: str, etag: str | None = '"v1"') -> None:
+        self.content = content
+        self.etag = etag
+        self.requests = []
+
+    def download_webpage(self, url, video_id, note=None, **kwargs):
+        self.requests.append(("page", url))
+        return '<h2 class="film-name dynamic-name">Show</h2>'
+
+    def download_webpage_handle(self, url, video_id, note=None, headers=None, **kwargs):
+        self.requests.append(("list", url, dict(headers or {})))
+        unchanged = self.etag is not None and (headers or {}).get("If-None-Match") == self.etag
+        handle = types.SimpleNamespace(status=304 if unchanged else 200,
+                                       headers={"ETag": self.etag} if self.etag else {})
+        return ("" if unchanged else self.content), handle
+
+
+@pytest.fixture
+def make_extractor(tmp_path, monkeypatch):
+    monkeypatch.setattr(HiAnimeIE, "_series_cache", {})
+
+    def make(site: FakeSite, base_url: str = "https://hianime.to", ttl: float | None = None):
+        args = {"hianime": {"episode_cache_ttl": [str(ttl)]}} if ttl is not None else {}
+        ydl = YoutubeDL({"quiet": True, "cachedir": str(tmp_path), "extractor_args": args})
+        ie = HiAnimeIE(ydl)
+        ie.base_url = base_url
+        ie._download_webpage = site.download_webpage
+        ie._download_webpage_handle = site.download_webpage_handle
+        return ie
+
+    return make
+
+
+def test_episodes_without_data_id_survive_the_disk_cache(make_extractor):
+    site = FakeSite(episode_list("One", "Two", "Three", missing_id={2}))
+    series = make_extractor(site)._get_series("show", "100")
+    assert series["order"] == ["1001", "1003"]
+
+    HiAnimeIE._series_cache.clear()
+    cached = make_extractor(site)._get_series("show", "100")
+    assert [cached["episodes"][ep_id]["title"] for ep_id in cached["order"]] == ["One", "Three"]
+    assert len(site.requests) == 2  # Second extractor read the disk cache
+
+
+def test_cache_is_keyed_by_host(make_extractor):
+    make_extractor(FakeSite(episode_list("One")))._get_series("show", "100")
+
+    HiAnimeIE._series_cache.clear()
+    other = FakeSite(episode_list("Uno", "Dos"))
+    series = make_extractor(other, base_url="http://127.0.0.1:8000")._get_series("show", "100")
+    assert [series["episodes"][ep_id]["title"] for ep_id in series["order"]] == ["Uno", "Dos"]
+    assert other.requests[-1] == ("list", "http://127.0.0.1:8000/ajax/v2/episode/list/100", {})
+
+
+def test_revalidation_trusts_only_304_or_etag(make_extractor):
+    site = FakeSite(episode_list("One", "Two"))
+    make_extractor(site)._get_series("show", "100")
+
+    # A new ETag with a body of the same length is a changed list
+    site.content, site.etag = episode_list("Uno", "Two"), '"v2"'
+    series = make_extractor(site, ttl=0)._get_series("show", "100")
+    assert series["episodes"]["1001"]["title"] == "Uno"
+    assert site.requests[-1][2] == {"If-None-Match": '"v1"'}
+
+    series = make_extractor(site, ttl=0)._get_series("show", "100")
+    assert series["episodes"]["1001"]["title"] == "Uno"
+    assert series["etag"] == '"v2"'
+
+
+def test_revalidation_without_etag_reparses(make_extractor):
+    site = FakeSite(episode_list("One", "Two"), etag=None)
+    make_extractor(site)._get_series("show", "100")
+
+    site.content = episode_list("Uno", "Dos")
+    series = make_extractor(site, ttl=0)._get_series("show", "100")
+    assert [series["episodes"][ep_id]["title"] for ep_id in series["order"]] == ["Uno", "Dos"]
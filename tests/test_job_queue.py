@@ -0,0 +1,69 @@
+# tests/test_job_queue.py
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from downloader.job_queue import JobQueue
+
+
+@pytest.fixture(params=[":memory:", "file"])
+def job_queue(request, tmp_path):
+    queue = JobQueue(":memory:" if request.param == ":memory:" else str(tmp_path / "jobs.sqlite3"), backoff=10)
+    yield queue
+    queue.close()
+
+
+def add(job_queue: JobQueue, title: str = "Frieren", episodes: int = 3) -> int:
+    return job_queue.add_job(title, f"https://hianime.to/watch/{title.lower()}-1", "SUB", "1080p",
+                             1, episodes, "/downloads", options={"concurrent_episodes": 2})
+
+
+def test_job_lifecycle(job_queue):
+    job_id = add(job_queue)
+    assert job_queue.job(job_id)["options"] == {"concurrent_episodes": 2}
+    assert job_queue.next_job()["id"] == job_id
+
+    job_queue.set_episodes(job_id, [(1, "u1"), (2, "u2"), (3, "u3")])
+    job_queue.update_episode(job_id, 1, JobQueue.DONE, filename="Ep 1.mp4")
+    job_queue.update_episode(job_id, 2, JobQueue.DOWNLOADING, downloaded_bytes=100)
+    job_queue.record_failure(job_id, 3, "HTTP Error 503")
+
+    assert job_queue.recover() == 1
+    states = {e["number"]: (e["state"], e["downloaded_bytes"]) for e in job_queue.episodes(job_id)}
+    assert states[2] == (JobQueue.QUEUED, 100)
+    assert [e["number"] for e in job_queue.runnable_episodes(job_id)] == [2]
+    retry_at = job_queue.next_retry_at(job_id)
+    assert [e["number"] for e in job_queue.runnable_episodes(job_id, now=retry_at)] == [2, 3]
+
+    job_queue.set_job_state(job_id, JobQueue.DONE)
+    assert job_queue.next_job() is None
+    assert job_queue.clear_finished() == 1
+    assert job_queue.job(job_id) is None
+
+
+def test_next_job_and_recover_respect_job_ids(job_queue):
+    first, second = add(job_queue, "First"), add(job_queue, "Second")
+    for job_id in (first, second):
+        job_queue.set_episodes(job_id, [(1, "u1")])
+        job_queue.update_episode(job_id, 1, JobQueue.DOWNLOADING)
+
+    assert job_queue.next_job([second])["id"] == second
+    assert job_queue.recover([second]) == 1
+    assert job_queue.episodes(first)[0]["state"] == JobQueue.DOWNLOADING
+
+
+def test_concurrent_use_from_threads(job_queue):
+    def worker(i):
+        job_id = add(job_queue, f"Series{i}", episodes=5)
+        job_queue.set_episodes(job_id, [(n, f"u{n}") for n in range(1, 6)])
+        for n in range(1, 6):
+            job_queue.update_episode(job_id, n, JobQueue.DONE)
+            job_queue.jobs(unfinished_only=True)
+        return job_id, len(job_queue.episodes(job_id)), job_queue.next_retry_at(job_id)
+
+    with ThreadPoolExecutor(8) as executor:
+        results = list(executor.map(worker, range(40)))
+
+    assert len({job_id for job_id, _, _ in results}) == 40
+    assert all(count == 5 and retry_at is None for _, count, retry_at in results)
+    assert len(job_queue.jobs()) == 40
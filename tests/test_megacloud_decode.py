@@ -0,0 +1,39 @@
+# tests/test_megacloud_decode.py
+import random
+import string
+
+import pytest
+
+from benchmarks.megacloud_decode import legacy_process_sources
+from megacloud import Megacloud
+
+PRINTABLE = [chr(c) for c in range(32, 127)]
+WIDE = ["é", "ß", "ü", "€", "ā", "你", " "]
+
+
+def random_case(rng: random.Random) -> tuple[list[str], str]:
+    alphabet = PRINTABLE + WIDE if rng.random() < 0.3 else PRINTABLE
+    payload = rng.choices(alphabet, k=rng.randint(0, 600))
+    key = "".join(rng.choices(string.printable.strip() + "éü", k=rng.randint(1, 80)))
+    return payload, key
+
+
+@pytest.mark.parametrize("bigint", [False, True])
+@pytest.mark.parametrize("seed", range(50))
+def test_matches_legacy_decoder(seed, bigint):
+    rng = random.Random(seed)
+    mc = Megacloud("")
+    mc.BIGINT_NUMBERS = bigint
+
+    for _ in range(8):
+        payload, key = random_case(rng)
+        expected = legacy_process_sources(mc, payload, key)
+        assert mc._process_sources(payload, key) == expected
+        assert mc._process_sources("".join(payload), key) == expected
+
+
+def test_drops_the_partial_last_row():
+    mc = Megacloud("")
+    payload = list("abcdefghij")
+    assert len(mc._process_sources(payload, "xyz")) == 9
+    assert mc._process_sources(payload, "k" * 11) == []
@@ -0,0 +1,42 @@
+# tests/test_megacloud_ops.py
+import itertools
+
+import pytest
+
+from megacloud import Megacloud, compile_operation
+
+EXPRESSIONS = [
+    "args[0] + args[1]", "args[0] - args[1] * args[2]", "(args[0] ^ args[1]) - args[2]",
+    "args[0] % args[1]", "args[0] // args[1]", "args[0] / args[1]", "args[0] ** 2",
+    "args[0] << (args[1] & 31)", "-args[0] >> (args[1] & 31)", "~args[0] | args[1]",
+    "int(float(args[0]) * float(args[1]))",
+    "args[0] > args[1]", "args[0] == args[1]", "args[0] != args[1]", "args[0] <= args[1] < args[2]",
+    "args[0] >= args[1] and args[2]", "args[0] or args[1]", "not args[0]",
+    "args[0] if args[0] > args[1] else args[1]", "(args[0] > args[1]) + args[2]",
+]
+ARGS = list(itertools.product([0, 1, 7, 255], [1, 3, 31], [2, 64]))
+
+
+@pytest.mark.parametrize("expression", EXPRESSIONS)
+def test_compiled_matches_eval(expression):
+    func = compile_operation(expression)
+    for args in ARGS:
+        assert func(*args) == eval(expression, {"args": args}), args
+
+
+@pytest.mark.parametrize("expression", [
+    "__import__('os')", "args.__class__", "open('x')", "[a for a in args]", "lambda: 1",
+    "args[0] if print() else 1", "'a' + 'b'", "(x := args[0])",
+])
+def test_rejects_anything_else(expression):
+    with pytest.raises(ValueError):
+        compile_operation(expression)
+
+
+def test_generated_ops_match_legacy_eval():
+    mc = Megacloud("")
+    for operation in ["aa[0] + aa[1]", "(aa[0] * aa[1]) + aa[2]", "aa[0] >> aa[1]", "aa[0] > aa[1]"]:
+        legacy = mc._convert_to_js_operation(operation.replace("aa", "args"))
+        func = mc._generate_op_func(operation)
+        for args in ARGS:
+            assert func(*args) == eval(legacy, {"args": args})
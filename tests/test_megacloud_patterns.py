@@ -0,0 +1,28 @@
+# tests/test_megacloud_patterns.py
+from concurrent.futures import ThreadPoolExecutor
+
+from megacloud import Patterns, _re
+
+
+def test_fmt_does_not_leak_between_calls():
+    a = Patterns.VAR.fmt(name="a$")
+    b = Patterns.VAR.fmt(name="b")
+
+    assert _re(a, "x;a$=1;b=2;").group(1) == "1"
+    assert _re(b, "x;a$=1;b=2;").group(1) == "2"
+    assert Patterns.VAR.formatted == Patterns.VAR.value
+
+
+def test_fmt_is_safe_across_threads():
+    script = ";".join(f"v{i}={i}" for i in range(200)) + ";"
+
+    def lookup(i):
+        return _re(Patterns.VAR.fmt(name=f"v{i}"), script).group(1)
+
+    with ThreadPoolExecutor(8) as executor:
+        assert list(executor.map(lookup, range(200))) == [str(i) for i in range(200)]
+
+
+def test_fragments_are_not_compiled_but_patterns_are():
+    assert Patterns.CLIENT_KEY.compiled.pattern == Patterns.CLIENT_KEY.value
+    assert _re(Patterns.SOURCE_ID, "/embed-2/v3/e-1/AbC123?k=1").group(1) == "AbC123"
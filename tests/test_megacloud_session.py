@@ -0,0 +1,143 @@
+# tests/test_megacloud_session.py
+import threading
+import types
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests
+
+import megacloud
+from megacloud import HTTP2Transport, SessionPool, configure_session_pool, get_session_pool
+
+
+class FakeHttpxResponse:
+    def __init__(self, status_code: int, body: str = "{}") -> None:
+        self.status_code = status_code
+        self.text = body
+        self.url = "https://megacloud.example/embed-2/v3/e-1/getSources"
+        self.closed = False
+
+    def json(self):
+        return {"sources": []}
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class FakeHttpxClient:
+    def __init__(self, statuses) -> None:
+        self.statuses = list(statuses)
+        self.responses = []
+
+    def get(self, url, headers, params, timeout):
+        status = self.statuses.pop(0)
+        if status is None:
+            raise FakeHttpxError("connection reset")
+        resp = FakeHttpxResponse(status)
+        self.responses.append(resp)
+        return resp
+
+    def close(self) -> None:
+        pass
+
+
+class FakeHttpxError(Exception):
+    pass
+
+
+def fake_transport(statuses):
+    # HTTP2Transport with its httpx client swapped for a scripted one (httpx is optional)
+    class Transport(HTTP2Transport):
+        def __init__(self, pool_size: int) -> None:
+            self._httpx = types.SimpleNamespace(HTTPError=FakeHttpxError)
+            self.client = FakeHttpxClient(statuses)
+
+    return Transport
+
+
+def test_http2_retries_5xx_and_closes_the_discarded_response():
+    pool = SessionPool(retries=3, backoff_factor=0, transport=fake_transport([503, 502, 200]))
+
+    with pool.get("https://megacloud.example/getSources", {}, {}) as resp:
+        assert resp.status_code == 200
+        assert resp.json() == {"sources": []}
+
+    responses = pool.transport.client.responses
+    assert [r.status_code for r in responses] == [503, 502, 200]
+    assert all(r.closed for r in responses)
+    assert pool.stats()["megacloud.example"]["requests"] == 3
+
+
+def test_http2_returns_the_last_5xx_when_retries_run_out():
+    pool = SessionPool(retries=1, backoff_factor=0, transport=fake_transport([500, 500]))
+
+    resp = pool.get("https://megacloud.example/getSources", {}, {})
+    assert resp.status_code == 500
+    with pytest.raises(requests.exceptions.HTTPError):
+        resp.raise_for_status()
+    assert pool.transport.client.responses[0].closed
+
+
+def test_http2_connection_errors_are_retried_as_requests_errors():
+    pool = SessionPool(retries=1, backoff_factor=0, transport=fake_transport([None, 200]))
+    assert pool.get("https://megacloud.example/getSources", {}, {}).status_code == 200
+
+    pool = SessionPool(retries=1, backoff_factor=0, transport=fake_transport([None, None]))
+    with pytest.raises(requests.exceptions.ConnectionError):
+        pool.get("https://megacloud.example/getSources", {}, {})
+
+
+class BlockingTransport:
+    """Holds every request until released; records whether it was closed while one ran."""
+
+    def __init__(self, pool_size: int) -> None:
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.in_flight = 0
+        self.closed = False
+        self.closed_under_request = False
+
+    def get(self, url, headers, params, timeout):
+        self.in_flight += 1
+        self.started.set()
+        self.release.wait(5)
+        self.in_flight -= 1
+        return FakeHttpxResponse(200)
+
+    def close(self) -> None:
+        self.closed_under_request = self.closed_under_request or self.in_flight > 0
+        self.closed = True
+
+
+@pytest.fixture
+def restore_session_pool(monkeypatch):
+    # Start from no shared pool so the one other tests use is neither replaced nor closed
+    monkeypatch.setattr(megacloud, "_session_pool", None)
+
+
+def test_configure_keeps_the_pool_when_settings_are_unchanged(restore_session_pool):
+    pool = configure_session_pool(pool_size=4, transport=BlockingTransport)
+    assert configure_session_pool(pool_size=4, transport=BlockingTransport) is pool
+    assert get_session_pool() is pool and not pool.transport.closed
+
+    replacement = configure_session_pool(pool_size=8, transport=BlockingTransport)
+    assert replacement is not pool and pool.transport.closed
+
+
+def test_swapping_the_pool_lets_requests_in_flight_finish(restore_session_pool):
+    old = configure_session_pool(pool_size=4, transport=BlockingTransport)
+    with ThreadPoolExecutor(1) as executor:
+        future = executor.submit(old.get, "https://megacloud.example/getSources", {}, {})
+        assert old.transport.started.wait(5)
+
+        new = configure_session_pool(pool_size=8, transport=BlockingTransport)
+        assert not old.transport.closed
+        old.transport.release.set()
+        assert future.result(5).status_code == 200
+
+    assert old.transport.closed and not old.transport.closed_under_request
+
+    # A caller still holding the old pool is served by the current one
+    new.transport.release.set()
+    assert old.get("https://megacloud.example/getSources", {}, {}).status_code == 200
+    assert new.stats()["megacloud.example"]["requests"] == 1
@@ -0,0 +1,65 @@
+# tests/test_mock_site_smoke.py
+"""Search, extraction and the job queue end to end against benchmarks.mock_site."""
+import os
+import shutil
+
+from yt_dlp import YoutubeDL
+
+from downloader.anime_service import AnimeService
+from downloader.job_queue import JobQueue
+
+
+def first_series(site):
+    return next(iter(site.catalogue.values()))
+
+
+def test_search(mock_site):
+    service = AnimeService()
+    try:
+        results = service.search_anime("naruto")
+        assert {result["title"] for result in results} >= {series.title for series in mock_site.catalogue.values()}
+        assert all(result["url"].startswith(mock_site.url) for result in results)
+
+        service.search_anime("naruto")
+        assert mock_site.stats()["requests"]["search"] == 3  # Second search came from the cache
+    finally:
+        service.close()
+
+
+def test_extract_playlist_and_episode(mock_site, ydl_opts):
+    series = first_series(mock_site)
+    with YoutubeDL(ydl_opts(extract_flat=True)) as ydl:
+        playlist = ydl.extract_info(mock_site.series_url(series.id), download=False)
+    assert playlist["title"] == series.title
+    assert len(playlist["entries"]) == min(series.sub, 3)
+
+    url = f"{mock_site.series_url(series.id)}?ep={series.episode_id(1)}&lang=sub"
+    with YoutubeDL(ydl_opts(format="720p")) as ydl:
+        info = ydl.extract_info(url, download=False)
+    assert {"360p", "720p", "1080p"} <= {f["format_id"] for f in info["formats"]}
+    assert info["format_id"] == "720p"
+    assert "en" in info["subtitles"]
+
+
+def test_job_queue_downloads_episodes(mock_site, tmp_path):
+    series = first_series(mock_site)
+    job_queue = JobQueue(str(tmp_path / "jobs.sqlite3"), backoff=0, max_attempts=1)
+    job_id = job_queue.add_job(series.title, mock_site.series_url(series.id), "SUB", "720p", 1, 2,
+                               str(tmp_path / "downloads"))
+    service = AnimeService()
+    try:
+        ok = service.run_job_queue(job_queue, gui_logger_callback=lambda message: None)
+    finally:
+        service.close()
+
+    episodes = job_queue.episodes(job_id)
+    assert [episode["number"] for episode in episodes] == [1, 2]
+    files = os.listdir(tmp_path / "downloads" / series.title)
+    assert sum(name.endswith(".mp4") for name in files) == 2
+
+    if shutil.which("ffmpeg"):
+        assert ok and job_queue.job(job_id)["state"] == JobQueue.DONE
+    else:
+        # Subtitle embedding needs FFmpeg; the media itself still downloads
+        assert not ok and job_queue.job(job_id)["state"] == JobQueue.FAILED
+        assert all("ffmpeg" in episode["error"].lower() for episode in episodes)
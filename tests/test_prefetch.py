@@ -0,0 +1,87 @@
+# tests/test_prefetch.py
+import io
+import sys
+import threading
+import time
+
+from yt_dlp.networking import Response
+from yt_dlp.networking.exceptions import HTTPError
+from yt_dlp.utils import DownloadError, ExtractorError
+
+from downloader.anime_service import _EpisodePrefetcher, _looks_expired
+
+
+def http_error(status):
+    return HTTPError(Response(io.BytesIO(), "https://cdn.example/master.m3u8", {}, status=status))
+
+
+def download_error(cause):
+    # How YoutubeDL.report_error wraps the exception it is handling
+    try:
+        raise cause
+    except Exception:
+        return DownloadError(f"ERROR: unable to download video data: {cause}", sys.exc_info())
+
+
+def test_expired_urls_are_recognised_by_the_status_in_the_chain():
+    assert _looks_expired(http_error(403))
+    assert _looks_expired(download_error(http_error(410)))
+    assert _looks_expired(ExtractorError("Unable to download webpage", cause=http_error(401)))
+
+    try:
+        try:
+            raise http_error(404)
+        except HTTPError as e:
+            raise RuntimeError("episode failed") from e
+    except RuntimeError as e:
+        assert _looks_expired(e)
+
+
+def test_other_errors_do_not_look_expired():
+    assert not _looks_expired(http_error(500))
+    assert not _looks_expired(download_error(http_error(503)))
+    assert not _looks_expired(DownloadError("HTTP Error 403: Forbidden"))  # Only a message
+    assert not _looks_expired(ValueError("fragment 3 not found"))
+
+
+def test_prefetcher_resolves_at_most_depth_episodes_ahead():
+    resolved = []
+    lock = threading.Lock()
+
+    def resolve(number, url):
+        with lock:
+            resolved.append(number)
+        if number == 3:
+            raise ValueError("no servers")
+        return f"resolved {url}"
+
+    episodes = [(number, f"u{number}") for number in range(1, 7)]
+    prefetcher = _EpisodePrefetcher(episodes, resolve, depth=2, threads=4)
+    try:
+        time.sleep(0.2)
+        assert sorted(resolved) == [1, 2]  # Nobody has taken one yet
+
+        items = []
+        while (item := prefetcher.get()) is not None:
+            items.append(item)
+            time.sleep(0.05)
+            with lock:
+                assert len(resolved) - len(items) <= 2
+    finally:
+        prefetcher.close()
+
+    assert sorted(number for number, _url, _resolved in items) == [1, 2, 3, 4, 5, 6]
+    results = {number: result for number, _url, result in items}
+    assert results[1] == "resolved u1"
+    assert isinstance(results[3], ValueError)
+    assert prefetcher.get() is None  # Every worker sees the end
+
+
+def test_closing_the_prefetcher_stops_resolving():
+    resolved = []
+    prefetcher = _EpisodePrefetcher([(number, "") for number in range(1, 10)],
+                                    lambda number, url: resolved.append(number), depth=1)
+    assert prefetcher.get()[0] == 1
+    prefetcher.close()
+    time.sleep(0.7)  # Longer than a resolver waits for a slot between checks
+    assert len(resolved) <= 2
@@ -0,0 +1,88 @@
+# tests/test_search_cache.py
+import logging
+import threading
+
+from downloader.anime_service import AnimeService
+from downloader.search_cache import SearchCache
+
+BASE_URL = "https://hianime.to"
+
+
+def results(*titles):
+    return [{"title": title, "url": f"{BASE_URL}/{title.lower()}"} for title in titles]
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = SearchCache(max_entries=2)
+    cache.put(BASE_URL, "naruto", results("Naruto"))
+    cache.put(BASE_URL, "bleach", results("Bleach"))
+    cache.get(BASE_URL, "naruto")  # Now the most recently used
+    cache.put(BASE_URL, "one piece", results("One Piece"))
+
+    assert cache.get(BASE_URL, "bleach") == (None, SearchCache.MISS)
+    assert cache.get(BASE_URL, "naruto") == (results("Naruto"), SearchCache.FRESH)
+    assert cache.get(BASE_URL, "One  Piece") == (results("One Piece"), SearchCache.FRESH)
+    assert cache.stats()["evictions"] == 1 and cache.stats()["size"] == 2
+
+
+def test_entries_survive_a_restart(tmp_path):
+    SearchCache(cache_dir=str(tmp_path)).put(BASE_URL, "naruto", results("Naruto"))
+
+    cache = SearchCache(cache_dir=str(tmp_path))
+    assert cache.get(BASE_URL, "NARUTO") == (results("Naruto"), SearchCache.FRESH)
+    assert not list(tmp_path.glob("*.tmp"))
+
+    cache.invalidate(BASE_URL, "naruto")
+    assert SearchCache(cache_dir=str(tmp_path)).get(BASE_URL, "naruto") == (None, SearchCache.MISS)
+
+
+def test_unreadable_and_unwritable_entries_are_logged(tmp_path, caplog):
+    cache = SearchCache(cache_dir=str(tmp_path))
+    with open(cache._path(cache.make_key(BASE_URL, "naruto")), "w") as f:
+        f.write("{not json")
+
+    with caplog.at_level(logging.WARNING, logger="downloader.search_cache"):
+        assert cache.get(BASE_URL, "naruto") == (None, SearchCache.MISS)
+        blocked = tmp_path / "file"
+        blocked.write_text("")
+        SearchCache(cache_dir=str(blocked / "search")).put(BASE_URL, "naruto", results("Naruto"))
+
+    messages = [record.getMessage() for record in caplog.records]
+    assert any(m.startswith("Could not read search cache") for m in messages)
+    assert any(m.startswith("Could not write search cache") for m in messages)
+
+
+def test_expired_entries_are_stale_then_missing():
+    cache = SearchCache(ttl=0, stale_ttl=60)
+    cache.put(BASE_URL, "naruto", results("Naruto"))
+    assert cache.get(BASE_URL, "naruto") == (results("Naruto"), SearchCache.STALE)
+
+    cache.stale_ttl = 0
+    assert cache.get(BASE_URL, "naruto") == (None, SearchCache.MISS)
+
+
+def test_stale_results_are_served_and_refreshed_once_in_the_background():
+    service = AnimeService(BASE_URL, search_cache=SearchCache(ttl=0, stale_ttl=60))
+    service.search_cache.put(BASE_URL, "naruto", results("Naruto"))
+    release = threading.Event()
+    fetches = []
+
+    def fetch_pages(name, max_pages, page_concurrency, status):
+        fetches.append(name)
+        release.wait(5)
+        status["complete"] = True
+        yield from results("Naruto", "Naruto Shippuden")
+
+    refreshed = threading.Event()
+    service._iter_search_pages = fetch_pages
+    service.search_refreshed.connect(lambda name, new: refreshed.set())
+
+    # Both searches get the stale results at once; only the first starts a refresh
+    assert service.search_anime("naruto") == results("Naruto")
+    assert service.search_anime("naruto") == results("Naruto")
+    release.set()
+    assert refreshed.wait(5)
+
+    assert fetches == ["naruto"]
+    assert service.search_cache.get(BASE_URL, "naruto")[0] == results("Naruto", "Naruto Shippuden")
+    assert service.search_cache.stats()["refreshes"] == 1
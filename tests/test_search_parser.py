@@ -0,0 +1,48 @@
+# tests/test_search_parser.py
+from downloader.search_parser import iter_search_items
+
+CARD = """
+<div class="flw-item">
+    <div class="film-poster">
+        <div class="tick ltr">
+            <div class="tick-item tick-sub"><i class="fas fa-closed-captioning mr-1"></i>{sub}</div>
+        </div>
+        {img}
+        <a href="/watch/{slug}" class="film-poster-ahref" title="{title}"></a>
+    </div>
+    <div class="film-detail">
+        <h3 class="film-name"><a href="/watch/{slug}" title="{title}">{title}</a></h3>
+    </div>
+</div>
+"""
+
+SIDEBAR = """
+<section class="block_area block_area_sidebar">
+    <div class="film-poster"><img data-src="https://cdn.example/sidebar.jpg"></div>
+    <h3 class="film-name"><a href="/watch/sidebar-1">Sidebar Title</a></h3>
+    <div class="tick-item tick-dub"><i class="fas fa-microphone mr-1"></i>99</div>
+</section>
+<footer><a href="/watch/footer-2">Footer link</a></footer>
+"""
+
+
+def card(title, slug, sub, img=None):
+    return CARD.format(title=title, slug=slug, sub=sub, img=f'<img data-src="{img}">' if img else "")
+
+
+def test_fields_come_from_their_own_card():
+    page = ('<div class="film_list-wrap">' + card("Naruto", "naruto-1", 220, "https://cdn.example/naruto.jpg")
+            + card("Bleach &amp; Co", "bleach-2", 366) + "</div>")
+
+    assert list(iter_search_items(page)) == [
+        {"title": "Naruto", "path": "/watch/naruto-1", "sub": "220", "dub": None,
+         "img": "https://cdn.example/naruto.jpg"},
+        {"title": "Bleach & Co", "path": "/watch/bleach-2", "sub": "366", "dub": None, "img": None},
+    ]
+
+
+def test_a_sidebar_after_the_last_card_does_not_fill_its_missing_fields():
+    page = '<div class="film_list-wrap">' + card("Bleach", "bleach-2", 366) + "</div>" + SIDEBAR
+
+    items = list(iter_search_items(page))
+    assert items == [{"title": "Bleach", "path": "/watch/bleach-2", "sub": "366", "dub": None, "img": None}]
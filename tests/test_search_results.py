@@ -0,0 +1,83 @@
+# tests/test_search_results.py
+"""AnimeService.iter_search_results against benchmarks.mock_site, which serves the same page for every page=N."""
+import time
+
+import pytest
+
+from downloader.anime_service import AnimeService
+from downloader.search_cache import SearchCache
+
+
+@pytest.fixture
+def pages(mock_site, monkeypatch):
+    """
+    Tags every result URL with the page it came from, delays page 2 so page 3 arrives
+    first, and fails the pages listed in the returned set.
+    """
+    failing = set()
+    route = mock_site.route
+
+    def tagged_route(path, query, headers):
+        name, status, content_type, body, extra = route(path, query, headers)
+        if name != "search":
+            return name, status, content_type, body, extra
+        page = int(query.get("page", ["1"])[0])
+        if page in failing:
+            return name, 500, "text/plain", b"Injected error", {}
+        if page == 2:
+            time.sleep(0.2)
+        return name, status, content_type, body.replace(b'href="/watch/', f'href="/watch/p{page}/'.encode()), extra
+
+    monkeypatch.setattr(mock_site, "route", tagged_route)
+    return failing
+
+
+@pytest.fixture
+def service(mock_site):
+    service = AnimeService(search_cache=SearchCache())
+    yield service
+    service.close()
+
+
+def result_pages(results):
+    return [int(result["url"].split("/watch/p", 1)[1].split("/", 1)[0]) for result in results]
+
+
+def test_results_are_yielded_in_page_order(pages, service):
+    results = list(service.iter_search_results("naruto"))
+
+    per_page = len(results) // 3
+    assert per_page == 40
+    assert result_pages(results) == [1] * per_page + [2] * per_page + [3] * per_page
+    assert service.search_cache.get(service.base_url, "naruto")[1] == SearchCache.FRESH
+
+
+def test_max_pages_limits_the_pages_fetched(pages, service, mock_site):
+    results = list(service.iter_search_results("naruto", max_pages=2))
+
+    assert set(result_pages(results)) == {1, 2}
+    assert mock_site.stats()["requests"]["search"] == 2
+
+
+def test_stopping_early_does_not_cache_partial_results(pages, service):
+    results = service.iter_search_results("naruto")
+    first = [next(results) for _ in range(5)]
+    results.close()
+
+    assert result_pages(first) == [1] * 5
+    assert service.search_cache.get(service.base_url, "naruto") == (None, SearchCache.MISS)
+
+
+def test_a_failed_page_is_skipped_and_the_search_not_cached(pages, service):
+    pages.add(2)
+    results = list(service.iter_search_results("naruto"))
+
+    assert sorted(set(result_pages(results))) == [1, 3]
+    assert service.search_cache.get(service.base_url, "naruto") == (None, SearchCache.MISS)
+
+
+def test_a_failed_first_page_yields_nothing(pages, service):
+    pages.add(1)
+
+    assert list(service.iter_search_results("naruto")) == []
+    assert service.search_cache.get(service.base_url, "naruto") == (None, SearchCache.MISS)
@@ -0,0 +1,67 @@
+# tests/test_thumbnail_cache.py
+import logging
+import os
+
+import pytest
+
+pytest.importorskip("PyQt6.QtGui")
+from PyQt6.QtCore import QSize
+from PyQt6.QtGui import QColor, QGuiApplication, QImage
+
+from gui.thumbnail_cache import ThumbnailDiskCache
+
+
+@pytest.fixture(scope="module", autouse=True)
+def qt_app():
+    # QPixmap needs a QGuiApplication; the offscreen platform works without a display
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    yield QGuiApplication.instance() or QGuiApplication([])
+
+
+def image(color: str, width: int = 32, height: int = 48) -> QImage:
+    image = QImage(width, height, QImage.Format.Format_RGB32)
+    image.fill(QColor(color))
+    return image
+
+
+def test_stored_images_load_back_after_a_restart(tmp_path):
+    cache = ThumbnailDiskCache(str(tmp_path), QSize(32, 48))
+    cache.store("https://cdn.example/a.jpg", image("red"))
+
+    cache = ThumbnailDiskCache(str(tmp_path), QSize(32, 48))
+    pixmap = cache.load("https://cdn.example/a.jpg")
+    assert pixmap is not None and pixmap.size() == QSize(32, 48)
+    assert pixmap.toImage().pixelColor(0, 0) == QColor("red")
+    assert cache.load("https://cdn.example/b.jpg") is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # The same URL at another thumbnail size is a different entry
+    assert ThumbnailDiskCache(str(tmp_path), QSize(64, 96)).load("https://cdn.example/a.jpg") is None
+    assert not list(tmp_path.rglob("*.tmp"))
+
+
+def test_least_recently_used_files_are_evicted(tmp_path):
+    cache = ThumbnailDiskCache(str(tmp_path), QSize(32, 48))
+    cache.store("a", image("red"))
+    cache.store("b", image("red"))
+    os.utime(cache._path("a"), (100, 100))
+    os.utime(cache._path("b"), (200, 200))
+
+    cache = ThumbnailDiskCache(str(tmp_path), QSize(32, 48), max_bytes=cache.total_bytes())
+    assert cache.load("a") is not None  # Now more recently used than b
+    cache.store("c", image("red"))
+
+    assert cache.load("b") is None
+    assert cache.load("a") is not None and cache.load("c") is not None
+    assert cache.total_bytes() <= cache.max_bytes
+
+
+def test_failed_writes_are_logged_and_leave_no_temporary_file(tmp_path, caplog):
+    cache = ThumbnailDiskCache(str(tmp_path), QSize(32, 48))
+
+    with caplog.at_level(logging.WARNING, logger="gui.thumbnail_cache"):
+        cache.store("a", QImage())  # A null image cannot be saved
+
+    assert any(r.getMessage().startswith("Could not write thumbnail cache") for r in caplog.records)
+    assert cache.load("a") is None
+    assert not [path for path in tmp_path.rglob("*") if path.is_file()]
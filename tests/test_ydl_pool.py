@@ -0,0 +1,112 @@
+# tests/test_ydl_pool.py
+import pytest
+
+from downloader.ydl_pool import YoutubeDLPool
+
+
+class FakeYoutubeDL:
+    """Keeps params and the hooks given at construction, like YoutubeDL."""
+
+    def __init__(self, opts) -> None:
+        self.params = {k: v for k, v in opts.items() if k not in ("progress_hooks", "postprocessor_hooks")}
+        self.progress_hooks = list(opts["progress_hooks"])
+        self.postprocessor_hooks = list(opts["postprocessor_hooks"])
+        self.format_selector = None
+        self.closed = False
+
+    def build_format_selector(self, format_spec):
+        return ("selector", format_spec)
+
+    def report_progress(self, d) -> None:
+        for hook in self.progress_hooks:
+            hook(d)
+
+    def report_postprocessing(self, d) -> None:
+        for hook in self.postprocessor_hooks:
+            hook(d)
+
+    def close(self) -> None:
+        self.closed = True
+
+
+@pytest.fixture
+def pool():
+    pool = YoutubeDLPool(max_idle=2, factory=FakeYoutubeDL)
+    yield pool
+    pool.close()
+
+
+def test_per_use_options_are_reset_between_checkouts(pool):
+    with pool.checkout({"quiet": True, "format": "720p", "ratelimit": 1000, "extract_flat": "in_playlist",
+                        "outtmpl": "first.%(ext)s"}) as first:
+        assert first.params["ratelimit"] == 1000
+        assert first.format_selector == ("selector", "720p")
+
+    with pool.checkout({"quiet": True, "format": "1080p", "outtmpl": "second.%(ext)s"}) as second:
+        assert second is first
+        assert "ratelimit" not in second.params and "extract_flat" not in second.params
+        assert second.params["format"] == "1080p" and second.format_selector == ("selector", "1080p")
+        assert second.params["outtmpl"]["default"] == "second.%(ext)s"
+
+    assert pool.stats() == {"created": 1, "reused": 1, "idle": 1}
+
+
+def test_hooks_do_not_leak_between_checkouts(pool):
+    calls = []
+    first_hooks = {"progress_hooks": [lambda d: calls.append(("first", d["status"]))],
+                   "postprocessor_hooks": [lambda d: calls.append(("first pp", d["status"]))]}
+    with pool.checkout({"quiet": True, **first_hooks}) as ydl:
+        ydl.report_progress({"status": "downloading"})
+        ydl.report_postprocessing({"status": "started"})
+
+    ydl.report_progress({"status": "late"})  # Back in the pool: nobody listens
+
+    with pool.checkout({"quiet": True, "progress_hooks": [lambda d: calls.append(("second", d["status"]))]}) as again:
+        assert again is ydl
+        again.report_progress({"status": "finished"})
+        again.report_postprocessing({"status": "finished"})
+
+    assert calls == [("first", "downloading"), ("first pp", "started"), ("second", "finished")]
+
+
+def test_fixed_options_select_the_instance(pool):
+    with pool.checkout({"quiet": True}) as quiet:
+        pass
+    with pool.checkout({"quiet": False}) as verbose:
+        assert verbose is not quiet
+    with pool.checkout({"quiet": True, "logger": object()}) as again:
+        assert again is quiet  # logger is per use
+
+
+def test_failed_use_returns_the_instance_but_an_interrupted_one_is_closed(pool):
+    with pytest.raises(ValueError):
+        with pool.checkout({"quiet": True}) as failed:
+            raise ValueError("extraction failed")
+    assert not failed.closed and pool.stats()["idle"] == 1
+
+    with pytest.raises(KeyboardInterrupt):
+        with pool.checkout({"quiet": True}) as interrupted:
+            raise KeyboardInterrupt
+    assert interrupted is failed and interrupted.closed
+    assert pool.stats()["idle"] == 0
+
+
+def test_at_most_max_idle_instances_are_kept(pool):
+    with pool.checkout({}) as a, pool.checkout({}) as b, pool.checkout({}) as c:
+        pass
+    assert pool.stats()["idle"] == 2
+    assert [a.closed, b.closed, c.closed].count(True) == 1
+
+
+def test_a_real_youtube_dl_is_reconfigured_per_checkout(ydl_opts):
+    pool = YoutubeDLPool(max_idle=1)
+    try:
+        with pool.checkout(ydl_opts(format="720p", ratelimit=1000, outtmpl="first.%(ext)s")) as ydl:
+            assert ydl.params["ratelimit"] == 1000
+        with pool.checkout(ydl_opts(format="best", outtmpl="second.%(ext)s")) as again:
+            assert again is ydl
+            assert "ratelimit" not in again.params
+            assert again.params["format"] == "best"
+            assert again.params["outtmpl"]["default"] == "second.%(ext)s"
+    finally:
+        pool.close()
@@ -6,13 +6,27 @@ import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 import re
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from yt_dlp.extractor.common import InfoExtractor
-from yt_dlp.utils import ExtractorError, clean_html, get_element_by_class
-from megacloud import Megacloud
+from yt_dlp.networking import Request
+from yt_dlp.utils import ExtractorError, clean_html, float_or_none, get_element_by_class, int_or_none
+from megacloud import Megacloud, configure_session_pool, get_session_pool
 
 class HiAnimeIE(InfoExtractor):
-    _VALID_URL = r'https?://hianime(?:z)?\.(?:to|is|nz|bz|pe|cx|gs|do)/(?:watch/)?(?P<slug>[^/?]+)(?:-\d+)?-(?P<playlist_id>\d+)(?:\?.*)?$'
+    # localhost / 127.0.0.1 are the offline mock site (benchmarks/mock_site.py)
+    _VALID_URL = r'https?://(?:hianime(?:z)?\.(?:to|is|nz|bz|pe|cx|gs|do)|(?:localhost|127\.0\.0\.1)(?::\d+)?)/(?:watch/)?(?P<slug>[^/?]+)(?:-\d+)?-(?P<playlist_id>\d+)(?:\?.*)?$'
+
+    MIRROR_NAMES = ('HD-1', 'HD-2', 'HD-3')
+    _DEFAULT_MIRROR_CONCURRENCY = 6
+    _DEFAULT_MIRROR_TIMEOUT = 30.0
+    _DEFAULT_EPISODE_CACHE_TTL = 6 * 60 * 60
+    _CACHE_SECTION = 'hianime'
+
+    # Parsed episode lists keyed by _series_key(), shared by all extractor instances
+    _series_cache = {}
+    _series_cache_lock = threading.Lock()
 
     _TESTS = [
         {
@@ -82,6 +96,12 @@ class HiAnimeIE(InfoExtractor):
             'Spanish - Espanol(Espana)': 'es',
         }
 
+    def _real_initialize(self):
+        # Megacloud requests share one module-level session pool; it is only rebuilt when the args change
+        pool_size = int_or_none(self._configuration_arg('pool_size', [None])[0]) or 10
+        http2 = self._configuration_arg('http2', [''])[0] in ('1', 'true', 'yes')
+        configure_session_pool(pool_size=pool_size, http2=http2)
+
     def _real_extract(self, url):
         mobj = self._match_valid_url(url)
         playlist_id = mobj.group('playlist_id')
@@ -106,31 +126,19 @@ class HiAnimeIE(InfoExtractor):
     # ========== Playlist Extraction ========== #
 
     def _extract_playlist(self, slug, playlist_id, lang=None):
-        anime_title = self._get_anime_title(slug, playlist_id)
-        playlist_url = f'{self.base_url}/ajax/v2/episode/list/{playlist_id}'
-        playlist_data = self._download_json(playlist_url, playlist_id, note='Fetching Episode List')
-        episodes = self._get_elements_by_tag_and_attrib(
-            playlist_data['html'], tag='a', attribute='class', value='ep-item'
-        )
+        series = self._get_series(slug, playlist_id)
+        anime_title = series['title']
 
         entries = []
-        for episode in episodes:
-            html = episode.group(0)
-            title = re.search(r'title="([^"]+)"', html)
-            number = re.search(r'data-number="([^"]+)"', html)
-            data_id = re.search(r'data-id="([^"]+)"', html)
-            href = re.search(r'href="([^"]+)"', html)
-
-            ep_id = data_id.group(1) if data_id else None
-            ep_title = clean_html(title.group(1)) if title else None
-            ep_number = int(number.group(1)) if number else None
-            ep_url = f'{self.base_url}{href.group(1)}' if href else None
+        for ep_id in series['order']:
+            episode = series['episodes'][ep_id]
+            ep_url = f'{self.base_url}{episode["href"]}' if episode['href'] else None
             if ep_url and lang:
                 ep_url = f'{ep_url}&lang={lang}'
 
             self.episode_list[ep_id] = {
-                'title': ep_title,
-                'number': ep_number,
+                'title': episode['title'],
+                'number': episode['number'],
                 'url': ep_url,
             }
 
@@ -138,20 +146,118 @@ class HiAnimeIE(InfoExtractor):
                 ep_url,
                 ie=self.ie_key(),
                 video_id=ep_id,
-                video_title=ep_title,
+                video_title=episode['title'],
+                episode_number=episode['number'],
             ))
 
         return self.playlist_result(entries, playlist_id, anime_title)
+
+    # ========== Episode List Cache ========== #
+
+    def _get_series(self, slug, playlist_id, force_refresh=False):
+        """
+        Returns the cached {'title', 'episodes', 'order', ...} entry for a series.
+
+        Entries live in memory (shared by every extractor instance) and in yt-dlp's cache
+        dir (shared across processes), keyed by site host and playlist_id. Once older than
+        the TTL they are revalidated with If-None-Match before being re-parsed.
+        """
+        key = self._series_key(playlist_id)
+        with self._series_cache_lock:
+            series = self._series_cache.get(key)
+        if series is None:
+            series = self.cache.load(self._CACHE_SECTION, key)
+
+        ttl = float_or_none(self._configuration_arg('episode_cache_ttl', [None])[0])
+        ttl = self._DEFAULT_EPISODE_CACHE_TTL if ttl is None else ttl
+
+        if not series or not series.get('title'):
+            series = self._fetch_series(slug, playlist_id)
+        elif force_refresh or time.time() - series['fetched_at'] > ttl:
+            series = self._revalidate_series(slug, playlist_id, series)
+        else:
+            self.write_debug(f'{playlist_id}: Using cached episode list')
+
+        with self._series_cache_lock:
+            self._series_cache[key] = series
+        self.anime_title = series['title']
+        return series
+
+    def _series_key(self, playlist_id):
+        # Mirror domains (and the mock site) number series independently
+        host = re.sub(r'^https?://', '', self.base_url)
+        return f'episodes_{host}_{playlist_id}'
+
+    def _fetch_series(self, slug, playlist_id):
+        webpage = self._download_webpage(
+            f'{self.base_url}/{slug}-{playlist_id}',
+            playlist_id,
+            note='Fetching Anime Title'
+        )
+        title = get_element_by_class('film-name dynamic-name', webpage)
+        content, urlh = self._download_webpage_handle(
+            f'{self.base_url}/ajax/v2/episode/list/{playlist_id}', playlist_id, note='Fetching Episode List')
+        return self._store_series(playlist_id, title, content, urlh.headers.get('ETag'))
+
+    def _revalidate_series(self, slug, playlist_id, series):
+        headers = {'If-None-Match': series['etag']} if series.get('etag') else {}
+        content, urlh = self._download_webpage_handle(
+            f'{self.base_url}/ajax/v2/episode/list/{playlist_id}', playlist_id,
+            note='Revalidating Episode List', headers=headers, expected_status=304)
+
+        etag = urlh.headers.get('ETag')
+        if urlh.status == 304 or (etag and etag == series.get('etag')):
+            self.write_debug(f'{playlist_id}: Cached episode list is still valid')
+            series = {**series, 'fetched_at': time.time()}
+            self.cache.store(self._CACHE_SECTION, self._series_key(playlist_id), series)
+            return series
+
+        return self._store_series(playlist_id, series['title'], content, etag)
+
+    def _store_series(self, playlist_id, title, content, etag):
+        playlist_data = self._parse_json(content, playlist_id)
+        episodes = self._get_elements_by_tag_and_attrib(
+            playlist_data['html'], tag='a', attribute='class', value='ep-item'
+        )
+
+        series = {
+            'title': title,
+            'episodes': {},
+            'order': [],
+            'etag': etag,
+            'fetched_at': time.time(),
+        }
+        for episode in episodes:
+            html = episode.group(0)
+            title = re.search(r'title="([^"]+)"', html)
+            number = re.search(r'data-number="([^"]+)"', html)
+            data_id = re.search(r'data-id="([^"]+)"', html)
+            href = re.search(r'href="([^"]+)"', html)
+
+            if not data_id:
+                continue  # Can't be requested, and a None key wouldn't survive the JSON cache
+
+            ep_id = data_id.group(1)
+            series['order'].append(ep_id)
+            series['episodes'][ep_id] = {
+                'title': clean_html(title.group(1)) if title else None,
+                'number': int(number.group(1)) if number else None,
+                'href': href.group(1) if href else None,
+            }
+
+        self.cache.store(self._CACHE_SECTION, self._series_key(playlist_id), series)
+        return series
     
     # ========== Episode Extraction ========== #
 
     def _extract_episode(self, slug, playlist_id, episode_id, lang=None):
-        anime_title = self._get_anime_title(slug, playlist_id)
+        series = self._get_series(slug, playlist_id)
+        if episode_id not in series['episodes']:
+            # Newly aired episodes are missing from a cached list until it is refreshed
+            series = self._get_series(slug, playlist_id, force_refresh=True)
 
-        if episode_id not in self.episode_list:
-            self._extract_playlist(slug, playlist_id)
-
-        episode_data = self.episode_list.get(episode_id)
+        anime_title = series['title']
+        episode_data = series['episodes'].get(episode_id)
 
         if not episode_data:
             raise ExtractorError(f'Episode data for episode_id {episode_id} not found')
@@ -163,75 +269,36 @@ class HiAnimeIE(InfoExtractor):
         subtitles = {}
 
         server_types = [lang] if lang and lang in ['sub', 'dub', 'raw'] else ['sub', 'dub', 'raw']
+        candidates = []
         for server_type in server_types:
             # 1. Initial element fetching
             server_items_from_func = self._get_elements_by_tag_and_attrib(
                 servers_data['html'], tag='div', attribute='data-type', value=server_type, escape_value=False
             )
-            
+
             # 2. Stricter filtering
             server_items_filtered = [s for s in server_items_from_func if f'data-type="{server_type}"' in s.group(0)]
-            
-            # 3. Try multiple mirrors
-            mirror_names = ["HD-1", "HD-2", "HD-3"]
-            for mirror in mirror_names:
-                target_link_text = mirror
+
+            # 3. Collect every mirror so they can be raced in parallel
+            for mirror in self.MIRROR_NAMES:
                 server_id = next(
                     (
                         re.search(r'data-id="([^"]+)"', s.group(0)).group(1)
-                        for s in server_items_filtered 
-                        if re.search(rf'>\s*{re.escape(target_link_text)}\s*</a>', s.group(0))
+                        for s in server_items_filtered
+                        if re.search(rf'>\s*{re.escape(mirror)}\s*</a>', s.group(0))
                         and re.search(r'data-id="([^"]+)"', s.group(0))
                     ),
                     None
                 )
-                if not server_id:
-                    continue
-                try:
-                    sources_url = f'{self.base_url}/ajax/v2/episode/sources?id={server_id}'
-                    sources_data = self._download_json(sources_url, episode_id, note=f'Getting {server_type.upper()} Episode Information from {mirror}')
-                    embed_url = sources_data.get('link')
-                    if not embed_url:
-                        continue
-                    scraper = Megacloud(embed_url)
-                    data = scraper.extract()
-                    if not data.get('sources'):
-                        continue
-                    for source in data.get('sources', []):
-                        file_url = source.get('file')
-                        if not (file_url and file_url.endswith('.m3u8')):
-                            continue
-                        extracted_formats = self._extract_custom_m3u8_formats(
-                            file_url,
-                            episode_id,
-                            headers={
-                                "Referer": "https://megacloud.blog/",
-                                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
-                                "Accept": "application/vnd.apple.mpegurl,application/x-mpegURL,*/*",
-                                "Accept-Language": "en-US,en;q=0.9",
-                                "Accept-Encoding": "gzip, deflate, br",
-                                "Connection": "keep-alive"
-                            },
-                            server_type=server_type
-                        )
-                        formats.extend(extracted_formats)
-                    for track in data.get('tracks', []):
-                        if track.get('kind') != 'captions':
-                            continue
-                        file_url = track.get('file')
-                        label = track.get('label')
-                        if label == 'English':
-                            label += f' {server_type.capitalize()}bed'
-                        lang_code = self.language_codes.get(label, label)
-                        if file_url:
-                            subtitles.setdefault(lang_code, []).append({
-                                'name': label,
-                                'url': file_url,
-                            })
-                except Exception as e:
-                    self.to_screen(f'Failed to extract from {mirror} for {server_type}: {e}, trying next mirror after 10 seconds')
-                    time.sleep(10)
-                    continue
+                if server_id:
+                    candidates.append((server_type, mirror, server_id))
+
+        for formats_part, subtitles_part in self._race_mirrors(candidates, episode_id):
+            formats.extend(formats_part)
+            for lang_code, tracks in subtitles_part.items():
+                subtitles.setdefault(lang_code, []).extend(tracks)
+        self.write_debug(f'Megacloud connection stats: {get_session_pool().stats()}')
+
         return {
             'id': episode_id,
             'title': episode_data['title'],
@@ -244,13 +311,143 @@ class HiAnimeIE(InfoExtractor):
             'episode_id': episode_id,
         }
 
+    # ========== Mirror Resolution ========== #
+
+    def _mirror_options(self):
+        """Reads the mirror racing extractor args (``--extractor-args "hianime:..."``)."""
+        concurrency = int_or_none(self._configuration_arg('mirror_concurrency', [None])[0])
+        timeout = float_or_none(self._configuration_arg('mirror_timeout', [None])[0])
+        wins = int_or_none(self._configuration_arg('mirror_wins', [None])[0])
+        mode = self._configuration_arg('mirror_mode', ['first'])[0]
+        if mode not in ('first', 'all'):
+            self.report_warning(f'Unknown mirror_mode "{mode}", falling back to "first"')
+            mode = 'first'
+        return {
+            'concurrency': max(concurrency or self._DEFAULT_MIRROR_CONCURRENCY, 1),
+            'timeout': timeout or self._DEFAULT_MIRROR_TIMEOUT,
+            'wins': max(wins or 1, 1),
+            'mode': mode,
+        }
+
+    def _race_mirrors(self, candidates, episode_id):
+        """
+        Resolves all (server_type, mirror, server_id) candidates concurrently.
+
+        In "first" mode the first `wins` successful mirrors of each server type are kept
+        and the remaining ones for that type are cancelled; in "all" mode every mirror is
+        resolved. Results are returned in the original mirror order.
+        """
+        if not candidates:
+            return []
+
+        options = self._mirror_options()
+        collect_all = options['mode'] == 'all'
+        cancelled = {server_type: threading.Event() for server_type, _, _ in candidates}
+        wins = dict.fromkeys(cancelled, 0)
+        results = {}
+
+        executor = ThreadPoolExecutor(
+            max_workers=min(options['concurrency'], len(candidates)), thread_name_prefix='hianime-mirror')
+        try:
+            futures = {
+                executor.submit(
+                    self._resolve_mirror, server_type, mirror, server_id, episode_id,
+                    options['timeout'], cancelled[server_type]): (index, server_type, mirror)
+                for index, (server_type, mirror, server_id) in enumerate(candidates)
+            }
+            for future in as_completed(futures):
+                index, server_type, mirror = futures[future]
+                if future.cancelled():
+                    continue
+                try:
+                    result = future.result()
+                except Exception as e:
+                    self.to_screen(f'Failed to extract from {mirror} for {server_type}: {e}')
+                    continue
+                if not result or cancelled[server_type].is_set():
+                    continue
+
+                results[index] = result
+                wins[server_type] += 1
+                if not collect_all and wins[server_type] >= options['wins']:
+                    cancelled[server_type].set()
+                    for other, (_, other_type, _) in futures.items():
+                        if other_type == server_type:
+                            other.cancel()
+                    if all(event.is_set() for event in cancelled.values()):
+                        break
+        finally:
+            # Losing mirrors stop at their next stage boundary; wait for them so none is still
+            # using this extractor (and its YoutubeDL) once the episode moves on to download
+            for event in cancelled.values():
+                event.set()
+            executor.shutdown(wait=True, cancel_futures=True)
+
+        return [results[index] for index in sorted(results)]
+
+    def _resolve_mirror(self, server_type, mirror, server_id, episode_id, timeout, cancelled):
+        """Runs the sources -> Megacloud -> m3u8 pipeline for one mirror. Returns (formats, subtitles) or None."""
+        if cancelled.is_set():
+            return None
+
+        sources_url = f'{self.base_url}/ajax/v2/episode/sources?id={server_id}'
+        sources_data = self._download_json(
+            Request(sources_url, extensions={'timeout': timeout}), episode_id,
+            note=f'Getting {server_type.upper()} Episode Information from {mirror}')
+        embed_url = sources_data.get('link')
+        if not embed_url or cancelled.is_set():
+            return None
+
+        data = Megacloud(embed_url, timeout=timeout).extract()
+        if not data.get('sources') or cancelled.is_set():
+            return None
+
+        formats = []
+        subtitles = {}
+        for source in data.get('sources', []):
+            file_url = source.get('file')
+            if not (file_url and file_url.endswith('.m3u8')):
+                continue
+            formats.extend(self._extract_custom_m3u8_formats(
+                file_url,
+                episode_id,
+                headers={
+                    "Referer": f"{Megacloud.base_url}/",
+                    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
+                    "Accept": "application/vnd.apple.mpegurl,application/x-mpegURL,*/*",
+                    "Accept-Language": "en-US,en;q=0.9",
+                    "Accept-Encoding": "gzip, deflate, br",
+                    "Connection": "keep-alive"
+                },
+                server_type=server_type,
+                timeout=timeout,
+            ))
+        for track in data.get('tracks', []):
+            if track.get('kind') != 'captions':
+                continue
+            file_url = track.get('file')
+            label = track.get('label')
+            if label == 'English':
+                label += f' {server_type.capitalize()}bed'
+            lang_code = self.language_codes.get(label, label)
+            if file_url:
+                subtitles.setdefault(lang_code, []).append({
+                    'name': label,
+                    'url': file_url,
+                })
+
+        return formats, subtitles
+
     # ========== Helpers ========== #
 
-    def _extract_custom_m3u8_formats(self, m3u8_url, episode_id, headers, server_type=None):
-        formats = self._extract_m3u8_formats(
-            m3u8_url, episode_id, 'mp4', entry_protocol='m3u8_native',
-            note='Downloading M3U8 Information', headers=headers
-        )
+    def _extract_custom_m3u8_formats(self, m3u8_url, episode_id, headers, server_type=None, timeout=None):
+        # Fetched here rather than by _extract_m3u8_formats so the mirror timeout applies:
+        # a stalled playlist would otherwise hold up the end of the mirror race
+        m3u8_doc, urlh = self._download_webpage_handle(
+            Request(m3u8_url, headers=headers, extensions={'timeout': timeout} if timeout else {}),
+            episode_id, note='Downloading M3U8 Information')
+        formats, _ = self._parse_m3u8_formats_and_subtitles(
+            m3u8_doc, urlh.url, 'mp4', entry_protocol='m3u8_native', headers=headers, video_id=episode_id)
         for f in formats:
             height = f.get('height')
             f['format_id'] = f'{height}p' if height else 'source'
@@ -258,17 +455,6 @@ class HiAnimeIE(InfoExtractor):
             f['http_headers'] = headers
         return formats
 
-    def _get_anime_title(self, slug, playlist_id):
-        if self.anime_title:
-            return self.anime_title
-        webpage = self._download_webpage(
-            f'{self.base_url}/{slug}-{playlist_id}',
-            playlist_id,
-            note='Fetching Anime Title'
-        )
-        self.anime_title = get_element_by_class('film-name dynamic-name', webpage)
-        return self.anime_title
-
     def _get_elements_by_tag_and_attrib(self, html, tag=None, attribute=None, value=None, escape_value=True):
         tag = tag or r'[a-zA-Z0-9:._-]+'
         if attribute:
@@ -1,7 +1,13 @@
+import ast
 import base64
+import functools
+import os
 import re
+import threading
+import time
 import requests
-from typing import Callable, Iterable, TypeVar, overload, Literal, TypeAlias, Any
+from urllib.parse import urlparse
+from typing import Callable, Iterable, NamedTuple, TypeVar, overload, Literal, TypeAlias, Any
 from enum import StrEnum, IntFlag
 
 DEFAULT = object()
@@ -12,17 +18,18 @@ _KeyPair: TypeAlias = tuple[list[str], list[int]]
 
 
 @overload
-def _re(pattern: "Patterns", string: str) -> re.Match: ...
+def _re(pattern: "Patterns | FormattedPattern", string: str) -> re.Match: ...
 @overload
-def _re(pattern: "Patterns", string: str, *, default: T) -> re.Match | T: ...
+def _re(pattern: "Patterns | FormattedPattern", string: str, *, default: T) -> re.Match | T: ...
 @overload
-def _re(pattern: "Patterns", string: str, *, all: Literal[True]) -> list: ...
+def _re(pattern: "Patterns | FormattedPattern", string: str, *, all: Literal[True]) -> list: ...
 @overload
-def _re(pattern: "Patterns", string: str, *, all: Literal[True], default: T) -> list | T: ...
+def _re(pattern: "Patterns | FormattedPattern", string: str, *, all: Literal[True], default: T) -> list | T: ...
 
 
-def _re(pattern: "Patterns", string: str, *, all: bool = False, default: T = DEFAULT) -> re.Match | list | T:
-    v = re.findall(pattern.formatted, string) if all else re.search(pattern.formatted, string)
+def _re(pattern: "Patterns | FormattedPattern", string: str, *, all: bool = False, default: T = DEFAULT) -> re.Match | list | T:
+    compiled = pattern.compiled
+    v = compiled.findall(string) if all else compiled.search(string)
 
     if not v and default is DEFAULT:
         msg = f"{pattern.name} not found"
@@ -33,12 +40,212 @@ def _re(pattern: "Patterns", string: str, *, all: bool = False, default: T = DEF
 
     return v
 
-def make_request(url: str, headers: dict, params: dict, func: Callable[[requests.Response], Any]) -> Any:
+class RequestsTransport:
     """
-    Makes a synchronous HTTP GET request using the requests library.
+    Default transport: a keep-alive requests.Session with per-host connection pools.
+    """
+    def __init__(self, pool_size: int) -> None:
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._adapter = adapter
+
+    def get(self, url: str, headers: dict, params: dict, timeout: float | None) -> requests.Response:
+        return self.session.get(url, headers=headers, params=params, timeout=timeout)
+
+    def connection_counts(self) -> dict[str, int]:
+        pools = self._adapter.poolmanager.pools
+        return {key.key_host: pools[key].num_connections for key in pools.keys()}
+
+    def close(self) -> None:
+        self.session.close()
+
+
+class HTTP2Transport:
+    """
+    Optional HTTP/2 transport backed by httpx (requires ``httpx[http2]``).
+    """
+    def __init__(self, pool_size: int) -> None:
+        import httpx
+
+        self._httpx = httpx
+        self.client = httpx.Client(
+            http2=True, limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size)
+        )
+
+    def get(self, url: str, headers: dict, params: dict, timeout: float | None) -> Any:
+        try:
+            resp = self.client.get(url, headers=headers, params=params, timeout=timeout)
+        except self._httpx.HTTPError as e:
+            raise requests.exceptions.ConnectionError(str(e)) from e
+
+        return _HTTP2Response(resp)
+
+    def close(self) -> None:
+        self.client.close()
+
+
+class _HTTP2Response:
+    # Adapts an httpx.Response to the parts of the requests.Response API used here
+    def __init__(self, resp) -> None:
+        self._resp = resp
+        self.status_code = resp.status_code
+        self.text = resp.text
+
+    def json(self) -> Any:
+        return self._resp.json()
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(f"{self.status_code} Error for url: {self._resp.url}", response=self)
+
+    def close(self) -> None:
+        self._resp.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class SessionPool:
+    """
+    Shared connection-pooled HTTP layer used by every Megacloud instance.
+
+    Requests are retried with exponential backoff on connection errors and 5xx
+    responses. Per-host request counts are kept so connection reuse can be inspected
+    through stats(). close() waits for requests in flight: the transport is closed by
+    whichever finishes last.
+    """
+    RETRY_STATUSES = frozenset({500, 502, 503, 504})
+
+    def __init__(self, pool_size: int = 10, retries: int = 3, backoff_factor: float = 0.5,
+                 transport: Callable[[int], Any] | None = None) -> None:
+        self.pool_size = pool_size
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.transport = (transport or RequestsTransport)(pool_size)
+        self._lock = threading.Lock()
+        self._requests: dict[str, int] = {}
+        self._in_flight = 0
+        self._closing = False
+        self._closed = False
+
+    def get(self, url: str, headers: dict, params: dict, timeout: float | None = None) -> Any:
+        with self._lock:
+            closing = self._closing
+            if not closing:
+                self._in_flight += 1
+        if closing:
+            # Replaced by configure_session_pool() after the caller looked it up
+            return get_session_pool().get(url, headers, params, timeout)
+
+        try:
+            return self._get(url, headers, params, timeout)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+            self._close_if_idle()
+
+    def _get(self, url: str, headers: dict, params: dict, timeout: float | None) -> Any:
+        host = urlparse(url).hostname or url
+        for attempt in range(self.retries + 1):
+            with self._lock:
+                self._requests[host] = self._requests.get(host, 0) + 1
+
+            last_attempt = attempt == self.retries
+            try:
+                resp = self.transport.get(url, headers, params, timeout)
+            except requests.exceptions.ConnectionError:
+                if last_attempt:
+                    raise
+            else:
+                if resp.status_code not in self.RETRY_STATUSES or last_attempt:
+                    return resp
+                resp.close()
+
+            time.sleep(self.backoff_factor * (2 ** attempt))
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        """Returns {host: {"requests", "connections", "reused"}} for diagnostics."""
+        counts = getattr(self.transport, "connection_counts", dict)()
+        with self._lock:
+            requests_per_host = dict(self._requests)
+
+        stats = {}
+        for host, num_requests in requests_per_host.items():
+            connections = counts.get(host)
+            stats[host] = {
+                "requests": num_requests,
+                "connections": connections if connections is not None else -1,
+                "reused": num_requests - connections if connections is not None else -1,
+            }
+
+        return stats
+
+    def close(self) -> None:
+        with self._lock:
+            self._closing = True
+        self._close_if_idle()
+
+    def _close_if_idle(self) -> None:
+        with self._lock:
+            if not self._closing or self._in_flight or self._closed:
+                return
+            self._closed = True
+        self.transport.close()
+
+    def has_settings(self, pool_size: int, retries: int, backoff_factor: float, transport: Callable[[int], Any]) -> bool:
+        return (self.pool_size, self.retries, self.backoff_factor, type(self.transport)) == \
+            (pool_size, retries, backoff_factor, transport)
+
+
+_session_pool: SessionPool | None = None
+_session_pool_lock = threading.Lock()
+
+
+def configure_session_pool(pool_size: int = 10, retries: int = 3, backoff_factor: float = 0.5,
+                           http2: bool = False, transport: Callable[[int], Any] | None = None) -> SessionPool:
+    """
+    Replaces the shared session pool, unless it already has these settings. ``http2=True``
+    selects HTTP2Transport unless an explicit transport factory is given. The old pool's
+    connections are closed once the requests still running on it have finished.
+    """
+    global _session_pool
+
+    if transport is None:
+        transport = HTTP2Transport if http2 else RequestsTransport
+
+    with _session_pool_lock:
+        old = _session_pool
+        if old is not None and old.has_settings(pool_size, retries, backoff_factor, transport):
+            return old
+        pool = _session_pool = SessionPool(pool_size, retries, backoff_factor, transport)
+
+    if old is not None:
+        old.close()
+
+    return pool
+
+
+def get_session_pool() -> SessionPool:
+    global _session_pool
+
+    with _session_pool_lock:
+        if _session_pool is None:
+            _session_pool = SessionPool()
+
+        return _session_pool
+
+
+def make_request(url: str, headers: dict, params: dict, func: Callable[[requests.Response], Any], timeout: float | None = None) -> Any:
+    """
+    Makes a synchronous HTTP GET request through the shared session pool.
     """
     try:
-        with requests.get(url, headers=headers, params=params) as resp:
+        with get_session_pool().get(url, headers, params, timeout) as resp:
             resp.raise_for_status()  # Raise an exception for bad status codes (4xx or 5xx)
             return func(resp)
     except requests.exceptions.RequestException as e:
@@ -101,6 +308,57 @@ def generate_index_sequence(n: int) -> list[int]:
     return result
 
 
+# Everything the legacy eval() of these expressions could meet: the OPERATION pattern admits
+# comparisons and ** as well as plain arithmetic
+_OP_NODES = (
+    ast.Expression, ast.BinOp, ast.UnaryOp, ast.BoolOp, ast.Compare, ast.IfExp,
+    ast.Constant, ast.Name, ast.Load, ast.Subscript, ast.Call,
+    ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod, ast.Pow,
+    ast.BitOr, ast.BitAnd, ast.BitXor, ast.LShift, ast.RShift,
+    ast.USub, ast.UAdd, ast.Invert, ast.Not,
+    ast.And, ast.Or, ast.Eq, ast.NotEq, ast.Lt, ast.LtE, ast.Gt, ast.GtE,
+)
+_OP_GLOBALS = {"__builtins__": {}, "int": int, "float": float}
+
+
+@functools.lru_cache(maxsize=1024)
+def compile_operation(expression: str) -> Callable[..., Any]:
+    """
+    Translates an arithmetic expression over `args` (as produced by
+    Megacloud._convert_to_js_operation) into a real function, compiled once.
+
+    Only arithmetic/bitwise/comparison/boolean operators, conditional expressions,
+    int/float literals, args[...] and int()/float() calls are accepted; anything else
+    (attributes, other names, lambdas, comprehensions...) raises ValueError.
+    """
+    tree = ast.parse(expression.strip(), mode="eval")
+
+    for node in ast.walk(tree):
+        if not isinstance(node, _OP_NODES):
+            raise ValueError(f"unsupported syntax in operation: {expression}")
+
+        if isinstance(node, ast.Name) and node.id not in ("args", "int", "float"):
+            raise ValueError(f"unknown name {node.id!r} in operation: {expression}")
+
+        if isinstance(node, ast.Constant) and type(node.value) not in (int, float):
+            raise ValueError(f"unsupported constant in operation: {expression}")
+
+        if isinstance(node, ast.Call) and (
+            node.keywords or not isinstance(node.func, ast.Name) or node.func.id not in ("int", "float")
+        ):
+            raise ValueError(f"unsupported call in operation: {expression}")
+
+    func = ast.Expression(ast.Lambda(
+        args=ast.arguments(
+            posonlyargs=[], args=[], vararg=ast.arg("args"), kwonlyargs=[], kw_defaults=[], defaults=[]
+        ),
+        body=tree.body,
+    ))
+    ast.fix_missing_locations(func)
+
+    return eval(compile(func, "<megacloud-op>", "eval"), _OP_GLOBALS)
+
+
 class ResolverFlags(IntFlag):
     FALLBACK = 1
     REVERSE = 1 << 1
@@ -167,16 +425,51 @@ class Patterns(StrEnum):
     KEY_TRANSFORM_XOR_VALUE = r'[\w$]{2}=[\w$]{5}\(\+?"?(\d+)"?\)'
     KEY_TRANSFORM_SUMMAND = r'[\w$]{2} % [\w$]{2}\[.+?"(\d+)"'
 
-    def fmt(self, **kwargs) -> "Patterns":
+    def fmt(self, **kwargs) -> "FormattedPattern":
+        # A new object per call instead of state on the shared enum member, so concurrent
+        # extractions can't see each other's substitutions; re's own cache covers repeats
+        value = self.value
         for k, v in kwargs.items():
-            v = re.escape(v)
-            self._fmted = self.value.replace(f"%%{k}%%", v)
+            value = value.replace(f"%%{k}%%", re.escape(v))
 
-        return self
+        return FormattedPattern(self.name, re.compile(value))
+
+    @property
+    def formatted(self) -> str:
+        return self.value
+
+    @property
+    def compiled(self) -> re.Pattern:
+        return _COMPILED_PATTERNS[self]
+
+
+class FormattedPattern(NamedTuple):
+    """
+    Immutable result of Patterns.fmt(): the template's name and its compiled regex.
+    """
+    name: str
+    compiled: re.Pattern
 
     @property
     def formatted(self) -> str:
-        return getattr(self, "_fmted", self.value)
+        return self.compiled.pattern
+
+
+def _compile_patterns() -> dict[Patterns, re.Pattern]:
+    compiled = {}
+    for p in Patterns:
+        try:
+            compiled[p] = re.compile(p.value)
+        except re.error:
+            # fragments such as _GET_INDEX only exist to build other patterns
+            if not p.name.startswith("_"):
+                raise
+
+    return compiled
+
+
+# Compiled once at import into a read-only mapping that threads can share
+_COMPILED_PATTERNS = _compile_patterns()
 
 
 class KeyResolver:
@@ -464,8 +757,10 @@ class KeyTransform:
 
         return "".join(result)
 
+
 class Megacloud:
-    base_url = "https://megacloud.blog"
+    # MEGACLOUD_BASE_URL points getSources at another host, e.g. benchmarks/mock_site.py
+    base_url = os.getenv("MEGACLOUD_BASE_URL", "https://megacloud.blog").rstrip("/")
     headers = {
         "user-agent": "Mozilla/5.0 (X11; Linux x86_64; rv:139.0) Gecko/20100101 Firefox/139.0",
         "origin": base_url,
@@ -473,8 +768,15 @@ class Megacloud:
     }
     BIGINT_NUMBERS = False
 
-    def __init__(self, embed_url: str) -> None:
+    @classmethod
+    def configure(cls, base_url: str) -> None:
+        """Switches the getSources host along with the origin and referer headers sent to it."""
+        cls.base_url = base_url.rstrip("/")
+        cls.headers = {**cls.headers, "origin": cls.base_url, "referer": cls.base_url + "/"}
+
+    def __init__(self, embed_url: str, timeout: float | None = None) -> None:
         self.embed_url = embed_url
+        self.timeout = timeout
 
         self.script: str
         self.string_array: list[str]
@@ -496,8 +798,7 @@ class Megacloud:
 
     def _generate_op_func(self, operation: str) -> Callable:
         operation = re.sub(r"[\w$]{2}", "args", operation)
-        string = self._convert_to_js_operation(operation)
-        return lambda *args: eval(string)
+        return compile_operation(self._convert_to_js_operation(operation))
 
     def _get_operations(self) -> dict[int, Callable]:
         functions = {}
@@ -571,7 +872,7 @@ class Megacloud:
 
             var_value = _re(Patterns.VAR.fmt(name=var_name), self.script)
             var_value = var_value.group(1) or var_value.group(2)
-            var_value = re.sub(Patterns._FUNC, "", var_value)
+            var_value = Patterns._FUNC.compiled.sub("", var_value)
 
             if 0 < len(var_value) < 4 and not var_value.isdigit():
                 return self._var_to_num(var_value, ctx)
@@ -586,7 +887,7 @@ class Megacloud:
 
             if not result:
                 var_value = " ".join(map(lambda t: m.group(1) if (m := re.search(r"(\d+)", t)) else t, var_value.split()))
-                result = eval(self._convert_to_js_operation(var_value))
+                result = compile_operation(self._convert_to_js_operation(var_value))()
 
             return str(result)
 
@@ -601,7 +902,7 @@ class Megacloud:
 
         elif len(values) > 1:
             if not values[1].isdigit():
-                i = eval(self._convert_to_js_operation(" ".join(values)))
+                i = compile_operation(self._convert_to_js_operation(" ".join(values)))()
 
             else:
                 i1 = int(self._var_to_num(values[0], ctx))
@@ -652,25 +953,18 @@ class Megacloud:
         else:
             return int(float(n) * 1103515245.0 + 12345.0) & 0x7FFFFFFF
 
-    def _shuffle_sources(self, sources: list[str], key: str) -> list[str]:
-        array_count = len(sources) // len(key)
-        arrays = [[""] * len(key) for _ in range(array_count)]
-
-        key_dict = {i: char for i, char in enumerate(key)}
-        key_sorted = {i: char for i, char in sorted(key_dict.items(), key=lambda p: p[1])}
+    def _shuffle_sources(self, sources: list[str] | str, key: str) -> list[str]:
+        # Columnar transposition: column i of each key-length row comes from the i-th key
+        # character in sorted order, so each column is filled with one strided slice
+        key_len = len(key)
+        array_count = len(sources) // key_len
+        result = [""] * (array_count * key_len)
 
-        p = 0
-        for idx in key_sorted.keys():
-            for arr_idx in range(array_count):
-                char = sources[p]
-                arrays[arr_idx][idx] = char
-                p += 1
+        order = sorted(range(key_len), key=lambda i: key[i])
+        for p, idx in enumerate(order):
+            result[idx::key_len] = sources[p * array_count : (p + 1) * array_count]
 
-        sources = []
-        for arr in arrays:
-            sources.extend(arr)
-
-        return sources
+        return result
 
     def _shuffle_key(self, key: str) -> str:
         key_hash = hash(key)
@@ -684,24 +978,42 @@ class Megacloud:
 
         return "".join(shuffled_key)
 
-    def _process_sources(self, sources: list[str], key: str) -> list[str]:
-        current_hash = hash(key)
-        new_sources = []
+    def _keystream(self, seed: int, length: int) -> list[int]:
+        """LCG outputs reduced mod 95, generated in one tight loop."""
+        stream: list[int] = []
+        append = stream.append
+        n = seed
+
+        if self.BIGINT_NUMBERS:
+            for _ in range(length):
+                n = (n * 1103515245 + 12345) & 0x7FFFFFFF
+                append(n % 95)
+
+        else:
+            for _ in range(length):
+                n = int(n * 1103515245.0 + 12345.0) & 0x7FFFFFFF
+                append(n % 95)
 
-        for char in sources:
-            current_hash = self._lcg(current_hash)
+        return stream
 
-            val1 = ord(char) - 32
-            val2 = current_hash % 95
+    def _process_sources(self, sources: list[str] | str, key: str) -> list[str]:
+        data = "".join(sources)
+        stream = self._keystream(hash(key), len(data))
 
-            v = (val1 - val2) % 95 + 32
-            new_char = chr(v)
-            new_sources.append(new_char)
+        try:
+            raw = data.encode("latin-1")
+        except UnicodeEncodeError:
+            raw = None
+
+        if raw is not None:
+            decoded = bytes([(c - 32 - k) % 95 + 32 for c, k in zip(raw, stream)]).decode("latin-1")
+        else:
+            decoded = "".join(chr((ord(c) - 32 - k) % 95 + 32) for c, k in zip(data, stream))
 
-        return self._shuffle_sources(new_sources, key)
+        return self._shuffle_sources(decoded, key)
 
     def _extract_client_key(self) -> str:
-        resp = make_request(self.embed_url, self.headers, {}, lambda r: r.text)
+        resp = make_request(self.embed_url, self.headers, {}, lambda r: r.text, timeout=self.timeout)
 
         if resp is None:
             raise ValueError("Failed to retrieve client key from embed URL")
@@ -714,7 +1026,7 @@ class Megacloud:
 
         client_key = self._extract_client_key()
         get_src_url = f"{self.base_url}/embed-2/v3/e-1/getSources"
-        resp = make_request(get_src_url, self.headers, {"id": id, "_k": client_key}, lambda i: i.json())
+        resp = make_request(get_src_url, self.headers, {"id": id, "_k": client_key}, lambda i: i.json(), timeout=self.timeout)
 
         if resp is None:
             raise ValueError("Failed to get sources from getSources URL")